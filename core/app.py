@@ -22,6 +22,14 @@ from services.clips.manager import clip_manager
 from services.chat_api import ChatApiServer, ChatApiConfig, ChatRuntimeConfig, SyntheticChatConfig
 from shared.logging.logger import get_logger
 from shared.runtime.hot_reload import HotReloadConfig, build_hot_reload_watcher
+from shared.storage.chat_events import (
+    compact_archive as compact_chat_archive,
+    configure_store,
+    shutdown_store,
+)
+from shared.storage.io_executor import io_executor
+from shared.storage.state_store import flush_trigger_cooldowns, materialize_jobs_view
+from shared.storage.sqlite_pool import close_all as close_sqlite_connections
 
 # >>> ADDITIVE: quota snapshot aggregation
 from shared.runtime.quotas import quota_snapshot_aggregator
@@ -30,7 +38,7 @@ from shared.runtime.quotas import quota_snapshot_aggregator
 log = get_logger("core.app")
 
 _GLOBAL_JOB_REGISTRY: JobRegistry | None = None
-RUNTIME_SNAPSHOT_INTERVAL = 10
+JOB_STATE_VIEW_INTERVAL = 5
 
 
 async def main(stop_event: asyncio.Event):
@@ -68,6 +76,11 @@ async def main(stop_event: asyncio.Event):
     platform_config = config_loader.load_platforms_config()
     creators_config = config_loader.load_creators_config()
     job_enable_flags = system_config.system.jobs
+    runtime_snapshot_exporter.configure(
+        interval_seconds=system_config.system.runtime_snapshot.interval_seconds,
+        min_interval_seconds=system_config.system.runtime_snapshot.min_interval_ms / 1000,
+        delta_log_entries=system_config.system.runtime_snapshot.delta_log_entries,
+    )
 
     # Seed runtime state for snapshot export (includes disabled creators)
     runtime_state.apply_platform_config(platform_config)
@@ -90,11 +103,32 @@ async def main(stop_event: asyncio.Event):
                 "synthetic": {
                     "enabled": system_config.chat.synthetic.enabled,
                 },
+                "storage": {
+                    "batch_writes": system_config.chat.storage.batch_writes,
+                    "archive_enabled": system_config.chat.storage.archive.enabled,
+                },
             },
         }
     )
     runtime_state.apply_job_config(job_enable_flags)
 
+    # --------------------------------------------------
+    # CHAT STORAGE (BEFORE ANY WORKER WRITES)
+    # --------------------------------------------------
+    chat_storage_cfg = system_config.chat.storage
+    configure_store(
+        batch_writes=chat_storage_cfg.batch_writes,
+        batch_max_events=chat_storage_cfg.batch_max_events,
+        batch_max_delay_ms=chat_storage_cfg.batch_max_delay_ms,
+        batch_queue_size=chat_storage_cfg.batch_queue_size,
+        stream_index_flush_seconds=chat_storage_cfg.stream_index_flush_seconds,
+        dedup_capacity=chat_storage_cfg.dedup_capacity,
+        archive_enabled=chat_storage_cfg.archive.enabled,
+        archive_hot_retention_days=chat_storage_cfg.archive.hot_retention_days,
+        archive_segment_max_events=chat_storage_cfg.archive.segment_max_events,
+        raw_payloads=chat_storage_cfg.raw_payloads,
+    )
+
     if not system_config.system.platform_polling_enabled:
         log.info(
             "[BOOT] Platform polling disabled by system config — chat workers will not start"
@@ -128,7 +162,18 @@ async def main(stop_event: asyncio.Event):
         platform_polling_enabled=system_config.system.platform_polling_enabled,
         platform_enable_flags=system_config.system.platforms,
     )
-    jobs = JobRegistry(job_enable_flags=job_enable_flags)
+    job_queue_cfg = system_config.system.job_queue
+    jobs = JobRegistry(
+        job_enable_flags=job_enable_flags,
+        max_workers=job_queue_cfg.max_workers,
+        max_workers_per_creator=job_queue_cfg.max_workers_per_creator,
+        lane_priorities=job_queue_cfg.lane_priorities,
+        default_priority=job_queue_cfg.default_priority,
+        job_timeouts=job_queue_cfg.timeouts_seconds,
+        default_timeout=job_queue_cfg.default_timeout_seconds,
+        owner_lease_seconds=job_queue_cfg.owner_lease_seconds,
+        recover_max_age_seconds=job_queue_cfg.recover_max_age_seconds,
+    )
     _GLOBAL_JOB_REGISTRY = jobs
 
     # --------------------------------------------------
@@ -153,10 +198,16 @@ async def main(stop_event: asyncio.Event):
         except Exception as e:
             log.error(f"Clip runtime failed to start: {e}")
 
+    # --------------------------------------------------
+    # JOB RECOVERY (INTERRUPTED BY LAST SHUTDOWN)
+    # --------------------------------------------------
+    if job_queue_cfg.recover_on_boot:
+        await jobs.recover(creators)
+
     # --------------------------------------------------
     # INITIAL SNAPSHOT EXPORT
     # --------------------------------------------------
-    runtime_snapshot_exporter.publish()
+    runtime_snapshot_exporter.flush()
 
     # --------------------------------------------------
     # CHAT API SERVER (LIVECHAT + SYNTHETIC INGEST)
@@ -189,6 +240,7 @@ async def main(stop_event: asyncio.Event):
             log.info(f"[{ctx.creator_id}] Creator runtime started")
         except Exception as e:
             runtime_state.record_creator_error(ctx.creator_id, str(e))
+            runtime_snapshot_exporter.mark_dirty(urgent=True)
             log.error(
                 f"[{ctx.creator_id}] Failed to start creator runtime: {e}"
             )
@@ -212,22 +264,55 @@ async def main(stop_event: asyncio.Event):
     quota_task = asyncio.create_task(_quota_snapshot_loop())
 
     # ==================================================
-    # RUNTIME SNAPSHOT LOOP (DASHBOARD READ-ONLY)
+    # JOB STATE VIEW LOOP (jobs.json, DASHBOARD READ-ONLY)
+    # ==================================================
+
+    async def _job_state_view_loop():
+        log.info(f"Job state view loop started ({JOB_STATE_VIEW_INTERVAL}s cadence)")
+        try:
+            while not stop_event.is_set():
+                try:
+                    await jobs.apply_cancel_requests()
+                except Exception as e:
+                    log.warning(f"Job cancel request check failed: {e}")
+                try:
+                    await asyncio.to_thread(materialize_jobs_view)
+                except Exception as e:
+                    log.warning(f"Job state view publish failed: {e}")
+                await asyncio.sleep(JOB_STATE_VIEW_INTERVAL)
+        finally:
+            log.info("Job state view loop stopped")
+
+    job_view_task = asyncio.create_task(_job_state_view_loop())
+
+    # ==================================================
+    # RUNTIME SNAPSHOT PUBLISHER (DASHBOARD READ-ONLY)
     # ==================================================
+    # Workers mark the snapshot dirty; this task coalesces those requests
+    # and also publishes on a fixed cadence.
 
-    async def _runtime_snapshot_loop():
-        log.info(f"Runtime snapshot loop started ({RUNTIME_SNAPSHOT_INTERVAL}s cadence)")
+    runtime_snapshot_task = asyncio.create_task(runtime_snapshot_exporter.run(stop_event))
+
+    # ==================================================
+    # CHAT ARCHIVE COMPACTION LOOP (ENDED STREAMS)
+    # ==================================================
+
+    async def _chat_archive_loop():
+        interval = chat_storage_cfg.archive.compaction_interval_seconds
+        log.info(f"Chat archive compaction loop started ({interval}s cadence)")
         try:
             while not stop_event.is_set():
                 try:
-                    runtime_snapshot_exporter.publish()
+                    await asyncio.to_thread(compact_chat_archive)
                 except Exception as e:
-                    log.warning(f"Runtime snapshot publish failed: {e}")
-                await asyncio.sleep(RUNTIME_SNAPSHOT_INTERVAL)
+                    log.warning(f"Chat archive compaction failed: {e}")
+                await asyncio.sleep(interval)
         finally:
-            log.info("Runtime snapshot loop stopped")
+            log.info("Chat archive compaction loop stopped")
 
-    runtime_snapshot_task = asyncio.create_task(_runtime_snapshot_loop())
+    chat_archive_task = None
+    if chat_storage_cfg.archive.enabled:
+        chat_archive_task = asyncio.create_task(_chat_archive_loop())
 
     # ==================================================
     # OPTIONAL HOT RELOAD WATCHER (FILE-BACKED)
@@ -259,17 +344,30 @@ async def main(stop_event: asyncio.Event):
     except Exception as e:
         log.warning(f"Scheduler shutdown error ignored: {e}")
 
+    # Running jobs stay persisted as running and are requeued next boot.
+    try:
+        await jobs.shutdown()
+    except Exception as e:
+        log.warning(f"Job queue shutdown error ignored: {e}")
+
     # --------------------------------------------------
     # STOP BACKGROUND LOOPS
     # --------------------------------------------------
     quota_task.cancel()
+    job_view_task.cancel()
     runtime_snapshot_task.cancel()
     if hot_reload_task:
         hot_reload_task.cancel()
+    if chat_archive_task:
+        chat_archive_task.cancel()
     try:
         await quota_task
     except asyncio.CancelledError:
         pass
+    try:
+        await job_view_task
+    except asyncio.CancelledError:
+        pass
     try:
         await runtime_snapshot_task
     except asyncio.CancelledError:
@@ -279,6 +377,11 @@ async def main(stop_event: asyncio.Event):
             await hot_reload_task
         except asyncio.CancelledError:
             pass
+    if chat_archive_task:
+        try:
+            await chat_archive_task
+        except asyncio.CancelledError:
+            pass
 
     # --------------------------------------------------
     # CLIP RUNTIME SHUTDOWN
@@ -295,6 +398,26 @@ async def main(stop_event: asyncio.Event):
         except Exception as e:
             log.warning(f"Chat API server shutdown failed: {e}")
 
+    # --------------------------------------------------
+    # CHAT STORAGE FLUSH (AFTER ALL WRITERS STOPPED)
+    # --------------------------------------------------
+    try:
+        shutdown_store()
+    except Exception as e:
+        log.warning(f"Chat storage flush failed: {e}")
+
+    # Final snapshots reflect the stopped state; they read SQLite, so they
+    # run before the connections are closed.
+    flush_trigger_cooldowns()
+    materialize_jobs_view(force=True)
+    runtime_snapshot_exporter.flush()
+    close_sqlite_connections()
+
+    # --------------------------------------------------
+    # STATE FILE WRITES (BARRIER: EVERYTHING QUEUED ABOVE)
+    # --------------------------------------------------
+    io_executor.shutdown()
+
     log.info("StreamSuites stopped")
 
 
@@ -1,14 +1,36 @@
-import asyncio
+import asyncio
 import uuid
 import time
-from typing import Dict, Optional, Type
-
-from shared.logging.logger import get_logger
-from shared.storage.state_store import append_job, update_job
-
-log = get_logger("core.jobs")
-
-
+from collections import deque
+from functools import partial
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple, Type
+
+from core.state_exporter import runtime_snapshot_exporter, runtime_state
+from shared.logging.logger import get_logger
+from shared.runtime.histograms import LatencyHistogram
+from shared.storage.state_store import (
+    append_job,
+    get_job,
+    get_job_owner_heartbeats,
+    get_jobs_with_status,
+    record_job_owner_heartbeat,
+    update_job,
+)
+
+log = get_logger("core.jobs")
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_WORKERS_PER_CREATOR = 2
+DEFAULT_LANE_PRIORITY = 10
+DEFAULT_JOB_TIMEOUT_SECONDS = 900
+DEFAULT_OWNER_ID = "runtime"
+DEFAULT_OWNER_LEASE_SECONDS = 60
+DEFAULT_RECOVER_MAX_AGE_SECONDS = 3600
+
+# Job statuses a stopped process can leave behind; requeued by recover().
+INTERRUPTED_STATUSES = ("pending", "running")
+
+
 class Job:
     def __init__(self, ctx, payload: dict):
         self.id = str(uuid.uuid4())
@@ -22,84 +44,494 @@ class Job:
 
     async def run(self):
         raise NotImplementedError
-
-
+
+
+class _QueuedJob:
+    __slots__ = ("job", "job_type", "creator_id", "enqueued_at", "started_at", "cancel_requested")
+
+    def __init__(self, job: Job, job_type: str, creator_id: str) -> None:
+        self.job = job
+        self.job_type = job_type
+        self.creator_id = creator_id
+        self.enqueued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.cancel_requested = False
+
+
 class JobRegistry:
-    def __init__(self, job_enable_flags: Optional[Dict[str, bool]] = None):
+    """
+    Job type registry and durable priority queue.
+
+    Dispatched jobs wait in one FIFO lane per job type. Lanes are served in
+    priority order (lower first), subject to a global worker limit and a
+    per-creator worker limit; a creator at its limit does not block other
+    creators queued behind it.
+
+    Every job is persisted (shared.storage.state_store) as pending, then
+    running, then completed/failed/timed_out/cancelled. Jobs still pending
+    or running when the process stopped are requeued by ``recover()`` at
+    boot.
+
+    Each persisted job records the registry's ``owner_id`` (one per process
+    role, e.g. the runtime or the Discord control plane). While it has jobs
+    queued or running, a registry renews its owner lease; ``recover()``
+    only takes over jobs it owns or whose owner has let its lease expire.
+    Jobs with no owner (e.g. migrated from
+    the legacy jobs.json) or last updated longer ago than
+    ``recover_max_age_seconds`` are marked failed instead of rerun.
+
+    Each run is bounded by its job type's timeout. ``cancel()`` stops a
+    queued or running job owned by this registry; other processes ask for a
+    cancel through ``request_cancel()``, which ``apply_cancel_requests()``
+    honours.
+    """
+
+    def __init__(
+        self,
+        job_enable_flags: Optional[Dict[str, bool]] = None,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_workers_per_creator: int = DEFAULT_MAX_WORKERS_PER_CREATOR,
+        lane_priorities: Optional[Dict[str, int]] = None,
+        default_priority: int = DEFAULT_LANE_PRIORITY,
+        job_timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: Optional[float] = DEFAULT_JOB_TIMEOUT_SECONDS,
+        owner_id: str = DEFAULT_OWNER_ID,
+        owner_lease_seconds: float = DEFAULT_OWNER_LEASE_SECONDS,
+        recover_max_age_seconds: float = DEFAULT_RECOVER_MAX_AGE_SECONDS,
+    ):
         self._job_types: Dict[str, Type[Job]] = {}
+        # job_id -> task, running jobs only
         self._active_jobs: Dict[str, asyncio.Task] = {}
+
+        # --------------------------------------------------
+        # ACTIVE JOB INDEX (AUTHORITATIVE)
+        # --------------------------------------------------
+        # (creator_id, job_type) -> jobs dispatched and not yet done, queued
+        # or running. Incremented on dispatch, decremented when the job's
+        # task finishes, so queries never walk the queue or _active_jobs.
+        self._active_counts: Dict[Tuple[str, str], int] = {}
+        self._active_by_type: Dict[str, int] = {}
+
+        # --------------------------------------------------
+        # QUEUE / WORKER POOL
+        # --------------------------------------------------
+        self._max_workers = max(1, int(max_workers))
+        self._max_workers_per_creator = max(1, int(max_workers_per_creator))
+        self._lane_priorities: Dict[str, int] = dict(lane_priorities or {})
+        self._default_priority = int(default_priority)
+        self._job_timeouts: Dict[str, float] = dict(job_timeouts or {})
+        self._default_timeout = default_timeout
+        self._lanes: Dict[str, Deque[_QueuedJob]] = {}
+        # job_id -> entry, queued or running
+        self._entries: Dict[str, _QueuedJob] = {}
+        self._lane_order: List[str] = []
+        self._running_total = 0
+        self._running_by_creator: Dict[str, int] = {}
+        self._closed = False
+        self._queue_wait: Dict[str, LatencyHistogram] = {}
+        self._run_time: Dict[str, LatencyHistogram] = {}
+
+        # --------------------------------------------------
+        # OWNERSHIP LEASE
+        # --------------------------------------------------
+        self._owner_id = str(owner_id)
+        self._owner_lease_seconds = max(1.0, float(owner_lease_seconds))
+        self._recover_max_age_seconds = max(0.0, float(recover_max_age_seconds))
+        self._lease_task: Optional[asyncio.Task] = None
+
         self._job_enable_flags: Dict[str, bool] = self._normalize_job_flags(job_enable_flags)
-
-        # --------------------------------------------------
-        # METRICS (READ-ONLY, ADDITIVE)
-        # --------------------------------------------------
-        # These counters are observational only.
-        # They do NOT affect scheduling or execution.
-        self._metrics = {
-            "dispatched": 0,
-            "completed": 0,
-            "failed": 0,
-        }
-
-    # ------------------------------------------------------------
-
+
+        # --------------------------------------------------
+        # METRICS (READ-ONLY, ADDITIVE)
+        # --------------------------------------------------
+        # These counters are observational only.
+        # They do NOT affect scheduling or execution.
+        self._metrics = {
+            "dispatched": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "recovered": 0,
+            "abandoned": 0,
+        }
+
+    # ------------------------------------------------------------
+
     def register(self, name: str, job_cls: Type[Job]):
         self._job_types[name] = job_cls
-        log.info(f"Registered job type: {name}")
-
-    # ------------------------------------------------------------
-
+        self._lanes.setdefault(name, deque())
+        self._lane_order = sorted(self._lanes, key=lambda lane: (self._lane_priority(lane), lane))
+        log.info(f"Registered job type: {name} (lane priority {self._lane_priority(name)})")
+
+    def _lane_priority(self, job_type: str) -> int:
+        return self._lane_priorities.get(job_type, self._default_priority)
+
+    def _job_timeout(self, job_type: str) -> Optional[float]:
+        """Run timeout in seconds for ``job_type``; None when unbounded."""
+        timeout = self._job_timeouts.get(job_type, self._default_timeout)
+        return float(timeout) if timeout and timeout > 0 else None
+
+    # ------------------------------------------------------------
+
+    def _adjust_active(self, creator_id: str, job_type: str, delta: int) -> None:
+        key = (creator_id, job_type)
+        count = self._active_counts.get(key, 0) + delta
+        if count > 0:
+            self._active_counts[key] = count
+        else:
+            self._active_counts.pop(key, None)
+
+        type_count = self._active_by_type.get(job_type, 0) + delta
+        if type_count > 0:
+            self._active_by_type[job_type] = type_count
+        else:
+            self._active_by_type.pop(job_type, None)
+
+        runtime_state.record_active_jobs(creator_id, job_type, max(count, 0))
+
+    # ------------------------------------------------------------
+    # QUEUE / WORKER POOL
+    # ------------------------------------------------------------
+
+    def _enqueue(self, entry: _QueuedJob) -> None:
+        self._lanes[entry.job_type].append(entry)
+        self._entries[entry.job.id] = entry
+        self._adjust_active(entry.creator_id, entry.job_type, 1)
+        self._ensure_lease()
+        self._pump()
+
+    def _next_runnable(self) -> Optional[_QueuedJob]:
+        for job_type in self._lane_order:
+            lane = self._lanes[job_type]
+            for index, entry in enumerate(lane):
+                if self._running_by_creator.get(entry.creator_id, 0) < self._max_workers_per_creator:
+                    del lane[index]
+                    return entry
+        return None
+
+    def _pump(self) -> None:
+        """Start queued jobs while worker slots are free."""
+        while not self._closed and self._running_total < self._max_workers:
+            entry = self._next_runnable()
+            if entry is None:
+                break
+            self._start(entry)
+        runtime_state.record_job_queue(self.get_queue_stats())
+        runtime_snapshot_exporter.mark_dirty()
+
+    def _start(self, entry: _QueuedJob) -> None:
+        entry.started_at = time.monotonic()
+        self._queue_wait.setdefault(entry.job_type, LatencyHistogram()).observe(
+            entry.started_at - entry.enqueued_at
+        )
+        self._running_total += 1
+        self._running_by_creator[entry.creator_id] = (
+            self._running_by_creator.get(entry.creator_id, 0) + 1
+        )
+
+        task = asyncio.create_task(self._run_job(entry))
+
+        # Attach authoritative metadata for enforcement + visibility
+        task._job = entry.job
+        task._job_type = entry.job_type
+        task._creator_id = entry.creator_id
+
+        self._active_jobs[entry.job.id] = task
+        task.add_done_callback(partial(self._on_job_done, entry))
+
+    def _on_job_done(self, entry: _QueuedJob, task: asyncio.Task) -> None:
+        self._active_jobs.pop(entry.job.id, None)
+        self._entries.pop(entry.job.id, None)
+        self._running_total -= 1
+        running = self._running_by_creator.get(entry.creator_id, 0) - 1
+        if running > 0:
+            self._running_by_creator[entry.creator_id] = running
+        else:
+            self._running_by_creator.pop(entry.creator_id, None)
+        if entry.started_at is not None:
+            self._run_time.setdefault(entry.job_type, LatencyHistogram()).observe(
+                time.monotonic() - entry.started_at
+            )
+        self._adjust_active(entry.creator_id, entry.job_type, -1)
+        self._pump()
+
+    # ------------------------------------------------------------
+    # OWNERSHIP LEASE
+    # ------------------------------------------------------------
+
+    def _ensure_lease(self) -> None:
+        """Start renewing the owner lease if jobs are queued or running."""
+        if self._lease_task is not None and not self._lease_task.done():
+            return
+        try:
+            self._lease_task = asyncio.get_running_loop().create_task(self._renew_lease())
+        except RuntimeError:
+            # No running loop; the next enqueue from async code starts it.
+            self._lease_task = None
+
+    async def _renew_lease(self) -> None:
+        interval = self._owner_lease_seconds / 3
+        while self._entries and not self._closed:
+            await asyncio.to_thread(record_job_owner_heartbeat, self._owner_id)
+            await asyncio.sleep(interval)
+
+    def _held_elsewhere(self, owner: Optional[str], heartbeats: Mapping[str, float]) -> bool:
+        """True if ``owner`` is another process whose lease is still live."""
+        if not owner or owner == self._owner_id:
+            return False
+        heartbeat_at = heartbeats.get(owner)
+        return heartbeat_at is not None and time.time() - heartbeat_at <= self._owner_lease_seconds
+
+    def _abandon_reason(self, record: Mapping[str, Any], contexts: Mapping[str, Any]) -> Optional[str]:
+        """Why an interrupted job must not be rerun; None if it can be."""
+        if not record.get("owner"):
+            return "interrupted; no owner recorded"
+        last_seen = record.get("updated_at") or record.get("created_at") or 0
+        if time.time() - last_seen > self._recover_max_age_seconds:
+            return "interrupted too long ago to resume"
+        job_type = record.get("type")
+        if (
+            job_type not in self._job_types
+            or contexts.get(record.get("creator_id")) is None
+            or not self._job_enabled(job_type)
+        ):
+            return "interrupted by restart; job type or creator unavailable"
+        return None
+
+    async def recover(self, contexts: Mapping[str, Any]) -> int:
+        """
+        Requeue jobs the previous process left pending or running.
+
+        Call once at boot, after job types are registered and before new
+        dispatches. Jobs owned by another process that still holds its
+        lease are left alone. Jobs without an owner, last updated more than
+        ``recover_max_age_seconds`` ago, or whose type or creator is no
+        longer available are marked failed. Returns the number of jobs
+        requeued.
+        """
+        try:
+            interrupted = get_jobs_with_status(list(INTERRUPTED_STATUSES))
+            heartbeats = get_job_owner_heartbeats()
+        except Exception as e:
+            log.warning(f"Job recovery skipped: {e}")
+            return 0
+
+        recovered = 0
+        skipped = 0
+        for record in interrupted:
+            job_id = record.get("id")
+            if self._held_elsewhere(record.get("owner"), heartbeats):
+                skipped += 1
+                continue
+            job_type = record.get("type")
+            creator_id = record.get("creator_id")
+            now = int(time.time())
+
+            if record.get("cancel_requested_at"):
+                update_job(job_id, {
+                    "status": "cancelled",
+                    "completed_at": now,
+                    "finished_at": now,
+                    "updated_at": now,
+                    "error": "cancelled by request",
+                })
+                self._metrics["cancelled"] += 1
+                continue
+
+            reason = self._abandon_reason(record, contexts)
+            if reason is not None:
+                update_job(job_id, {
+                    "status": "failed",
+                    "completed_at": now,
+                    "finished_at": now,
+                    "updated_at": now,
+                    "error": reason,
+                })
+                self._metrics["abandoned"] += 1
+                log.warning(f"[{creator_id}] Interrupted job not recoverable ({reason}): {job_type} ({job_id})")
+                continue
+
+            job = self._job_types[job_type](contexts[creator_id], record.get("payload") or {})
+            job.id = job_id
+            job.created_at = record.get("created_at") or job.created_at
+            job.updated_at = now
+            update_job(job_id, {
+                "status": "pending",
+                "started_at": None,
+                "updated_at": now,
+                "recovered_at": now,
+                "owner": self._owner_id,
+            })
+            self._enqueue(_QueuedJob(job, job_type, creator_id))
+            self._metrics["recovered"] += 1
+            recovered += 1
+
+        if interrupted:
+            log.info(
+                f"Job recovery: {recovered} of {len(interrupted)} interrupted job(s) requeued"
+                + (f", {skipped} held by another live process" if skipped else "")
+            )
+        return recovered
+
+    # ------------------------------------------------------------
+    # CANCELLATION
+    # ------------------------------------------------------------
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job owned by this registry. Returns False
+        if the job is not queued or running here.
+        """
+        entry = self._entries.get(job_id)
+        if entry is None:
+            return False
+
+        task = self._active_jobs.get(job_id)
+        if task is not None:
+            # _run_job records the cancellation when the task unwinds.
+            entry.cancel_requested = True
+            task.cancel()
+            log.info(f"[{entry.creator_id}] Job cancel requested: {entry.job_type} ({job_id})")
+            return True
+
+        try:
+            self._lanes[entry.job_type].remove(entry)
+        except ValueError:
+            return False
+        self._entries.pop(job_id, None)
+        self._finish_job(entry.job, "cancelled", error="cancelled by request")
+        self._metrics["cancelled"] += 1
+        self._adjust_active(entry.creator_id, entry.job_type, -1)
+        self._pump()
+        log.info(f"[{entry.creator_id}] Queued job cancelled: {entry.job_type} ({job_id})")
+        return True
+
+    @staticmethod
+    def request_cancel(job_id: str) -> bool:
+        """
+        Persist a cancel request for a job owned by any process. The owning
+        registry applies it on its next ``apply_cancel_requests()``. Returns
+        False if the job is unknown or already finished.
+        """
+        record = get_job(job_id)
+        if not record or record.get("status") not in INTERRUPTED_STATUSES:
+            return False
+        update_job(job_id, {"cancel_requested_at": int(time.time())})
+        return True
+
+    async def apply_cancel_requests(self) -> int:
+        """Cancel local jobs that have a persisted cancel request."""
+        if not self._entries:
+            return 0
+        try:
+            records = await asyncio.to_thread(get_jobs_with_status, list(INTERRUPTED_STATUSES))
+        except Exception as e:
+            log.warning(f"Job cancel request check failed: {e}")
+            return 0
+
+        cancelled = 0
+        for record in records:
+            job_id = record.get("id")
+            entry = self._entries.get(job_id)
+            if entry is None or entry.cancel_requested or not record.get("cancel_requested_at"):
+                continue
+            if self.cancel(job_id):
+                cancelled += 1
+        return cancelled
+
+    async def shutdown(self) -> None:
+        """
+        Stop starting jobs and cancel running ones. Their persisted state is
+        left pending/running so the next boot requeues them.
+        """
+        self._closed = True
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            self._lease_task = None
+        for lane in self._lanes.values():
+            while lane:
+                entry = lane.popleft()
+                self._entries.pop(entry.job.id, None)
+                self._adjust_active(entry.creator_id, entry.job_type, -1)
+
+        tasks = list(self._active_jobs.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._pump()
+
     def _count_active_jobs(self, creator_id: str, job_type: str) -> int:
         """
         Count currently running jobs for a creator + job type.
         Deterministic and class-name independent.
         """
-        count = 0
-        for task in self._active_jobs.values():
-            if task.done():
-                continue
-
-            t_creator = getattr(task, "_creator_id", None)
-            t_type = getattr(task, "_job_type", None)
-
-            if t_creator == creator_id and t_type == job_type:
-                count += 1
-
-        return count
+        return self._active_counts.get((creator_id, job_type), 0)
 
     def count_active_jobs(self, creator_id: str, job_type: str) -> int:
         """
         Public wrapper for active job counts by creator + job type.
         """
         return self._count_active_jobs(creator_id, job_type)
-
-    # ------------------------------------------------------------
-    # READ-ONLY VISIBILITY HOOKS (SAFE FOR DASHBOARD)
-    # ------------------------------------------------------------
-
-    def get_metrics(self) -> Dict[str, int]:
-        """
-        Returns global job metrics (read-only).
-        """
-        return dict(self._metrics)
-
-    def get_active_job_counts(self) -> Dict[str, int]:
-        """
-        Returns active job counts by job_type.
-        """
-        counts: Dict[str, int] = {}
-
-        for task in self._active_jobs.values():
-            if task.done():
-                continue
-
-            job_type = getattr(task, "_job_type", None)
-            if not job_type:
-                continue
-
-            counts[job_type] = counts.get(job_type, 0) + 1
-
-        return counts
+
+    # ------------------------------------------------------------
+    # READ-ONLY VISIBILITY HOOKS (SAFE FOR DASHBOARD)
+    # ------------------------------------------------------------
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns global job metrics (read-only), plus p50/p95/p99 queue-wait
+        and run-time seconds per job type.
+        """
+        metrics: Dict[str, Any] = dict(self._metrics)
+        latency: Dict[str, Dict[str, Any]] = {}
+        for name, histograms in (("queue_wait_seconds", self._queue_wait), ("run_seconds", self._run_time)):
+            for job_type, histogram in histograms.items():
+                latency.setdefault(job_type, {})[name] = {
+                    "count": histogram.count,
+                    **histogram.percentiles(),
+                }
+        metrics["latency"] = latency
+        return metrics
+
+    def get_active_job_counts(self) -> Dict[str, int]:
+        """
+        Returns active job counts by job_type.
+        """
+        return dict(self._active_by_type)
+
+    def get_active_job_gauges(self) -> Dict[Tuple[str, str], int]:
+        """
+        Returns active job counts by (creator_id, job_type).
+        """
+        return dict(self._active_counts)
+
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """
+        Returns worker pool usage, queued jobs per lane and queue-wait /
+        run-time histograms per job type.
+        """
+        return {
+            "max_workers": self._max_workers,
+            "max_workers_per_creator": self._max_workers_per_creator,
+            "running": self._running_total,
+            "queued": sum(len(lane) for lane in self._lanes.values()),
+            "lanes": {
+                job_type: {
+                    "priority": self._lane_priority(job_type),
+                    "queued": len(self._lanes[job_type]),
+                }
+                for job_type in self._lane_order
+            },
+            "queue_wait_seconds": {
+                job_type: histogram.snapshot() for job_type, histogram in self._queue_wait.items()
+            },
+            "run_seconds": {
+                job_type: histogram.snapshot() for job_type, histogram in self._run_time.items()
+            },
+        }
 
     # ------------------------------------------------------------
 
@@ -125,34 +557,41 @@ class JobRegistry:
         if job_type not in self._job_types:
             raise ValueError(f"Unknown job type: {job_type}")
 
+        if self._closed:
+            log.info(
+                f"[{getattr(ctx, 'creator_id', 'unknown')}] Job '{job_type}' "
+                "rejected: job queue is shut down"
+            )
+            return None
+
         if not self._job_enabled(job_type):
             log.info(
                 f"[{getattr(ctx, 'creator_id', 'unknown')}] Job '{job_type}' "
                 "rejected: disabled via config (restart required)"
             )
             return None
-
-        # --------------------------------------------------
-        # TIER ENFORCEMENT (AUTHORITATIVE)
-        # --------------------------------------------------
-
-        if job_type == "clip":
-            max_jobs = ctx.limits.get("max_concurrent_clip_jobs")
-            if max_jobs is not None:
-                active = self._count_active_jobs(ctx.creator_id, job_type)
-                if active >= max_jobs:
-                    log.warning(
-                        f"[{ctx.creator_id}] Clip job refused "
-                        f"(active={active}, limit={max_jobs})"
-                    )
-                    return None
-
-        # --------------------------------------------------
-        # JOB CREATION
-        # --------------------------------------------------
-
-        job = self._job_types[job_type](ctx, payload)
-
+
+        # --------------------------------------------------
+        # TIER ENFORCEMENT (AUTHORITATIVE)
+        # --------------------------------------------------
+
+        if job_type == "clip":
+            max_jobs = ctx.limits.get("max_concurrent_clip_jobs")
+            if max_jobs is not None:
+                active = self._count_active_jobs(ctx.creator_id, job_type)
+                if active >= max_jobs:
+                    log.warning(
+                        f"[{ctx.creator_id}] Clip job refused "
+                        f"(active={active}, limit={max_jobs})"
+                    )
+                    return None
+
+        # --------------------------------------------------
+        # JOB CREATION
+        # --------------------------------------------------
+
+        job = self._job_types[job_type](ctx, payload)
+
         append_job({
             "id": job.id,
             "type": job_type,
@@ -162,27 +601,37 @@ class JobRegistry:
             "started_at": job.started_at,
             "completed_at": job.completed_at,
             "updated_at": job.updated_at,
+            "owner": self._owner_id,
             "payload": payload
         })
 
-        task = asyncio.create_task(self._run_job(job))
-
-        # Attach authoritative metadata for enforcement + visibility
-        task._job = job
-        task._job_type = job_type
-        task._creator_id = ctx.creator_id
-
-        self._active_jobs[job.id] = task
-
-        # Metrics: dispatched
-        self._metrics["dispatched"] += 1
-
-        log.info(f"[{ctx.creator_id}] Job queued: {job_type} ({job.id})")
-        return job.id
-
-    # ------------------------------------------------------------
-
-    async def _run_job(self, job: Job):
+        self._enqueue(_QueuedJob(job, job_type, ctx.creator_id))
+
+        # Metrics: dispatched
+        self._metrics["dispatched"] += 1
+
+        log.info(f"[{ctx.creator_id}] Job queued: {job_type} ({job.id})")
+        return job.id
+
+    # ------------------------------------------------------------
+
+    def _finish_job(self, job: Job, status: str, *, error: Optional[str] = None) -> None:
+        job.status = status
+        job.completed_at = int(time.time())
+        job.updated_at = job.completed_at
+        updates: Dict[str, Any] = {
+            "status": status,
+            "completed_at": job.completed_at,
+            "finished_at": job.completed_at,
+            "updated_at": job.updated_at,
+        }
+        if error is not None:
+            updates["error"] = error
+        update_job(job.id, updates)
+
+    async def _run_job(self, entry: _QueuedJob):
+        job = entry.job
+        timeout = self._job_timeout(entry.job_type)
         try:
             job.status = "running"
             job.started_at = int(time.time())
@@ -194,38 +643,43 @@ class JobRegistry:
                 "updated_at": job.updated_at
             })
 
-            await job.run()
+            if timeout is None:
+                await job.run()
+            else:
+                await asyncio.wait_for(job.run(), timeout)
 
-            job.status = "completed"
-            job.completed_at = int(time.time())
-            job.updated_at = job.completed_at
+            if entry.cancel_requested:
+                # run() swallowed the CancelledError; cancel() already
+                # reported success, so record the job as cancelled.
+                self._finish_job(job, "cancelled", error="cancelled by request")
+                self._metrics["cancelled"] += 1
+                log.info(f"[{entry.creator_id}] Running job cancelled: {entry.job_type} ({job.id})")
+                return
 
-            update_job(job.id, {
-                "status": "completed",
-                "completed_at": job.completed_at,
-                "finished_at": job.completed_at,
-                "updated_at": job.updated_at
-            })
+            self._finish_job(job, "completed")
 
             # Metrics: completed
             self._metrics["completed"] += 1
 
+        except asyncio.CancelledError:
+            if not entry.cancel_requested:
+                # Shutdown: leave the job persisted as running for recovery.
+                raise
+            self._finish_job(job, "cancelled", error="cancelled by request")
+            self._metrics["cancelled"] += 1
+            log.info(f"[{entry.creator_id}] Running job cancelled: {entry.job_type} ({job.id})")
+
         except Exception as e:
-            job.status = "failed"
-            job.completed_at = int(time.time())
-            job.updated_at = job.completed_at
-            update_job(job.id, {
-                "status": "failed",
-                "completed_at": job.completed_at,
-                "finished_at": job.completed_at,
-                "updated_at": job.updated_at,
-                "error": str(e)
-            })
-
-            # Metrics: failed
-            self._metrics["failed"] += 1
-
-            log.exception(f"Job {job.id} failed")
-
-        finally:
-            self._active_jobs.pop(job.id, None)
+            elapsed = time.monotonic() - (entry.started_at or entry.enqueued_at)
+            if isinstance(e, asyncio.TimeoutError) and timeout is not None and elapsed >= timeout:
+                self._finish_job(job, "timed_out", error=f"timed out after {timeout:g}s")
+                self._metrics["timed_out"] += 1
+                log.warning(f"[{entry.creator_id}] Job timed out after {timeout:g}s: {entry.job_type} ({job.id})")
+                return
+
+            self._finish_job(job, "failed", error=str(e))
+
+            # Metrics: failed
+            self._metrics["failed"] += 1
+
+            log.exception(f"Job {job.id} failed")
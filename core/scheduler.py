@@ -41,9 +41,6 @@ class Scheduler:
         # creator_id -> list[asyncio.Task]
         self._tasks: Dict[str, List[asyncio.Task]] = {}
 
-        # creator_id -> active job counts by type
-        self._job_counts: Dict[str, Dict[str, int]] = {}
-
         # creator_id -> set[platform] actually started
         self._creator_platforms_started: Dict[str, Set[str]] = {}
 
@@ -174,7 +171,6 @@ class Scheduler:
             return
 
         self._tasks[ctx.creator_id] = []
-        self._job_counts[ctx.creator_id] = {}
         self._creator_platforms_started[ctx.creator_id] = set()
         self._creator_platforms_tracked[ctx.creator_id] = set()
 
@@ -544,7 +540,9 @@ class Scheduler:
             if max_jobs is None:
                 return True
 
-            active = self._job_counts.get(ctx.creator_id, {}).get(job_type, 0)
+            # Active counts are owned by the job registry.
+            registry = self._get_job_registry()
+            active = registry.count_active_jobs(ctx.creator_id, job_type) if registry else 0
             log.debug(
                 f"[{ctx.creator_id}] Clip job check: "
                 f"{active}/{max_jobs} active"
@@ -553,28 +551,6 @@ class Scheduler:
 
         return True
 
-    def register_job_start(self, ctx: CreatorContext, job_type: str):
-        self._job_counts.setdefault(ctx.creator_id, {})
-        self._job_counts[ctx.creator_id][job_type] = (
-            self._job_counts[ctx.creator_id].get(job_type, 0) + 1
-        )
-        log.debug(
-            f"[{ctx.creator_id}] Job started: {job_type} "
-            f"(count={self._job_counts[ctx.creator_id][job_type]})"
-        )
-
-    def register_job_end(self, ctx: CreatorContext, job_type: str):
-        try:
-            self._job_counts[ctx.creator_id][job_type] -= 1
-            log.debug(
-                f"[{ctx.creator_id}] Job ended: {job_type} "
-                f"(count={self._job_counts[ctx.creator_id].get(job_type, 0)})"
-            )
-            if self._job_counts[ctx.creator_id][job_type] <= 0:
-                del self._job_counts[ctx.creator_id][job_type]
-        except Exception:
-            pass
-
     # ------------------------------------------------------------
 
     async def _heartbeat(self, ctx: CreatorContext):
@@ -622,7 +598,6 @@ class Scheduler:
             await asyncio.gather(*all_tasks, return_exceptions=True)
 
         self._tasks.clear()
-        self._job_counts.clear()
         self._creator_platforms_started.clear()
         self._creator_platforms_tracked.clear()
         self._action_executors.clear()
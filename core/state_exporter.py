@@ -9,11 +9,15 @@ root when configured) via DashboardStatePublisher.
 
 from __future__ import annotations
 
-import copy
+import asyncio
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from runtime import version as runtime_version
 
@@ -21,12 +25,20 @@ from shared.platforms.state import PlatformState, replay_capabilities
 
 from shared.logging.logger import get_logger
 from shared.public_exports.publisher import PublicExportPublisher
+from shared.runtime.rate_windows import RateWindows
+from shared.runtime.snapshot_deltas import DEFAULT_MAX_ENTRIES as DEFAULT_DELTA_LOG_ENTRIES
+from shared.runtime.snapshot_deltas import SnapshotDeltaLog
 from shared.storage.chat_events.reader import ReplayMetadata, build_replay_metadata
+from shared.storage.chat_events.store import store_metrics
+from shared.storage.io_executor import io_executor
 from shared.storage.state_publisher import DashboardStatePublisher
-from shared.utils.hashing import stable_hash_for_paths
+from shared.utils.hashing import publish_cache, stable_hash_for_paths
 
 log = get_logger("core.state_exporter")
 
+# Telemetry events/errors retained in memory and exported.
+TELEMETRY_LOG_LIMIT = 200
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -85,12 +97,19 @@ class RuntimeState:
         self._rumble_chat: Dict[str, Any] = {}
         self._system: Dict[str, Any] = {}
         self._jobs: Dict[str, Dict[str, Any]] = {}
+        # (creator_id, job_type) -> running jobs, pushed by JobRegistry
+        self._active_jobs: Dict[Tuple[str, str], int] = {}
+        self._job_queue: Dict[str, Any] = {}
         self._triggers_source: Optional[str] = None
         self._restart_baseline_hashes: Dict[str, Optional[str]] = {}
         self._restart_source_paths: Dict[str, List[Path]] = {}
         self._restart_pending_logged = False
-        self._telemetry_events: List[Dict[str, Any]] = []
-        self._telemetry_errors: List[Dict[str, Any]] = []
+        # Append-only, oldest first. Entries are never modified once
+        # recorded, so readers share them instead of copying.
+        self._telemetry_events: Deque[Dict[str, Any]] = deque(maxlen=TELEMETRY_LOG_LIMIT)
+        self._telemetry_errors: Deque[Dict[str, Any]] = deque(maxlen=TELEMETRY_LOG_LIMIT)
+        self._telemetry_event_seq = 0
+        self._telemetry_error_seq = 0
 
     # ------------------------------------------------------------
     # Configuration ingestion
@@ -196,10 +215,20 @@ class RuntimeState:
     # Telemetry helpers
     # ------------------------------------------------------------
 
-    def _append_bounded(self, collection: List[Dict[str, Any]], entry: Dict[str, Any], limit: int = 200) -> None:
-        collection.append(entry)
-        if len(collection) > limit:
-            del collection[0 : len(collection) - limit]
+    @staticmethod
+    def _tail(log: Deque[Dict[str, Any]], latest_seq: int, since_seq: Optional[int]) -> List[Dict[str, Any]]:
+        # Sequence numbers are contiguous, so the newest (latest - since)
+        # entries are exactly those after ``since_seq``.
+        if since_seq is None:
+            return list(log)
+        count = latest_seq - max(0, int(since_seq))
+        if count <= 0:
+            return []
+        if count >= len(log):
+            return list(log)
+        tail = list(islice(reversed(log), count))
+        tail.reverse()
+        return tail
 
     def record_event(
         self,
@@ -221,7 +250,9 @@ class RuntimeState:
             "severity": severity_normalized,
             "message": message,
         }
-        self._append_bounded(self._telemetry_events, entry)
+        self._telemetry_event_seq += 1
+        entry["seq"] = self._telemetry_event_seq
+        self._telemetry_events.append(entry)
 
     def record_error(
         self,
@@ -242,17 +273,27 @@ class RuntimeState:
         }
         if source:
             entry["source"] = source
-        self._append_bounded(self._telemetry_errors, entry)
+        self._telemetry_error_seq += 1
+        entry["seq"] = self._telemetry_error_seq
+        self._telemetry_errors.append(entry)
 
-    def telemetry_events(self) -> List[Dict[str, Any]]:
-        events = [dict(evt) for evt in self._telemetry_events]
-        events.sort(key=lambda e: e.get("timestamp") or "")
-        return events
+    @property
+    def telemetry_event_seq(self) -> int:
+        """Sequence number of the newest telemetry event (0 if none)."""
+        return self._telemetry_event_seq
 
-    def telemetry_errors(self) -> List[Dict[str, Any]]:
-        errors = [dict(err) for err in self._telemetry_errors]
-        errors.sort(key=lambda e: e.get("timestamp") or "")
-        return errors
+    @property
+    def telemetry_error_seq(self) -> int:
+        """Sequence number of the newest telemetry error (0 if none)."""
+        return self._telemetry_error_seq
+
+    def telemetry_events(self, since_seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retained events in record order, only those after ``since_seq`` if given."""
+        return self._tail(self._telemetry_events, self._telemetry_event_seq, since_seq)
+
+    def telemetry_errors(self, since_seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retained errors in record order, only those after ``since_seq`` if given."""
+        return self._tail(self._telemetry_errors, self._telemetry_error_seq, since_seq)
 
     def platform_counters_snapshot(self) -> Dict[str, Dict[str, int]]:
         snapshot: Dict[str, Dict[str, int]] = {}
@@ -439,6 +480,16 @@ class RuntimeState:
         if creator_id and creator_id in self._creators and error:
             self._creators[creator_id].last_error = error
 
+    def record_active_jobs(self, creator_id: str, job_type: str, active: int) -> None:
+        key = (str(creator_id), str(job_type))
+        if active > 0:
+            self._active_jobs[key] = int(active)
+        else:
+            self._active_jobs.pop(key, None)
+
+    def record_job_queue(self, stats: Dict[str, Any]) -> None:
+        self._job_queue = stats
+
     # ------------------------------------------------------------
     # Rumble chat ingest status
     # ------------------------------------------------------------
@@ -498,6 +549,14 @@ class RuntimeState:
             "overlay_safe": bool(metadata.overlay_safe),
         }
 
+    @staticmethod
+    def _build_chat_storage_snapshot() -> Dict[str, Any]:
+        try:
+            return store_metrics()
+        except Exception as exc:  # pragma: no cover - defensive
+            log.warning(f"Failed to collect chat storage metrics: {exc}")
+            return {}
+
     def build_snapshot(self) -> Dict[str, Any]:
         runtime_heartbeat = _utc_now_iso()
         platforms_out: List[Dict[str, Any]] = []
@@ -558,7 +617,15 @@ class RuntimeState:
                 }
             )
 
+        active_jobs_out: Dict[str, Any] = {"total": 0, "by_type": {}, "by_creator": {}}
+        for (creator_id, job_type), active in sorted(self._active_jobs.items()):
+            active_jobs_out["total"] += active
+            by_type = active_jobs_out["by_type"]
+            by_type[job_type] = by_type.get(job_type, 0) + active
+            active_jobs_out["by_creator"].setdefault(creator_id, {})[job_type] = active
+
         replay_snapshot = self._build_replay_snapshot()
+        chat_storage_snapshot = self._build_chat_storage_snapshot()
 
         return {
             "schema_version": "v1",
@@ -571,6 +638,8 @@ class RuntimeState:
             },
             "system": dict(self._system) if self._system else {},
             "jobs": jobs_out,
+            "active_jobs": active_jobs_out,
+            "job_queue": dict(self._job_queue),
             "platforms": platforms_out,
             "creators": creators_out,
             "triggers": {
@@ -578,6 +647,7 @@ class RuntimeState:
             },
             "rumble_chat": rumble_chat_out,
             "replay": replay_snapshot,
+            "chat_storage": chat_storage_snapshot,
             "restart_intent": restart_intent,
         }
 
@@ -620,12 +690,18 @@ class TelemetrySnapshotExporter:
     EVENTS_FILENAME = "events.json"
     RATES_FILENAME = "rates.json"
     ERRORS_FILENAME = "errors.json"
+    RATE_METRICS = ("messages", "triggers", "actions", "actions_failed")
 
     def __init__(self, *, state: RuntimeState, base_dir: Path | str | None = None) -> None:
         self._state = state
         self._publisher = PublicExportPublisher(base_dir=base_dir or self.DEFAULT_BASE_DIR)
-        self._rate_history: List[Dict[str, Any]] = []
+        self._rates = RateWindows()
         self._last_counters: Dict[str, Dict[str, int]] = {}
+        # Event/error lists are rebuilt only when new entries were recorded.
+        self._events: List[Dict[str, Any]] = []
+        self._events_seq = 0
+        self._errors: List[Dict[str, Any]] = []
+        self._errors_seq = 0
 
     @staticmethod
     def _iso(dt: datetime) -> str:
@@ -634,81 +710,73 @@ class TelemetrySnapshotExporter:
         return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
     def _build_events_payload(self, now: datetime) -> Dict[str, Any]:
+        seq = self._state.telemetry_event_seq
+        if seq != self._events_seq:
+            self._events = self._state.telemetry_events()
+            self._events_seq = seq
         return {
             "schema_version": "v1",
             "generated_at": self._iso(now),
-            "events": self._state.telemetry_events(),
+            "latest_seq": seq,
+            "events": self._events,
         }
 
     def _build_errors_payload(self, now: datetime) -> Dict[str, Any]:
+        seq = self._state.telemetry_error_seq
+        if seq != self._errors_seq:
+            self._errors = self._state.telemetry_errors()
+            self._errors_seq = seq
         return {
             "schema_version": "v1",
             "generated_at": self._iso(now),
-            "errors": self._state.telemetry_errors(),
+            "latest_seq": seq,
+            "errors": self._errors,
         }
 
-    @staticmethod
-    def _empty_metrics(platforms: List[str]) -> Dict[str, Dict[str, int]]:
-        metrics = {"messages": {}, "triggers": {}, "actions": {}, "actions_failed": {}}
-        for platform in platforms:
-            for key in metrics:
-                metrics[key][platform] = 0
-        return metrics
-
-    def _capture_rate_sample(self, now: datetime) -> None:
+    def _capture_rate_sample(self) -> List[str]:
+        """Feed counter growth since the previous publish into the rate windows."""
         counters = self._state.platform_counters_snapshot()
-        platforms = sorted(counters.keys())
-        template = {"messages": {}, "triggers": {}, "actions": {}, "actions_failed": {}}
-        sample = {"timestamp": now, "metrics": copy.deepcopy(template)}
-
-        for platform in platforms:
-            current = counters.get(platform, {})
+        for platform, current in counters.items():
             previous = self._last_counters.get(platform, {})
-            for key in template:
-                delta = max(0, int(current.get(key, 0)) - int(previous.get(key, 0)))
-                sample["metrics"][key][platform] = delta
-            self._last_counters[platform] = {key: int(current.get(key, 0)) for key in template}
-
-        self._rate_history.append(sample)
-        cutoff = now - timedelta(minutes=5)
-        self._rate_history = [entry for entry in self._rate_history if entry["timestamp"] >= cutoff]
-
-    def _aggregate_window(self, window: timedelta, now: datetime) -> Dict[str, Dict[str, int]]:
-        platforms = sorted(self._last_counters.keys())
-        metrics = self._empty_metrics(platforms)
-        cutoff = now - window
-
-        for entry in self._rate_history:
-            if entry["timestamp"] < cutoff:
-                continue
-            for key, per_platform in entry.get("metrics", {}).items():
-                for platform, value in per_platform.items():
-                    metrics.setdefault(key, {})
-                    metrics[key][platform] = metrics[key].get(platform, 0) + int(value)
-
-        # Ensure deterministic ordering for downstream consumers
-        for key in list(metrics.keys()):
-            metrics[key] = {platform: metrics[key].get(platform, 0) for platform in platforms}
-
-        return metrics
+            for key in self.RATE_METRICS:
+                value = int(current.get(key, 0))
+                delta = value - int(previous.get(key, 0))
+                if delta > 0:
+                    self._rates.add(key, platform, delta)
+            self._last_counters[platform] = {key: int(current.get(key, 0)) for key in self.RATE_METRICS}
+        return sorted(self._last_counters.keys())
 
     def _build_rates_payload(self, now: datetime) -> Dict[str, Any]:
-        self._capture_rate_sample(now)
+        platforms = self._capture_rate_sample()
+        totals = self._rates.totals(self.RATE_METRICS, platforms)
 
         return {
             "schema_version": "v1",
             "generated_at": self._iso(now),
             "windows": [
-                {"window": "60s", "metrics": self._aggregate_window(timedelta(seconds=60), now)},
-                {"window": "5m", "metrics": self._aggregate_window(timedelta(minutes=5), now)},
+                {"window": label, "metrics": totals[label]}
+                for label in self._rates.window_labels
             ],
+            # Snapshot file writes vs. writes skipped as unchanged. Volatile
+            # for change detection, so it is refreshed with the next real write.
+            "publish_io": {**publish_cache.stats(), "queue": io_executor.stats()},
         }
 
-    def publish(self) -> Dict[str, Dict[str, Any]]:
+    def build(self) -> Dict[str, Dict[str, Any]]:
         now = datetime.now(timezone.utc)
-        events_payload = self._build_events_payload(now)
-        rates_payload = self._build_rates_payload(now)
-        errors_payload = self._build_errors_payload(now)
+        return {
+            "events": self._build_events_payload(now),
+            "rates": self._build_rates_payload(now),
+            "errors": self._build_errors_payload(now),
+        }
+
+    def publish(self, payloads: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Write telemetry files; builds them unless ``payloads`` come from ``build()``."""
+        if payloads is None:
+            payloads = self.build()
+        events_payload = payloads["events"]
+        rates_payload = payloads["rates"]
+        errors_payload = payloads["errors"]
 
         try:
             self._publisher.publish(self.EVENTS_FILENAME, events_payload)
@@ -725,19 +793,28 @@ class TelemetrySnapshotExporter:
         except Exception as exc:
             log.warning(f"Failed to publish telemetry errors: {exc}")
 
-        return {
-            "events": events_payload,
-            "rates": rates_payload,
-            "errors": errors_payload,
-        }
+        return payloads
 
 
 class RuntimeSnapshotExporter:
     """
     Writes runtime_snapshot.json using DashboardStatePublisher.
+
+    Publishing rebuilds the whole snapshot and rewrites the telemetry files,
+    so hot paths call ``mark_dirty()`` instead of ``publish()``. The ``run()``
+    task coalesces those requests into at most one publish per
+    ``min_interval_seconds`` and otherwise publishes every
+    ``interval_seconds``. ``flush()`` publishes immediately (shutdown,
+    critical errors).
+
+    Unless disabled, each publish also records the runtime snapshot and the
+    telemetry events/errors in a SnapshotDeltaLog and writes
+    runtime_deltas.json next to the snapshot, so pollers that know their
+    last revision can fetch only the changes.
     """
 
     DEFAULT_RELATIVE_PATH = "runtime_snapshot.json"
+    DELTAS_RELATIVE_PATH = "runtime_deltas.json"
 
     def __init__(
         self,
@@ -747,6 +824,9 @@ class RuntimeSnapshotExporter:
         state: Optional[RuntimeState] = None,
         telemetry_exporter: Optional[TelemetrySnapshotExporter] = None,
         runtime_export_root: Optional[str] = "runtime/exports",
+        interval_seconds: float = 10.0,
+        min_interval_seconds: float = 1.0,
+        delta_log_entries: int = DEFAULT_DELTA_LOG_ENTRIES,
     ) -> None:
         self._publisher = DashboardStatePublisher(base_dir=base_dir, publish_root=publish_root)
         self._state = state or RuntimeState()
@@ -756,29 +836,180 @@ class RuntimeSnapshotExporter:
             if runtime_export_root
             else None
         )
+        self._deltas = SnapshotDeltaLog(max_entries=delta_log_entries) if delta_log_entries > 0 else None
+
+        self._interval_seconds = float(interval_seconds)
+        self._min_interval_seconds = float(min_interval_seconds)
+        # mark_dirty() may be called from API server threads.
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._urgent = False
+        self._last_publish = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stats = {"requested": 0, "coalesced": 0, "published": 0}
 
     @property
     def state(self) -> RuntimeState:
         return self._state
 
+    def configure(
+        self,
+        *,
+        interval_seconds: Optional[float] = None,
+        min_interval_seconds: Optional[float] = None,
+        delta_log_entries: Optional[int] = None,
+    ) -> None:
+        if delta_log_entries is not None:
+            self._deltas = (
+                SnapshotDeltaLog(max_entries=delta_log_entries) if delta_log_entries > 0 else None
+            )
+        if interval_seconds is not None:
+            self._interval_seconds = max(0.1, float(interval_seconds))
+        if min_interval_seconds is not None:
+            self._min_interval_seconds = max(0.0, float(min_interval_seconds))
+        self._wake_publisher()
+
     def publish(self) -> Dict[str, Any]:
         payload = self._state.build_snapshot()
+        telemetry = None
+        if self._telemetry_exporter:
+            try:
+                telemetry = self._telemetry_exporter.build()
+            except Exception as e:
+                log.warning(f"Failed to build telemetry snapshots: {e}")
+
+        deltas_payload = None
+        if self._deltas:
+            documents = {"runtime_snapshot": payload}
+            if telemetry:
+                documents["telemetry_events"] = telemetry["events"]
+                documents["telemetry_errors"] = telemetry["errors"]
+            try:
+                self._deltas.record(documents)
+                deltas_payload = self._deltas.build_document()
+            except Exception as e:
+                log.warning(f"Failed to record runtime snapshot delta: {e}")
+
         try:
             self._publisher.publish(self.DEFAULT_RELATIVE_PATH, payload)
+            if deltas_payload is not None:
+                self._publisher.publish(self.DELTAS_RELATIVE_PATH, deltas_payload)
         except Exception as e:
             log.warning(f"Failed to publish runtime snapshot: {e}")
         if self._runtime_exporter:
             try:
                 self._runtime_exporter.publish(self.DEFAULT_RELATIVE_PATH, payload)
+                if deltas_payload is not None:
+                    self._runtime_exporter.publish(self.DELTAS_RELATIVE_PATH, deltas_payload)
             except Exception as e:
                 log.warning(f"Failed to publish runtime snapshot export: {e}")
-        if self._telemetry_exporter:
+        if telemetry:
             try:
-                self._telemetry_exporter.publish()
+                self._telemetry_exporter.publish(telemetry)
             except Exception as e:
                 log.warning(f"Failed to publish telemetry snapshots: {e}")
         return payload
 
+    # ------------------------------------------------------------
+    # Coalescing publisher
+    # ------------------------------------------------------------
+
+    def mark_dirty(self, *, urgent: bool = False) -> None:
+        """
+        Request a publish. Cheap and safe from any thread; repeated calls
+        before the next publish collapse into one. ``urgent`` skips the
+        minimum interval.
+        """
+
+        with self._lock:
+            self._stats["requested"] += 1
+            wake = not self._dirty or (urgent and not self._urgent)
+            if self._dirty:
+                self._stats["coalesced"] += 1
+            self._dirty = True
+            self._urgent = self._urgent or urgent
+        if wake:
+            self._wake_publisher()
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Publish now, bypassing the interval. Never raises."""
+
+        with self._lock:
+            self._dirty = False
+            self._urgent = False
+            self._last_publish = time.monotonic()
+            self._stats["published"] += 1
+        try:
+            return self.publish()
+        except Exception as e:
+            log.warning(f"Runtime snapshot publish failed: {e}")
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _wake_publisher(self) -> None:
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            # Loop already closed during shutdown.
+            pass
+
+    def _next_delay(self) -> float:
+        """Seconds until the next publish is due; 0 when due now."""
+
+        with self._lock:
+            elapsed = time.monotonic() - self._last_publish
+            if self._urgent:
+                return 0.0
+            if self._dirty:
+                return max(0.0, self._min_interval_seconds - elapsed)
+            return max(0.0, self._interval_seconds - elapsed)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Publish loop; exits when ``stop_event`` is set."""
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        log.info(
+            f"Runtime snapshot publisher started ({self._interval_seconds:g}s cadence, "
+            f"{self._min_interval_seconds:g}s minimum interval)"
+        )
+        try:
+            while not stop_event.is_set():
+                # Clear before reading state so a concurrent mark_dirty()
+                # cannot be missed.
+                self._wake.clear()
+                delay = self._next_delay()
+                if delay <= 0:
+                    self.flush()
+                    continue
+
+                waiters = [
+                    asyncio.ensure_future(stop_event.wait()),
+                    asyncio.ensure_future(self._wake.wait()),
+                ]
+                try:
+                    await asyncio.wait(
+                        waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    for waiter in waiters:
+                        waiter.cancel()
+        finally:
+            self._loop = None
+            self._wake = None
+            stats = self.stats()
+            log.info(
+                f"Runtime snapshot publisher stopped (requested={stats['requested']}, "
+                f"coalesced={stats['coalesced']}, published={stats['published']})"
+            )
+
 
 # Shared instances for scheduler/app
 runtime_state = RuntimeState()
@@ -0,0 +1,96 @@
+"""
+Microbenchmark for chat event construction and serialization.
+
+Compares the previous ``dataclasses.asdict`` + ``json.dumps`` path with the
+hand-written ``ChatEvent.to_dict`` and ``ChatEvent.to_json_bytes`` (orjson
+when installed), and reports how much of one core each would need to keep
+up with a sustained chat rate.
+
+    python scripts/bench_chat_events.py --events 10000 --rate 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from shared.chat import events as chat_events  # noqa: E402
+from shared.chat.events import ChatEvent, create_chat_event  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark chat event serialization")
+    parser.add_argument("--events", type=int, default=10000, help="Events per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds; the best is reported")
+    parser.add_argument("--rate", type=int, default=10000, help="Target events per second")
+    return parser.parse_args()
+
+
+def build_events(count: int) -> List[ChatEvent]:
+    return [
+        create_chat_event(
+            stream_id="bench-stream",
+            source_platform="youtube",
+            author_id=f"author-{index % 97}",
+            display_name=f"Viewer {index % 97}",
+            text=f"message number {index} with some typical chat length",
+            avatar_url="https://example.invalid/avatar.png",
+            badges=["member"] if index % 5 == 0 else [],
+            roles=["moderator"] if index % 17 == 0 else [],
+            raw={"id": index, "snippet": {"type": "textMessageEvent", "liveChatId": "abc"}},
+            ts="2026-01-01T00:00:00Z",
+        )
+        for index in range(count)
+    ]
+
+
+def legacy_to_dict(event: ChatEvent) -> dict:
+    payload = dataclasses.asdict(event)
+    if event.raw is None:
+        payload.pop("raw", None)
+    return payload
+
+
+def best_of(rounds: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    args = parse_args()
+    events = build_events(args.events)
+
+    cases = [
+        ("asdict + json.dumps (previous)", lambda: [json.dumps(legacy_to_dict(e)).encode("utf-8") for e in events]),
+        ("asdict only (previous)", lambda: [legacy_to_dict(e) for e in events]),
+        ("to_dict only", lambda: [e.to_dict() for e in events]),
+        ("to_dict + json.dumps", lambda: [json.dumps(e.to_dict()).encode("utf-8") for e in events]),
+        ("to_json_bytes", lambda: [e.to_json_bytes() for e in events]),
+    ]
+
+    orjson_state = "installed" if chat_events.orjson is not None else "not installed"
+    print(f"{args.events} events x {args.rounds} rounds, orjson {orjson_state}")
+    print(f"{'path':<34} {'us/event':>9} {'core @ ' + str(args.rate) + '/s':>14}")
+    for name, func in cases:
+        elapsed = best_of(args.rounds, func)
+        per_event_us = elapsed / args.events * 1_000_000
+        core_share = per_event_us * args.rate / 1_000_000 * 100
+        print(f"{name:<34} {per_event_us:>9.2f} {core_share:>13.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""
+Rebuild the chat full-text search index from stored chat events.
+
+The FTS index is maintained incrementally as chat is written; run this once
+after upgrading a database that already holds chat history, or whenever the
+index is suspected to be out of sync.
+
+Usage:
+    python scripts/rebuild_chat_fts.py
+    python scripts/rebuild_chat_fts.py --db data/streamsuites.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from shared.storage.chat_events.store import DEFAULT_DB_PATH, ChatEventStore
+from shared.storage.sqlite_pool import close_all
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the chat FTS5 search index")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DEFAULT_DB_PATH,
+        help=f"Chat event database (default: {DEFAULT_DB_PATH})",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    if not args.db.exists():
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 1
+
+    store = ChatEventStore(db_path=args.db)
+    try:
+        if not store.search_available():
+            print("SQLite FTS5 is not available in this Python build.", file=sys.stderr)
+            return 1
+        started = time.perf_counter()
+        count = store.rebuild_search_index()
+        elapsed = time.perf_counter() - started
+        print(f"Indexed {count} chat event(s) in {elapsed:.1f}s")
+    finally:
+        store.shutdown()
+        close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,8 +20,12 @@ from shared.storage.chat_events import (
     list_streams,
     paginate_events,
     range_events,
+    search_available,
+    search_events,
     tail_events,
 )
+from shared.storage.chat_events.cursor import DIRECTION_FORWARD, DIRECTIONS
+from shared.storage.chat_events.serialize import join_json_array
 from shared.storage.chat_events.writer import write_event
 
 log = get_logger("services.chat_api")
@@ -121,6 +125,23 @@ class ChatApiServer:
                 self.end_headers()
                 self.wfile.write(body)
 
+            def _send_json_events(
+                self,
+                status: int,
+                events: List[bytes],
+                payload: Dict[str, Any],
+            ) -> None:
+                # Events arrive pre-encoded from storage; splice them in
+                # instead of decoding and re-encoding every row.
+                tail = json.dumps(payload).encode("utf-8")
+                body = b'{"events":' + join_json_array(events) + b"," + tail[1:]
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self._apply_cors()
+                self.end_headers()
+                self.wfile.write(body)
+
             def _apply_cors(self) -> None:
                 origins = config.api.allow_origins
                 if not origins:
@@ -167,6 +188,11 @@ class ChatApiServer:
                     return {}
                 return payload if isinstance(payload, dict) else {}
 
+            @staticmethod
+            def _query_flag(query: Dict[str, List[str]], name: str) -> bool:
+                value = (query.get(name) or [""])[0].strip().lower()
+                return value in {"1", "true", "yes", "on"}
+
             def _resolve_stream_id(self, query: Dict[str, List[str]]) -> Optional[str]:
                 stream_id = (query.get("stream_id") or [None])[0]
                 if stream_id:
@@ -192,44 +218,106 @@ class ChatApiServer:
                 if path == "/api/chat/tail":
                     limit = int((query.get("limit") or ["50"])[0])
                     stream_id = self._resolve_stream_id(query)
-                    events = tail_events(stream_id or "", limit=limit) if stream_id else []
+                    include_raw = self._query_flag(query, "include_raw")
+                    events = (
+                        tail_events(
+                            stream_id,
+                            limit=limit,
+                            include_raw=include_raw,
+                            encoded=True,
+                        )
+                        if stream_id
+                        else []
+                    )
                     context = chat_context.get_context()
-                    return self._send_json(
+                    return self._send_json_events(
                         HTTPStatus.OK,
-                        {
-                            "events": events,
-                            "context": context.to_dict(),
-                        },
+                        events,
+                        {"context": context.to_dict()},
                     )
 
                 if path == "/api/chat/events":
                     limit = int((query.get("limit") or ["50"])[0])
                     cursor = (query.get("cursor") or [None])[0]
+                    direction = (query.get("direction") or [DIRECTION_FORWARD])[0]
+                    include_raw = self._query_flag(query, "include_raw")
                     from_ts = (query.get("from_ts") or [None])[0]
                     to_ts = (query.get("to_ts") or [None])[0]
                     stream_id = self._resolve_stream_id(query)
 
-                    events: List[Dict[str, Any]] = []
+                    if direction not in DIRECTIONS:
+                        return self._send_json(
+                            HTTPStatus.BAD_REQUEST,
+                            {"error": f"direction must be one of {', '.join(DIRECTIONS)}"},
+                        )
+
+                    events: List[bytes] = []
                     next_cursor: Optional[str] = None
+                    prev_cursor: Optional[str] = None
 
                     if stream_id:
                         if from_ts or to_ts:
-                            events = range_events(stream_id, from_ts, to_ts)
+                            events = range_events(
+                                stream_id,
+                                from_ts,
+                                to_ts,
+                                include_raw=include_raw,
+                                encoded=True,
+                            )
                         else:
-                            events, next_cursor = paginate_events(
-                                stream_id, limit=limit, cursor=cursor
+                            events, next_cursor, prev_cursor = paginate_events(
+                                stream_id,
+                                limit=limit,
+                                cursor=cursor,
+                                direction=direction,
+                                include_raw=include_raw,
+                                encoded=True,
                             )
 
                     context = chat_context.get_context()
-                    return self._send_json(
+                    return self._send_json_events(
                         HTTPStatus.OK,
+                        events,
                         {
-                            "events": events,
                             "next_cursor": next_cursor,
+                            "prev_cursor": prev_cursor,
                             "context": context.to_dict(),
                         },
                     )
 
+                if path == "/api/chat/search":
+                    text = ((query.get("q") or [""])[0]).strip()
+                    if not search_available():
+                        return self._send_json(
+                            HTTPStatus.SERVICE_UNAVAILABLE,
+                            {"error": "chat search requires the SQLite backend with FTS5"},
+                        )
+                    if not text:
+                        return self._send_json(
+                            HTTPStatus.BAD_REQUEST,
+                            {"error": "q is required"},
+                        )
+
+                    limit = min(max(int((query.get("limit") or ["50"])[0]), 1), 200)
+                    hits, next_cursor = search_events(
+                        text,
+                        stream_id=(query.get("stream_id") or [None])[0],
+                        author=(query.get("author") or [None])[0],
+                        platform=(query.get("platform") or [None])[0],
+                        from_ts=(query.get("from_ts") or [None])[0],
+                        to_ts=(query.get("to_ts") or [None])[0],
+                        limit=limit,
+                        cursor=(query.get("cursor") or [None])[0],
+                        include_raw=self._query_flag(query, "include_raw"),
+                    )
+                    return self._send_json(
+                        HTTPStatus.OK,
+                        {
+                            "hits": hits,
+                            "next_cursor": next_cursor,
+                        },
+                    )
+
                 self.send_error(HTTPStatus.NOT_FOUND, "Unknown endpoint")
 
             def _authorize_synthetic(self, author_source: str) -> bool:
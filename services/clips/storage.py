@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Iterable, List, Mapping, Optional, Any
 
 from shared.logging.logger import get_logger
+from shared.storage.sqlite_pool import get_connection_manager
 from services.clips.models import (
     CLIP_STATES,
     ClipDestination,
@@ -33,19 +34,15 @@ class ClipStore:
         self._path = Path(db_path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
+        self._db = get_connection_manager(self._path)
         self._init_schema()
 
     # ------------------------------------------------------------------
     # INTERNALS
     # ------------------------------------------------------------------
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _init_schema(self) -> None:
-        with self._connect() as conn:
+        with self._db.writer() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS clips (
@@ -139,7 +136,7 @@ class ClipStore:
                 clip_id,
             )
             try:
-                with self._lock, self._connect() as conn:
+                with self._lock, self._db.writer() as conn:
                     conn.execute(
                         """
                         INSERT INTO clips (
@@ -198,7 +195,7 @@ class ClipStore:
         )
 
     def claim_queued(self, limit: int) -> List[ClipRecord]:
-        with self._lock, self._connect() as conn:
+        with self._lock, self._db.writer() as conn:
             rows = conn.execute(
                 """
                 SELECT * FROM clips
@@ -246,7 +243,7 @@ class ClipStore:
         self._validate_state(state)
         now = int(time.time())
 
-        with self._lock, self._connect() as conn:
+        with self._lock, self._db.writer() as conn:
             conn.execute(
                 """
                 UPDATE clips
@@ -270,7 +267,7 @@ class ClipStore:
         return self._row_to_record(row)
 
     def get_all(self) -> List[ClipRecord]:
-        with self._lock, self._connect() as conn:
+        with self._db.reader() as conn:
             rows = conn.execute("SELECT * FROM clips ORDER BY requested_at DESC").fetchall()
         return [self._row_to_record(r) for r in rows]
 
@@ -317,7 +314,7 @@ class ClipStore:
         detail: Optional[str] = None,
     ) -> None:
         now = int(time.time())
-        with self._lock, self._connect() as conn:
+        with self._lock, self._db.writer() as conn:
             conn.execute(
                 """
                 INSERT INTO clip_jobs (clip_id, job_type, state, detail, created_at, updated_at)
@@ -327,7 +324,7 @@ class ClipStore:
             )
 
     def get_history(self, clip_id: str) -> List[dict]:
-        with self._lock, self._connect() as conn:
+        with self._db.reader() as conn:
             rows = conn.execute(
                 """
                 SELECT state, reason, created_at
@@ -340,7 +337,7 @@ class ClipStore:
         return [dict(r) for r in rows]
 
     def prune_failed(self, clip_ids: Iterable[str]) -> None:
-        with self._lock, self._connect() as conn:
+        with self._lock, self._db.writer() as conn:
             for clip_id in clip_ids:
                 conn.execute(
                     "UPDATE clips SET last_error = last_error WHERE clip_id = ?",
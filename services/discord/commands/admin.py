@@ -172,7 +172,19 @@ class AdminCommandHandler:
         if self._job_registry is None:
             system_config = ConfigLoader().load_system_config()
             job_flags = system_config.system.jobs
-            self._job_registry = JobRegistry(job_enable_flags=job_flags)
+            queue_cfg = system_config.system.job_queue
+            self._job_registry = JobRegistry(
+                job_enable_flags=job_flags,
+                max_workers=queue_cfg.max_workers,
+                max_workers_per_creator=queue_cfg.max_workers_per_creator,
+                lane_priorities=queue_cfg.lane_priorities,
+                default_priority=queue_cfg.default_priority,
+                job_timeouts=queue_cfg.timeouts_seconds,
+                default_timeout=queue_cfg.default_timeout_seconds,
+                owner_id="discord",
+                owner_lease_seconds=queue_cfg.owner_lease_seconds,
+                recover_max_age_seconds=queue_cfg.recover_max_age_seconds,
+            )
 
         clips_feature = (
             getattr(ctx, "features", {}).get("clips", {})
@@ -500,6 +512,59 @@ class AdminCommandHandler:
             "total_jobs": len(jobs),
         }
 
+    async def cmd_cancel_job(
+        self,
+        *,
+        user_id: int,
+        guild_id: int,
+        job_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Cancel a pending or running job by id or unique id prefix (as shown
+        by /jobs). Jobs owned by this runtime are cancelled immediately;
+        others get a persisted cancel request their runtime applies.
+        """
+        prefix = job_id.strip()
+        if not prefix:
+            return {"ok": False, "message": "Job id is required."}
+
+        active_statuses = {"running", "pending"}
+        matches = [
+            job for job in get_all_jobs()
+            if job.get("status") in active_statuses and str(job.get("id", "")).startswith(prefix)
+        ]
+        if not matches:
+            return {"ok": False, "message": f"No pending or running job matches '{prefix}'."}
+        if len(matches) > 1:
+            return {
+                "ok": False,
+                "message": f"'{prefix}' matches {len(matches)} jobs; use a longer id.",
+            }
+
+        job = matches[0]
+        resolved_id = str(job["id"])
+        if self._job_registry is not None and self._job_registry.cancel(resolved_id):
+            message = f"Job {resolved_id[:8]} ({job.get('type', 'unknown')}) cancelled."
+            mode = "local"
+        elif JobRegistry.request_cancel(resolved_id):
+            message = (
+                f"Cancel requested for job {resolved_id[:8]} ({job.get('type', 'unknown')}); "
+                "the owning runtime will stop it shortly."
+            )
+            mode = "requested"
+        else:
+            return {"ok": False, "message": f"Job {resolved_id[:8]} already finished."}
+
+        self._logger.log_command(
+            command="cancel_job",
+            guild_id=guild_id,
+            user_id=user_id,
+            success=True,
+            extra={"job_id": resolved_id, "mode": mode},
+        )
+
+        return {"ok": True, "message": message, "job_id": resolved_id, "mode": mode}
+
     async def cmd_status(
         self,
         *,
@@ -365,6 +365,36 @@ def setup(
             ephemeral=True,
         )
 
+    # --------------------------------------------------
+    # /cancel-job
+    # --------------------------------------------------
+
+    @app_commands.command(
+        name="cancel-job",
+        description="Cancel a pending or running job",
+    )
+    @app_commands.describe(
+        job_id="Job id or the short id shown by /jobs",
+    )
+    @require_admin()
+    async def cancel_job(
+        interaction: discord.Interaction,
+        job_id: str,
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        result = await handler.cmd_cancel_job(
+            user_id=interaction.user.id,
+            guild_id=interaction.guild.id,
+            job_id=job_id,
+        )
+
+        content = f"✅ {result['message']}" if result.get("ok") else f"❌ {result['message']}"
+        await interaction.followup.send(
+            content=content,
+            ephemeral=True,
+        )
+
     # --------------------------------------------------
     # Register Commands
     # --------------------------------------------------
@@ -373,6 +403,7 @@ def setup(
     bot.tree.add_command(toggle_platform)
     bot.tree.add_command(trigger)
     bot.tree.add_command(jobs)
+    bot.tree.add_command(cancel_job)
     bot.tree.add_command(status)
 
     log.info("Discord admin slash commands registered")
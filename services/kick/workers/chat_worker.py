@@ -94,10 +94,7 @@ class KickChatWorker:
             await self._actions.execute(actions, default_platform="kick")
 
         # Publish updated counters so trigger activity is visible without logs
-        try:
-            runtime_snapshot_exporter.publish()
-        except Exception:
-            log.debug("Runtime snapshot publish skipped for kick message")
+        runtime_snapshot_exporter.mark_dirty()
 
 
 __all__ = ["KickChatWorker"]
@@ -181,10 +181,7 @@ class TwitchChatWorker:
             await self._actions.execute(actions, default_platform="twitch")
 
         if actions:
-            try:
-                runtime_snapshot_exporter.publish()
-            except Exception:
-                log.debug("Runtime snapshot publish skipped for Twitch trigger")
+            runtime_snapshot_exporter.mark_dirty()
 
         # --------------------------------------------------
         # Audience-facing chat commands (public triggers only)
@@ -218,7 +218,4 @@ class YouTubeChatWorker:
             await self._actions.execute(actions, default_platform="youtube")
 
         if actions:
-            try:
-                runtime_snapshot_exporter.publish()
-            except Exception:
-                log.debug("Runtime snapshot publish skipped for YouTube trigger")
+            runtime_snapshot_exporter.mark_dirty()
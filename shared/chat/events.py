@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timezone
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+try:  # optional: faster JSON encoding when installed
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
 SUPPORTED_PLATFORMS = {
     "rumble",
     "youtube",
@@ -18,6 +24,9 @@ SUPPORTED_PLATFORMS = {
 }
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
@@ -36,6 +45,22 @@ def _normalize_iso(ts: Optional[str]) -> str:
     return parsed.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def iso_to_epoch_ms(value: Optional[str]) -> Optional[int]:
+    """Convert an ISO-8601 timestamp to integer epoch milliseconds (UTC)."""
+    if not value or not isinstance(value, str):
+        return None
+    normalized = value
+    if normalized.endswith("Z"):
+        normalized = normalized[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(normalized)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // timedelta(milliseconds=1)
+
+
 def normalize_platform(value: str) -> str:
     platform = (value or "").lower().strip()
     if platform not in SUPPORTED_PLATFORMS:
@@ -43,7 +68,12 @@ def normalize_platform(value: str) -> str:
     return platform
 
 
-@dataclass
+# Events are created for every chat message on every platform, so the models
+# are slotted and serialize by hand instead of through dataclasses.asdict
+# (which deep-copies every nested value).
+
+
+@dataclass(slots=True)
 class ChatAuthor:
     author_id: str
     display_name: str
@@ -51,21 +81,40 @@ class ChatAuthor:
     badges: List[str] = field(default_factory=list)
     roles: List[str] = field(default_factory=list)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "author_id": self.author_id,
+            "display_name": self.display_name,
+            "avatar_url": self.avatar_url,
+            "badges": list(self.badges),
+            "roles": list(self.roles),
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class ChatContent:
     type: str
     text: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "text": self.text}
+
 
-@dataclass
+@dataclass(slots=True)
 class ChatFlags:
     is_synthetic: bool = False
     is_system: bool = False
     is_highlighted: bool = False
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "is_synthetic": self.is_synthetic,
+            "is_system": self.is_system,
+            "is_highlighted": self.is_highlighted,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class ChatEvent:
     event_id: str
     ts: str
@@ -77,11 +126,31 @@ class ChatEvent:
     raw: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        payload = asdict(self)
-        if self.raw is None:
-            payload.pop("raw", None)
+        """Wire representation. ``raw`` is shared, not copied, and omitted when None."""
+        payload = {
+            "event_id": self.event_id,
+            "ts": self.ts,
+            "stream_id": self.stream_id,
+            "source_platform": self.source_platform,
+            "author": self.author.to_dict(),
+            "content": self.content.to_dict(),
+            "flags": self.flags.to_dict(),
+        }
+        if self.raw is not None:
+            payload["raw"] = self.raw
         return payload
 
+    def to_json_bytes(self) -> bytes:
+        """UTF-8 JSON of ``to_dict()``; uses orjson when it is installed."""
+        payload = self.to_dict()
+        if orjson is not None:
+            try:
+                return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # e.g. integers beyond 64 bits in a raw platform payload
+                pass
+        return json.dumps(payload).encode("utf-8")
+
 
 def create_chat_event(
     *,
@@ -142,5 +211,6 @@ __all__ = [
     "ChatEvent",
     "SUPPORTED_PLATFORMS",
     "create_chat_event",
+    "iso_to_epoch_ms",
     "normalize_platform",
 ]
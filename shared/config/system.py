@@ -44,6 +44,39 @@ class HotReloadSettings:
     interval_seconds: int = 5
 
 
+@dataclass
+class RuntimeSnapshotSettings:
+    # Periodic publish cadence when nothing has changed.
+    interval_seconds: int = 10
+    # Minimum spacing between publishes requested by state changes.
+    min_interval_ms: int = 1000
+    # Revisions kept in runtime_deltas.json; 0 disables the delta channel.
+    delta_log_entries: int = 120
+
+
+@dataclass
+class JobQueueSettings:
+    # Jobs running at once across all creators.
+    max_workers: int = 4
+    # Jobs running at once for any single creator.
+    max_workers_per_creator: int = 2
+    # Job type -> lane priority (lower runs first); unlisted types use default_priority.
+    lane_priorities: Dict[str, int] = field(default_factory=lambda: {"clip": 0})
+    default_priority: int = 10
+    # Job type -> run timeout in seconds; unlisted types use default_timeout_seconds.
+    # 0 means no timeout.
+    timeouts_seconds: Dict[str, int] = field(default_factory=lambda: {"clip": 600})
+    default_timeout_seconds: int = 900
+    # Requeue jobs left pending or running by the previous process.
+    recover_on_boot: bool = True
+    # Jobs owned by another process are only taken over at boot once that
+    # process has not renewed its lease for this long.
+    owner_lease_seconds: int = 60
+    # Interrupted jobs last updated longer ago than this are marked failed
+    # at boot instead of being rerun.
+    recover_max_age_seconds: int = 3600
+
+
 @dataclass
 class SystemSettings:
     platform_polling_enabled: bool = True
@@ -61,6 +94,8 @@ class SystemSettings:
         }
     )
     hot_reload: HotReloadSettings = field(default_factory=HotReloadSettings)
+    runtime_snapshot: RuntimeSnapshotSettings = field(default_factory=RuntimeSnapshotSettings)
+    job_queue: JobQueueSettings = field(default_factory=JobQueueSettings)
 
 
 @dataclass
@@ -79,10 +114,31 @@ class SyntheticChatSettings:
     rate_limit_per_minute: int = 30
 
 
+@dataclass
+class ChatArchiveSettings:
+    enabled: bool = False
+    hot_retention_days: int = 7
+    segment_max_events: int = 5000
+    compaction_interval_seconds: int = 3600
+
+
+@dataclass
+class ChatStorageSettings:
+    batch_writes: bool = False
+    batch_max_events: int = 200
+    batch_max_delay_ms: int = 250
+    batch_queue_size: int = 10000
+    stream_index_flush_seconds: int = 5
+    dedup_capacity: int = 5000
+    raw_payloads: str = "inline"
+    archive: ChatArchiveSettings = field(default_factory=ChatArchiveSettings)
+
+
 @dataclass
 class ChatSettings:
     api: ChatApiSettings = field(default_factory=ChatApiSettings)
     synthetic: SyntheticChatSettings = field(default_factory=SyntheticChatSettings)
+    storage: ChatStorageSettings = field(default_factory=ChatStorageSettings)
 
 
 @dataclass
@@ -201,11 +257,90 @@ def _load_system_settings(raw: Optional[Dict[str, Any]]) -> SystemSettings:
         except Exception:
             hot_reload_cfg.interval_seconds = HotReloadSettings.interval_seconds
 
+    snapshot_raw = raw.get("runtime_snapshot", {})
+    snapshot_cfg = RuntimeSnapshotSettings()
+    if isinstance(snapshot_raw, dict):
+        try:
+            snapshot_cfg.interval_seconds = max(
+                1, int(snapshot_raw.get("interval_seconds", snapshot_cfg.interval_seconds))
+            )
+        except Exception:
+            log.warning("runtime_snapshot.interval_seconds must be an integer; using default")
+        try:
+            snapshot_cfg.min_interval_ms = max(
+                0, int(snapshot_raw.get("min_interval_ms", snapshot_cfg.min_interval_ms))
+            )
+        except Exception:
+            log.warning("runtime_snapshot.min_interval_ms must be an integer; using default")
+        try:
+            snapshot_cfg.delta_log_entries = max(
+                0, int(snapshot_raw.get("delta_log_entries", snapshot_cfg.delta_log_entries))
+            )
+        except Exception:
+            log.warning("runtime_snapshot.delta_log_entries must be an integer; using default")
+
+    queue_raw = raw.get("job_queue", {})
+    queue_cfg = JobQueueSettings()
+    if isinstance(queue_raw, dict):
+        try:
+            queue_cfg.max_workers = max(1, int(queue_raw.get("max_workers", queue_cfg.max_workers)))
+        except Exception:
+            log.warning("job_queue.max_workers must be an integer; using default")
+        try:
+            queue_cfg.max_workers_per_creator = max(
+                1, int(queue_raw.get("max_workers_per_creator", queue_cfg.max_workers_per_creator))
+            )
+        except Exception:
+            log.warning("job_queue.max_workers_per_creator must be an integer; using default")
+        try:
+            queue_cfg.default_priority = int(
+                queue_raw.get("default_priority", queue_cfg.default_priority)
+            )
+        except Exception:
+            log.warning("job_queue.default_priority must be an integer; using default")
+        lanes_raw = queue_raw.get("lane_priorities")
+        if isinstance(lanes_raw, dict):
+            for name, priority in lanes_raw.items():
+                if isinstance(priority, int) and not isinstance(priority, bool):
+                    queue_cfg.lane_priorities[str(name)] = priority
+                else:
+                    log.warning(f"job_queue.lane_priorities.{name} must be an integer; ignoring")
+        try:
+            queue_cfg.default_timeout_seconds = max(
+                0, int(queue_raw.get("default_timeout_seconds", queue_cfg.default_timeout_seconds))
+            )
+        except Exception:
+            log.warning("job_queue.default_timeout_seconds must be an integer; using default")
+        timeouts_raw = queue_raw.get("timeouts_seconds")
+        if isinstance(timeouts_raw, dict):
+            for name, seconds in timeouts_raw.items():
+                if isinstance(seconds, int) and not isinstance(seconds, bool) and seconds >= 0:
+                    queue_cfg.timeouts_seconds[str(name)] = seconds
+                else:
+                    log.warning(f"job_queue.timeouts_seconds.{name} must be a non-negative integer; ignoring")
+        try:
+            queue_cfg.owner_lease_seconds = max(
+                5, int(queue_raw.get("owner_lease_seconds", queue_cfg.owner_lease_seconds))
+            )
+        except Exception:
+            log.warning("job_queue.owner_lease_seconds must be an integer; using default")
+        try:
+            queue_cfg.recover_max_age_seconds = max(
+                0, int(queue_raw.get("recover_max_age_seconds", queue_cfg.recover_max_age_seconds))
+            )
+        except Exception:
+            log.warning("job_queue.recover_max_age_seconds must be an integer; using default")
+        recover = queue_raw.get("recover_on_boot")
+        if isinstance(recover, bool):
+            queue_cfg.recover_on_boot = recover
+
     return SystemSettings(
         platform_polling_enabled=value,
         platforms=platforms_enabled,
         jobs=jobs_enabled,
         hot_reload=hot_reload_cfg,
+        runtime_snapshot=snapshot_cfg,
+        job_queue=queue_cfg,
     )
 
 
@@ -241,6 +376,54 @@ def _load_synthetic_chat_settings(raw: Optional[Dict[str, Any]]) -> SyntheticCha
     return cfg
 
 
+def _load_chat_archive_settings(raw: Optional[Dict[str, Any]]) -> ChatArchiveSettings:
+    if not isinstance(raw, dict):
+        return ChatArchiveSettings()
+
+    cfg = ChatArchiveSettings()
+    cfg.enabled = bool(raw.get("enabled", cfg.enabled))
+    for key in (
+        "hot_retention_days",
+        "segment_max_events",
+        "compaction_interval_seconds",
+    ):
+        default = getattr(ChatArchiveSettings, key)
+        try:
+            value = int(raw.get(key, default))
+        except Exception:
+            value = default
+        setattr(cfg, key, value if value > 0 else default)
+    return cfg
+
+
+def _load_chat_storage_settings(raw: Optional[Dict[str, Any]]) -> ChatStorageSettings:
+    if not isinstance(raw, dict):
+        return ChatStorageSettings()
+
+    cfg = ChatStorageSettings()
+    cfg.batch_writes = bool(raw.get("batch_writes", cfg.batch_writes))
+    for key in (
+        "batch_max_events",
+        "batch_max_delay_ms",
+        "batch_queue_size",
+        "stream_index_flush_seconds",
+        "dedup_capacity",
+    ):
+        default = getattr(ChatStorageSettings, key)
+        try:
+            value = int(raw.get(key, default))
+        except Exception:
+            value = default
+        setattr(cfg, key, value if value > 0 else default)
+    raw_payloads = str(raw.get("raw_payloads", cfg.raw_payloads)).strip().lower()
+    if raw_payloads in ("inline", "compressed"):
+        cfg.raw_payloads = raw_payloads
+    else:
+        log.warning(f"Unknown chat.storage.raw_payloads {raw_payloads!r}; using {cfg.raw_payloads}")
+    cfg.archive = _load_chat_archive_settings(raw.get("archive"))
+    return cfg
+
+
 def _load_chat_settings(raw: Optional[Dict[str, Any]]) -> ChatSettings:
     if not isinstance(raw, dict):
         return ChatSettings()
@@ -248,6 +431,7 @@ def _load_chat_settings(raw: Optional[Dict[str, Any]]) -> ChatSettings:
     return ChatSettings(
         api=_load_chat_api_settings(raw.get("api")),
         synthetic=_load_synthetic_chat_settings(raw.get("synthetic")),
+        storage=_load_chat_storage_settings(raw.get("storage")),
     )
 
 
@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import Any
 
 from shared.logging.logger import get_logger
+from shared.storage.io_executor import WriteBehindExecutor, io_executor
+from shared.utils.hashing import ContentHashCache, publish_cache
 
 log = get_logger("shared.public_exports.publisher")
 
@@ -22,17 +24,25 @@ class PublicExportPublisher:
     Atomic JSON writer for public export documents.
 
     This publisher is intentionally minimal: it writes to a configurable base
-    directory and does not mirror into dashboard state roots.
+    directory and does not mirror into dashboard state roots. Unchanged
+    documents are not rewritten (see ContentHashCache).
     """
 
     DEFAULT_BASE_DIR = Path("exports/public")
 
-    def __init__(self, *, base_dir: Path | str | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        base_dir: Path | str | None = None,
+        cache: ContentHashCache | None = None,
+        executor: WriteBehindExecutor | None = None,
+    ) -> None:
+        self._cache = cache or publish_cache
+        self._executor = executor or io_executor
         self._base_dir = Path(base_dir) if base_dir else self.DEFAULT_BASE_DIR
         self._base_dir.mkdir(parents=True, exist_ok=True)
 
-    def _write_atomic(self, target: Path, payload: Any) -> None:
-        serialized = json.dumps(payload, indent=2)
+    def _write_atomic(self, target: Path, serialized: str) -> None:
         target.parent.mkdir(parents=True, exist_ok=True)
 
         with tempfile.NamedTemporaryFile("w", dir=target.parent, delete=False, encoding="utf-8") as tmp:
@@ -45,17 +55,39 @@ class PublicExportPublisher:
 
     def publish(self, relative_path: Path | str, payload: Any) -> Path:
         """
-        Write a public export document to the configured base directory.
+        Serialize a public export document and queue it for writing under the
+        configured base directory (see shared.storage.io_executor);
+        ``payload`` must not be mutated afterwards.
 
-        Returns the resolved path to the written file to aid observability.
+        A payload that cannot be serialized raises here, as before. The file
+        write itself happens later on the executor, so I/O failures are
+        logged and retried on the next publish instead of being raised.
+
+        Returns the path the document will be written to, to aid observability.
         """
         rel = Path(relative_path)
         target = self._base_dir / rel
+        try:
+            serialized = json.dumps(payload, indent=2)
+        except (TypeError, ValueError) as exc:
+            log.error(f"Failed to serialize public export {rel}: {exc}")
+            raise
+        self._executor.submit(
+            os.path.abspath(target),
+            lambda: self._write_export(rel, target, payload, serialized),
+        )
+        return target
+
+    def _write_export(self, rel: Path, target: Path, payload: Any, serialized: str) -> None:
+        digest = self._cache.fingerprint(payload)
+        if self._cache.is_current(target, digest):
+            return
 
         try:
-            self._write_atomic(target, payload)
+            self._write_atomic(target, serialized)
         except Exception as exc:
+            self._cache.invalidate(target)
             log.error(f"Failed to write public export {rel}: {exc}")
-            raise
+            return
 
-        return target
+        self._cache.record_write(target, digest)
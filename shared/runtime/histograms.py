@@ -0,0 +1,94 @@
+# StreamSuites/shared/runtime/histograms.py
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds in seconds; the last bucket is unbounded.
+DEFAULT_LATENCY_BOUNDS: Tuple[float, ...] = (
+    0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0,
+)
+DEFAULT_PERCENTILES: Tuple[int, ...] = (50, 95, 99)
+
+
+# ======================================================================
+# Latency Histograms (job queue wait / run time)
+#
+# Fixed, non-cumulative buckets: an observation lands in the first bucket
+# whose upper bound is >= the value. Recording is a binary search plus a
+# few additions; memory does not grow with volume. Quantiles are estimated
+# by interpolating linearly inside the bucket that holds the rank, so
+# their precision is bounded by the bucket widths.
+# ======================================================================
+
+
+class LatencyHistogram:
+    """Bucketed distribution of durations in seconds."""
+
+    __slots__ = ("_bounds", "_counts", "_count", "_sum", "_max")
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_LATENCY_BOUNDS) -> None:
+        self._bounds: List[float] = sorted(float(bound) for bound in bounds)
+        self._counts: List[int] = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def observe(self, seconds: float) -> None:
+        value = max(0.0, float(seconds))
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._sum += value
+        if value > self._max:
+            self._max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile ``q`` (0..1); None when empty."""
+
+        if not self._count:
+            return None
+        rank = min(max(float(q), 0.0), 1.0) * self._count
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            if count and cumulative + count >= rank:
+                lower = self._bounds[index - 1] if index else 0.0
+                upper = self._bounds[index] if index < len(self._bounds) else self._max
+                upper = min(upper, self._max)
+                return lower + (upper - lower) * ((rank - cumulative) / count)
+            cumulative += count
+        return self._max
+
+    def percentiles(self, points: Iterable[int] = DEFAULT_PERCENTILES) -> Dict[str, Optional[float]]:
+        """``{"p50": ..., "p95": ..., "p99": ...}`` in seconds."""
+
+        result: Dict[str, Optional[float]] = {}
+        for point in points:
+            value = self.quantile(point / 100)
+            result[f"p{point}"] = None if value is None else round(value, 4)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """``{"count", "sum", "max", "buckets": [{"le", "count"}]}``; ``le`` is None for +Inf."""
+
+        buckets = [
+            {"le": bound, "count": count}
+            for bound, count in zip(self._bounds, self._counts)
+        ]
+        buckets.append({"le": None, "count": self._counts[-1]})
+        return {
+            "count": self._count,
+            "sum": round(self._sum, 6),
+            "max": round(self._max, 6),
+            "buckets": buckets,
+        }
+
+
+__all__ = [
+    "DEFAULT_LATENCY_BOUNDS",
+    "DEFAULT_PERCENTILES",
+    "LatencyHistogram",
+]
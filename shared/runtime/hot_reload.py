@@ -130,15 +130,7 @@ class HotReloadWatcher:
                     )
                     runtime_state.record_platform_heartbeat("hot_reload")
 
-                    try:
-                        runtime_snapshot_exporter.publish()
-                    except Exception as exc:  # pragma: no cover - defensive
-                        runtime_state.record_event(
-                            source="hot_reload",
-                            severity="error",
-                            message=f"Export republish failed: {exc}",
-                        )
-                        log.warning(f"Hot reload export publish failed: {exc}")
+                    runtime_snapshot_exporter.mark_dirty()
 
                     self._last_hash = new_hash
 
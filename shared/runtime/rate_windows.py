@@ -0,0 +1,133 @@
+# StreamSuites/shared/runtime/rate_windows.py
+from __future__ import annotations
+
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Window label -> length in seconds, in publish order.
+DEFAULT_WINDOWS: Tuple[Tuple[str, int], ...] = (
+    ("60s", 60),
+    ("5m", 300),
+    ("15m", 900),
+    ("1h", 3600),
+)
+DEFAULT_BUCKET_SECONDS = 1
+
+
+# ======================================================================
+# Rate Windows (telemetry/rates.json)
+#
+# Counts are added into fixed time buckets held in a ring per
+# (metric, platform) series. Each series keeps a running sum per window:
+# when the ring advances, the bucket leaving a window is subtracted from
+# that window's sum. Adding and reading are O(1) per series; advancing
+# costs one step per elapsed bucket, capped at the ring size.
+# ======================================================================
+
+
+class _Series:
+    __slots__ = ("buckets", "sums", "head")
+
+    def __init__(self, size: int, window_count: int, head: int) -> None:
+        self.buckets = array("q", bytes(8 * size))
+        self.sums = [0] * window_count
+        self.head = head
+
+
+class RateWindows:
+    """Sliding-window counters for every (metric, platform) pair."""
+
+    def __init__(
+        self,
+        *,
+        windows: Iterable[Tuple[str, int]] = DEFAULT_WINDOWS,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._bucket_seconds = max(1, int(bucket_seconds))
+        self._windows: List[Tuple[str, int]] = [
+            (label, max(1, -(-int(seconds) // self._bucket_seconds)))
+            for label, seconds in windows
+        ]
+        if not self._windows:
+            raise ValueError("At least one rate window is required")
+        self._size = max(length for _, length in self._windows)
+        self._clock = clock
+        self._series: Dict[Tuple[str, str], _Series] = {}
+
+    @property
+    def window_labels(self) -> List[str]:
+        return [label for label, _ in self._windows]
+
+    def _bucket(self, now: Optional[float]) -> int:
+        return int((self._clock() if now is None else now) // self._bucket_seconds)
+
+    def _advance(self, series: _Series, bucket: int) -> None:
+        steps = bucket - series.head
+        if steps <= 0:
+            return
+        size = self._size
+        buckets = series.buckets
+        if steps >= size:
+            # Everything in the ring has expired.
+            for index in range(size):
+                buckets[index] = 0
+            for index in range(len(series.sums)):
+                series.sums[index] = 0
+            series.head = bucket
+            return
+        sums = series.sums
+        windows = self._windows
+        for step in range(series.head + 1, bucket + 1):
+            for index, (_, length) in enumerate(windows):
+                sums[index] -= buckets[(step - length) % size]
+            buckets[step % size] = 0
+        series.head = bucket
+
+    def add(self, metric: str, platform: str, amount: int = 1, *, now: Optional[float] = None) -> None:
+        if not amount:
+            return
+        bucket = self._bucket(now)
+        key = (metric, platform)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(self._size, len(self._windows), bucket)
+        else:
+            self._advance(series, bucket)
+            # A late sample counts toward the current bucket.
+            bucket = series.head
+        series.buckets[bucket % self._size] += amount
+        for index in range(len(series.sums)):
+            series.sums[index] += amount
+
+    def totals(
+        self,
+        metrics: Iterable[str],
+        platforms: Iterable[str],
+        *,
+        now: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """``{window: {metric: {platform: count}}}``, zero-filled for unseen series."""
+
+        bucket = self._bucket(now)
+        metrics = list(metrics)
+        platforms = list(platforms)
+        result: Dict[str, Dict[str, Dict[str, int]]] = {
+            label: {metric: {} for metric in metrics} for label, _ in self._windows
+        }
+        for metric in metrics:
+            for platform in platforms:
+                series = self._series.get((metric, platform))
+                if series is not None:
+                    self._advance(series, bucket)
+                for index, (label, _) in enumerate(self._windows):
+                    result[label][metric][platform] = series.sums[index] if series else 0
+        return result
+
+
+__all__ = [
+    "DEFAULT_BUCKET_SECONDS",
+    "DEFAULT_WINDOWS",
+    "RateWindows",
+]
@@ -0,0 +1,127 @@
+# StreamSuites/shared/runtime/snapshot_deltas.py
+from __future__ import annotations
+
+import copy
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from shared.utils.hashing import DEFAULT_VOLATILE_KEYS, content_hash
+from shared.utils.json_patch import diff
+
+DEFAULT_MAX_ENTRIES = 120
+
+# Stamped into every full document so pollers know where to resume.
+REVISION_KEY = "revision"
+EPOCH_KEY = "revision_epoch"
+
+
+# ======================================================================
+# Snapshot Delta Log (runtime_deltas.json)
+#
+# Pollers that hold a full document at revision N fetch the small delta
+# log instead of the full documents:
+#
+#   - if the log's revision_epoch differs from the document's, or N is
+#     below base_revision, reload the full documents (cold start)
+#   - otherwise apply, in order, the patches of every delta entry with
+#     revision > N for that document (RFC 6902; see shared.utils.json_patch)
+#
+# Revisions only advance when content changes. Volatile top-level fields
+# (generated_at, heartbeat, publish_io) and the revision stamp itself are
+# not diffed; section hashes let pollers verify what they hold.
+# ======================================================================
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class SnapshotDeltaLog:
+    """
+    Rolling log of per-document JSON patches keyed by a monotonically
+    increasing revision. Revisions restart with a new epoch per process.
+    """
+
+    IGNORED_KEYS = tuple(DEFAULT_VOLATILE_KEYS) + (REVISION_KEY, EPOCH_KEY)
+
+    def __init__(self, *, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._epoch = int(datetime.now(timezone.utc).timestamp() * 1000)
+        self._revision = 0
+        self._base_revision = 0
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(max_entries)))
+        self._baseline: Dict[str, Dict[str, Any]] = {}
+        self._sections: Dict[str, Dict[str, Optional[str]]] = {}
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def _strip(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in document.items() if key not in self.IGNORED_KEYS}
+
+    def record(self, documents: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Diff each named document against the previous call, advance the
+        revision if anything changed, and stamp the revision into every
+        document (in place). Returns the current revision.
+        """
+        patches: Dict[str, List[Dict[str, Any]]] = {}
+        resync = False
+
+        for name, document in documents.items():
+            # Copied so later in-place changes to shared runtime objects cannot
+            # leak into the baseline.
+            content = copy.deepcopy(self._strip(document))
+            previous = self._baseline.get(name)
+            if previous is None:
+                resync = True
+            else:
+                ops = diff(previous, content)
+                if not ops:
+                    continue
+                patches[name] = ops
+            self._baseline[name] = content
+            self._sections[name] = {
+                key: content_hash(value, ()) for key, value in content.items()
+            }
+
+        if patches or resync:
+            self._revision += 1
+        if resync:
+            # A document without history cannot be patched; start the log over.
+            self._entries.clear()
+            self._base_revision = self._revision
+        elif patches:
+            if len(self._entries) == self._entries.maxlen:
+                self._base_revision = self._entries[0]["revision"]
+            self._entries.append({
+                "revision": self._revision,
+                "generated_at": _utc_now_iso(),
+                "patches": patches,
+            })
+
+        for document in documents.values():
+            document[REVISION_KEY] = self._revision
+            document[EPOCH_KEY] = self._epoch
+        return self._revision
+
+    def build_document(self) -> Dict[str, Any]:
+        """The runtime_deltas.json document for the current revision."""
+        return {
+            "schema_version": "v1",
+            "generated_at": _utc_now_iso(),
+            REVISION_KEY: self._revision,
+            EPOCH_KEY: self._epoch,
+            "base_revision": self._base_revision,
+            "sections": {name: dict(hashes) for name, hashes in self._sections.items()},
+            "deltas": list(self._entries),
+        }
+
+
+__all__ = [
+    "DEFAULT_MAX_ENTRIES",
+    "EPOCH_KEY",
+    "REVISION_KEY",
+    "SnapshotDeltaLog",
+]
@@ -8,11 +8,17 @@ from .reader import (
 )
 from .store import (
     append_chat_event,
+    compact_archive,
+    configure_store,
     get_store,
     get_stream,
     list_streams,
     paginate_events,
     range_events,
+    search_available,
+    search_events,
+    shutdown_store,
+    store_metrics,
     tail_events,
 )
 
@@ -22,10 +28,16 @@ __all__ = [
     "CHAT_EVENT_STORAGE_ROOT",
     "CHAT_LOG_ROOT",
     "append_chat_event",
+    "compact_archive",
+    "configure_store",
     "get_store",
     "get_stream",
     "list_streams",
     "paginate_events",
     "range_events",
+    "search_available",
+    "search_events",
+    "shutdown_store",
+    "store_metrics",
     "tail_events",
 ]
@@ -0,0 +1,388 @@
+"""Archive segments for ended chat streams.
+
+Hot chat lives in ``chat_events``. Once a stream has ended and aged past the
+hot retention window, its rows are moved into immutable, zlib-compressed
+segments in ``chat_archive_segments`` (one stream per segment, at most
+``segment_max_events`` rows each, in ``(ts_ms, id)`` order). Each segment is
+written and its rows deleted from ``chat_events`` in the same transaction, so
+an event is always in exactly one place.
+
+Rows keep their original ``id``, so ``(ts_ms, id)`` cursors handed out before
+compaction stay valid. ``ChatEventStore`` merges archived rows with hot rows
+for ``tail``/``range``/``paginate``. Archived rows leave the FTS search index
+through the ``chat_events`` delete trigger.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from shared.logging.logger import get_logger
+from shared.storage.sqlite_pool import SQLiteConnectionManager
+
+log = get_logger("shared.chat_events.archive")
+
+SEGMENT_CODEC = "zlib-json"
+DEFAULT_SEGMENT_MAX_EVENTS = 5000
+DEFAULT_SEGMENT_CACHE_SIZE = 8
+
+Key = Tuple[int, int]
+# (conn, event_ids) -> {event_id: raw_json} for payloads kept outside chat_events
+RawLoader = Callable[[sqlite3.Connection, Sequence[str]], Dict[str, str]]
+
+
+def row_key(row: Any) -> Tuple[bool, int, int]:
+    """Sort key matching ``ORDER BY ts_ms, id`` (NULL ts_ms first)."""
+
+    ts_ms = row["ts_ms"]
+    return (ts_ms is not None, ts_ms if ts_ms is not None else 0, row["id"])
+
+
+def decode_segment(codec: str, payload: bytes) -> Optional[List[Dict[str, Any]]]:
+    """Rows stored in one segment payload, or None for an unknown codec."""
+
+    if codec != SEGMENT_CODEC:
+        return None
+    return json.loads(zlib.decompress(payload))
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class ChatArchive:
+    def __init__(
+        self,
+        db: SQLiteConnectionManager,
+        *,
+        segment_max_events: int = DEFAULT_SEGMENT_MAX_EVENTS,
+        cache_segments: int = DEFAULT_SEGMENT_CACHE_SIZE,
+        raw_loader: Optional[RawLoader] = None,
+    ) -> None:
+        self._db = db
+        self._raw_loader = raw_loader
+        self._segment_max_events = max(1, int(segment_max_events))
+        self._cache_size = max(0, int(cache_segments))
+        self._cache: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._streams: Set[str] = set()
+        self._stop = threading.Event()
+        self._progress_lock = threading.Lock()
+        self._progress: Dict[str, Any] = {
+            "running": False,
+            "current_stream": None,
+            "streams_pending": 0,
+            "last_run_started_at": None,
+            "last_run_finished_at": None,
+            "last_run_duration_ms": None,
+            "last_run_streams": 0,
+            "last_run_events": 0,
+            "last_error": None,
+            "segments_total": 0,
+            "events_archived_total": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def init_schema(self) -> None:
+        with self._db.writer() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_archive_segments (
+                    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    stream_id TEXT NOT NULL,
+                    first_ts_ms INTEGER NOT NULL,
+                    first_id INTEGER NOT NULL,
+                    last_ts_ms INTEGER NOT NULL,
+                    last_id INTEGER NOT NULL,
+                    event_count INTEGER NOT NULL,
+                    platform_counts TEXT NOT NULL,
+                    last_ts TEXT NOT NULL,
+                    last_platform TEXT,
+                    codec TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    raw_bytes INTEGER NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_chat_archive_stream
+                ON chat_archive_segments(stream_id, first_ts_ms, first_id)
+                """
+            )
+            totals = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(event_count), 0) FROM chat_archive_segments"
+            ).fetchone()
+            streams = conn.execute(
+                "SELECT DISTINCT stream_id FROM chat_archive_segments"
+            ).fetchall()
+
+        self._streams = {row["stream_id"] for row in streams}
+        with self._progress_lock:
+            self._progress["segments_total"] = int(totals[0])
+            self._progress["events_archived_total"] = int(totals[1])
+
+    def has_stream(self, stream_id: str) -> bool:
+        return stream_id in self._streams
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _load_segment(self, conn: sqlite3.Connection, segment_id: int) -> List[Dict[str, Any]]:
+        with self._cache_lock:
+            cached = self._cache.get(segment_id)
+            if cached is not None:
+                self._cache.move_to_end(segment_id)
+                return cached
+
+        row = conn.execute(
+            "SELECT codec, payload FROM chat_archive_segments WHERE segment_id = ?",
+            (segment_id,),
+        ).fetchone()
+        if row is None:
+            return []
+        rows = decode_segment(row["codec"], row["payload"])
+        if rows is None:
+            log.warning(f"Unknown chat archive codec {row['codec']!r} (segment {segment_id})")
+            return []
+
+        # Segments are immutable, so cached copies never go stale.
+        if self._cache_size:
+            with self._cache_lock:
+                self._cache[segment_id] = rows
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return rows
+
+    def rows(
+        self,
+        conn: sqlite3.Connection,
+        stream_id: str,
+        *,
+        after: Optional[Key] = None,
+        before: Optional[Key] = None,
+        from_ms: Optional[int] = None,
+        to_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Archived rows of one stream within the given bounds, in key order.
+
+        ``after``/``before`` are exclusive ``(ts_ms, id)`` keyset bounds;
+        ``from_ms``/``to_ms`` are inclusive. With ``limit`` only as many
+        segments are decompressed as needed to produce that many rows.
+        """
+
+        if stream_id not in self._streams:
+            return []
+
+        segments = []
+        for seg in conn.execute(
+            """
+            SELECT segment_id, first_ts_ms, first_id, last_ts_ms, last_id
+            FROM chat_archive_segments
+            WHERE stream_id = ?
+            ORDER BY first_ts_ms, first_id
+            """,
+            (stream_id,),
+        ):
+            first = (seg["first_ts_ms"], seg["first_id"])
+            last = (seg["last_ts_ms"], seg["last_id"])
+            if after is not None and last <= after:
+                continue
+            if before is not None and first >= before:
+                continue
+            if from_ms is not None and seg["last_ts_ms"] < from_ms:
+                continue
+            if to_ms is not None and seg["first_ts_ms"] > to_ms:
+                continue
+            segments.append((seg["segment_id"], first, last))
+        if descending:
+            segments.sort(key=lambda seg: seg[2], reverse=True)
+
+        collected: List[Dict[str, Any]] = []
+        for segment_id, first, last in segments:
+            if limit and len(collected) >= limit:
+                collected.sort(key=row_key, reverse=descending)
+                del collected[limit:]
+                threshold = (collected[-1]["ts_ms"], collected[-1]["id"])
+                # Segments are visited in key order, so once one starts past
+                # the current cut-off no later segment can contribute.
+                if (descending and last < threshold) or (not descending and first > threshold):
+                    break
+            for row in self._load_segment(conn, segment_id):
+                key = (row["ts_ms"], row["id"])
+                if after is not None and key <= after:
+                    continue
+                if before is not None and key >= before:
+                    continue
+                if from_ms is not None and row["ts_ms"] < from_ms:
+                    continue
+                if to_ms is not None and row["ts_ms"] > to_ms:
+                    continue
+                collected.append(row)
+
+        collected.sort(key=row_key, reverse=descending)
+        return collected[:limit] if limit else collected
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _write_segment(
+        self,
+        conn: sqlite3.Connection,
+        stream_id: str,
+        rows: List[sqlite3.Row],
+    ) -> None:
+        records = [dict(row) for row in rows]
+        if self._raw_loader is not None:
+            # Segments are self-contained: fold side-table raw payloads back
+            # in before the delete trigger drops them.
+            missing = [record["event_id"] for record in records if not record.get("raw_json")]
+            if missing:
+                raw = self._raw_loader(conn, missing)
+                for record in records:
+                    if not record.get("raw_json") and record["event_id"] in raw:
+                        record["raw_json"] = raw[record["event_id"]]
+        encoded = json.dumps(records, separators=(",", ":")).encode("utf-8")
+        platform_counts: Dict[str, int] = {}
+        for record in records:
+            platform = (record.get("source_platform") or "").lower()
+            if platform:
+                platform_counts[platform] = platform_counts.get(platform, 0) + 1
+        first, last = records[0], records[-1]
+        conn.execute(
+            """
+            INSERT INTO chat_archive_segments (
+                stream_id, first_ts_ms, first_id, last_ts_ms, last_id,
+                event_count, platform_counts, last_ts, last_platform,
+                codec, payload, raw_bytes, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                stream_id,
+                first["ts_ms"],
+                first["id"],
+                last["ts_ms"],
+                last["id"],
+                len(records),
+                json.dumps(platform_counts, sort_keys=True),
+                last["ts"],
+                last.get("source_platform"),
+                SEGMENT_CODEC,
+                zlib.compress(encoded, 6),
+                len(encoded),
+                _utc_now_iso(),
+            ),
+        )
+
+    def compact_stream(self, stream_id: str) -> Tuple[int, int]:
+        """
+        Move all timestamped hot rows of ``stream_id`` into archive segments.
+
+        Each segment is its own short transaction so live writes interleave.
+        Returns ``(segments_written, events_archived)``.
+        """
+
+        segments = 0
+        events = 0
+        while not self._stop.is_set():
+            with self._db.writer() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT * FROM chat_events
+                    WHERE stream_id = ? AND ts_ms IS NOT NULL
+                    ORDER BY ts_ms, id
+                    LIMIT ?
+                    """,
+                    (stream_id, self._segment_max_events),
+                ).fetchall()
+                if not rows:
+                    break
+                self._write_segment(conn, stream_id, rows)
+                conn.executemany(
+                    "DELETE FROM chat_events WHERE id = ?",
+                    [(row["id"],) for row in rows],
+                )
+            self._streams.add(stream_id)
+            segments += 1
+            events += len(rows)
+            with self._progress_lock:
+                self._progress["segments_total"] += 1
+                self._progress["events_archived_total"] += len(rows)
+        return segments, events
+
+    def compact(self, stream_ids: Iterable[str]) -> Dict[str, Any]:
+        """Compact the given streams, recording progress for the snapshot."""
+
+        pending = list(stream_ids)
+        started = time.perf_counter()
+        with self._progress_lock:
+            if self._progress["running"]:
+                return dict(self._progress)
+            self._progress.update(
+                running=True,
+                streams_pending=len(pending),
+                last_run_started_at=_utc_now_iso(),
+                last_error=None,
+            )
+
+        streams_done = 0
+        events_done = 0
+        try:
+            for stream_id in pending:
+                if self._stop.is_set():
+                    break
+                with self._progress_lock:
+                    self._progress["current_stream"] = stream_id
+                _, archived = self.compact_stream(stream_id)
+                streams_done += 1
+                events_done += archived
+                with self._progress_lock:
+                    self._progress["streams_pending"] = len(pending) - streams_done
+                if archived:
+                    log.info(f"Archived {archived} chat event(s) for ended stream {stream_id}")
+        except Exception as exc:
+            log.warning(f"Chat archive compaction failed: {exc}")
+            with self._progress_lock:
+                self._progress["last_error"] = str(exc)
+        finally:
+            with self._progress_lock:
+                self._progress.update(
+                    running=False,
+                    current_stream=None,
+                    last_run_finished_at=_utc_now_iso(),
+                    last_run_duration_ms=round((time.perf_counter() - started) * 1000.0, 1),
+                    last_run_streams=streams_done,
+                    last_run_events=events_done,
+                )
+        return self.metrics()
+
+    def stop(self) -> None:
+        """Ask an in-flight compaction to stop after its current segment."""
+
+        self._stop.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._progress_lock:
+            snapshot = dict(self._progress)
+        snapshot["archived_streams"] = len(self._streams)
+        snapshot["segment_max_events"] = self._segment_max_events
+        return snapshot
+
+
+__all__ = ["ChatArchive", "decode_segment", "row_key"]
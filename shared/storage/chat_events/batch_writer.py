@@ -0,0 +1,245 @@
+"""Group-commit background writer for chat event persistence.
+
+Producers hand items to a bounded in-memory queue and return immediately. A
+single writer thread drains the queue and hands batches to a flush callback
+every ``max_batch`` items or ``max_delay_ms`` milliseconds, whichever comes
+first. The delay is the durability window: an unclean process exit can lose
+at most that much buffered chat.
+
+A failed batch is retried (transient errors such as SQLITE_BUSY), then
+written one item at a time so a single bad item cannot take its batch down
+with it. Items that still fail are reported through ``on_drop``.
+
+The writer is backend-agnostic; ``ChatEventStore`` supplies the flush callback
+that performs the actual SQLite/JSONL writes inside a single transaction.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from shared.logging.logger import get_logger
+
+log = get_logger("shared.chat_events.batch_writer")
+
+_STOP = object()
+
+DEFAULT_MAX_BLOCK_MS = 50
+DEFAULT_RETRY_ATTEMPTS = 2
+_RETRY_BACKOFF_SECONDS = 0.05
+
+
+class _FlushBarrier:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class ChatEventBatchWriter:
+    """
+    Bounded queue + dedicated writer thread with group commit.
+
+    When the queue is full, ``submit`` waits at most ``max_block_ms`` for
+    the writer to catch up and then returns False, so a stalled disk pushes
+    back on producers without freezing the event loop. After ``shutdown``
+    the writer degrades to synchronous writes so late producers never lose
+    events.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], None],
+        *,
+        max_batch: int = 200,
+        max_delay_ms: int = 250,
+        max_queue: int = 10000,
+        max_block_ms: int = DEFAULT_MAX_BLOCK_MS,
+        retry_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        on_drop: Optional[Callable[[Any, Exception], None]] = None,
+        name: str = "chat-event-writer",
+    ) -> None:
+        self._flush = flush
+        self._max_block = max(0, int(max_block_ms)) / 1000.0
+        self._retry_attempts = max(0, int(retry_attempts))
+        self._on_drop = on_drop
+        self._max_batch = max(1, int(max_batch))
+        self._max_delay = max(0, int(max_delay_ms)) / 1000.0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {
+            "enqueued": 0,
+            "flushed_items": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "flush_retries": 0,
+            "dropped_items": 0,
+            "queue_full": 0,
+            "rejected": 0,
+            "max_queue_depth": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def submit(self, item: Any) -> bool:
+        """Queue ``item``; False if the queue stayed full for ``max_block_ms``."""
+
+        if self._stopped:
+            return self._write([item]) == 1
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._metrics_lock:
+                self._metrics["queue_full"] += 1
+            try:
+                self._queue.put(item, timeout=self._max_block)
+            except queue.Full:
+                with self._metrics_lock:
+                    self._metrics["rejected"] += 1
+                return False
+
+        depth = self._queue.qsize()
+        with self._metrics_lock:
+            self._metrics["enqueued"] += 1
+            if depth > self._metrics["max_queue_depth"]:
+                self._metrics["max_queue_depth"] = depth
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted before this call is written."""
+
+        if self._stopped or not self._thread.is_alive():
+            return True
+        barrier = _FlushBarrier()
+        self._queue.put(barrier)
+        return barrier.done.wait(timeout)
+
+    def shutdown(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush pending items and stop the writer thread."""
+
+        if self._stopped:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._stopped = True
+        if self._thread.is_alive():
+            log.warning("Chat event writer did not stop within timeout")
+
+    # ------------------------------------------------------------------
+    # Observability
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        flushes = snapshot.pop("flushes")
+        total_ms = snapshot.pop("total_flush_ms")
+        snapshot["flushes"] = flushes
+        snapshot["avg_flush_ms"] = round(total_ms / flushes, 3) if flushes else 0.0
+        snapshot["last_flush_ms"] = round(snapshot["last_flush_ms"], 3)
+        snapshot["max_flush_ms"] = round(snapshot["max_flush_ms"], 3)
+        snapshot["queue_depth"] = self._queue.qsize()
+        snapshot["max_batch"] = self._max_batch
+        snapshot["max_delay_ms"] = int(self._max_delay * 1000)
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _flush_with_retry(self, batch: List[Any]) -> Optional[Exception]:
+        error: Optional[Exception] = None
+        for attempt in range(self._retry_attempts + 1):
+            if attempt:
+                with self._metrics_lock:
+                    self._metrics["flush_retries"] += 1
+                time.sleep(_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+            try:
+                self._flush(batch)
+                return None
+            except Exception as exc:
+                error = exc
+        return error
+
+    def _write(self, batch: List[Any]) -> int:
+        """Write ``batch``; returns how many items were persisted."""
+
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        written = len(batch)
+        error = self._flush_with_retry(batch)
+        if error is not None:
+            with self._metrics_lock:
+                self._metrics["flush_errors"] += 1
+            log.warning(
+                f"Chat event batch flush failed ({len(batch)} item(s)), "
+                f"writing items individually: {error}"
+            )
+            written = 0
+            for item in batch:
+                try:
+                    self._flush([item])
+                    written += 1
+                except Exception as exc:
+                    with self._metrics_lock:
+                        self._metrics["dropped_items"] += 1
+                    log.error(f"Chat event write failed, item dropped: {exc}")
+                    if self._on_drop is not None:
+                        try:
+                            self._on_drop(item, exc)
+                        except Exception as drop_exc:
+                            log.warning(f"Chat event drop callback failed: {drop_exc}")
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._metrics_lock:
+            self._metrics["flushes"] += 1
+            self._metrics["flushed_items"] += written
+            self._metrics["last_flush_ms"] = elapsed_ms
+            self._metrics["total_flush_ms"] += elapsed_ms
+            if elapsed_ms > self._metrics["max_flush_ms"]:
+                self._metrics["max_flush_ms"] = elapsed_ms
+        return written
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Any] = []
+            deadline = time.monotonic() + self._max_delay
+
+            while True:
+                if item is _STOP:
+                    self._write(batch)
+                    return
+                if isinstance(item, _FlushBarrier):
+                    self._write(batch)
+                    batch = []
+                    item.done.set()
+                else:
+                    batch.append(item)
+                    if len(batch) >= self._max_batch:
+                        break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 and batch:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0.0)) if batch else self._queue.get()
+                except queue.Empty:
+                    break
+                if not batch:
+                    deadline = time.monotonic() + self._max_delay
+
+            self._write(batch)
+
+
+__all__ = ["ChatEventBatchWriter", "DEFAULT_MAX_BLOCK_MS", "DEFAULT_RETRY_ATTEMPTS"]
@@ -0,0 +1,94 @@
+"""Opaque pagination cursors for chat event queries.
+
+A cursor names a position between two events. Clients must treat it as an
+opaque string; internally it is URL-safe base64 of a compact JSON array:
+
+- SQLite: ``[1, "s", ts_ms, id]``: keyset position on ``(ts_ms, id)``;
+  ``ts_ms`` is null for events whose timestamp could not be parsed
+- JSONL:  ``[1, "j", file_name, byte_offset]``: position inside a stream file
+- Search: ``[1, "q", query_hash, offset]``: rank offset within one search
+
+Plain integers from older clients are still accepted: a SQLite rowid or a
+JSONL byte offset, depending on the active backend.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+CURSOR_VERSION = 1
+
+DIRECTION_FORWARD = "forward"
+DIRECTION_BACKWARD = "backward"
+DIRECTIONS = (DIRECTION_FORWARD, DIRECTION_BACKWARD)
+
+
+@dataclass(frozen=True)
+class ChatCursor:
+    kind: str
+    ts_ms: Optional[int] = None
+    row_id: Optional[int] = None
+    file_name: Optional[str] = None
+    offset: Optional[int] = None
+    query_hash: Optional[str] = None
+    legacy: bool = False
+
+
+def _encode(payload: list) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def encode_sqlite_cursor(ts_ms: Optional[int], row_id: int) -> str:
+    return _encode([CURSOR_VERSION, "s", None if ts_ms is None else int(ts_ms), int(row_id)])
+
+
+def encode_jsonl_cursor(file_name: str, offset: int) -> str:
+    return _encode([CURSOR_VERSION, "j", file_name, int(offset)])
+
+
+def encode_search_cursor(query_hash: str, offset: int) -> str:
+    return _encode([CURSOR_VERSION, "q", query_hash, int(offset)])
+
+
+def decode_cursor(token: Optional[str]) -> Optional[ChatCursor]:
+    """Parse a cursor string; returns None for missing or malformed input."""
+
+    if not token:
+        return None
+    token = token.strip()
+    if token.isdigit():
+        value = int(token)
+        return ChatCursor(kind="legacy", row_id=value, offset=value, legacy=True)
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        return None
+    if not isinstance(payload, list) or len(payload) != 4 or payload[0] != CURSOR_VERSION:
+        return None
+
+    _, kind, first, second = payload
+    if kind == "s" and (first is None or isinstance(first, int)) and isinstance(second, int):
+        return ChatCursor(kind="sqlite", ts_ms=first, row_id=second)
+    if kind == "j" and isinstance(first, str) and isinstance(second, int):
+        return ChatCursor(kind="jsonl", file_name=first, offset=max(0, second))
+    if kind == "q" and isinstance(first, str) and isinstance(second, int):
+        return ChatCursor(kind="search", query_hash=first, offset=max(0, second))
+    return None
+
+
+__all__ = [
+    "ChatCursor",
+    "DIRECTIONS",
+    "DIRECTION_BACKWARD",
+    "DIRECTION_FORWARD",
+    "decode_cursor",
+    "encode_jsonl_cursor",
+    "encode_search_cursor",
+    "encode_sqlite_cursor",
+]
@@ -0,0 +1,69 @@
+"""Bounded duplicate-delivery filter for chat event ids.
+
+Platform reconnects (YouTube page tokens, Rumble SSE resumes) can replay
+messages that were already stored. ``RecentEventIds`` remembers the most
+recent ``capacity`` event ids in insertion/LRU order with O(1) membership
+checks, and counts hits per platform so duplicate rates are observable.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_DEDUP_CAPACITY = 5000
+
+
+class RecentEventIds:
+    """Thread-safe bounded ordered set; the oldest id is evicted first."""
+
+    def __init__(self, capacity: int = DEFAULT_DEDUP_CAPACITY) -> None:
+        self._capacity = max(1, int(capacity))
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._hits_by_platform: Dict[str, int] = {}
+
+    def check_and_add(self, event_id: str, platform: Optional[str] = None) -> bool:
+        """
+        Remember ``event_id``. Returns True if it is new, False if it was
+        already seen (a duplicate delivery).
+        """
+
+        with self._lock:
+            if event_id in self._ids:
+                self._ids.move_to_end(event_id)
+                self._hits += 1
+                key = platform or "unknown"
+                self._hits_by_platform[key] = self._hits_by_platform.get(key, 0) + 1
+                return False
+
+            self._ids[event_id] = None
+            self._misses += 1
+            if len(self._ids) > self._capacity:
+                self._ids.popitem(last=False)
+                self._evictions += 1
+            return True
+
+    def discard(self, event_id: str) -> None:
+        """Forget an id (e.g. when its write failed and a retry is expected)."""
+
+        with self._lock:
+            self._ids.pop(event_id, None)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "capacity": self._capacity,
+                "size": len(self._ids),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hits_by_platform": dict(sorted(self._hits_by_platform.items())),
+            }
+
+
+__all__ = ["DEFAULT_DEDUP_CAPACITY", "RecentEventIds"]
@@ -0,0 +1,278 @@
+"""Seek-based readers for per-stream JSONL chat files.
+
+In JSONL fallback mode each stream is an append-only file of one event per
+line. Reading the whole file for every tail/range/paginate call makes each
+API poll cost O(file). The helpers here keep reads proportional to the
+result instead:
+
+- ``read_tail_lines`` walks backwards from EOF in fixed-size blocks
+- ``read_lines_from`` / ``read_lines_before`` read forward or backward from
+  a byte offset (pagination cursors)
+- ``JsonlOffsetIndex`` is a sparse in-memory index recording, for every
+  ``interval`` lines, the byte span and the min/max ``ts`` (epoch ms) it
+  contains, so a time-window query only reads the blocks that can match
+
+The index is fed directly by the writer (``record_append``) and otherwise
+catches up lazily by scanning only bytes appended since it last looked.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from shared.chat.events import iso_to_epoch_ms
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_INDEX_INTERVAL = 256
+
+
+def line_ts_ms(line: bytes) -> Optional[int]:
+    """Epoch-ms timestamp of one JSONL line, or None if it has none."""
+
+    try:
+        payload = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    return iso_to_epoch_ms(payload.get("ts"))
+
+
+def read_lines_before(
+    path: Path,
+    offset: Optional[int],
+    limit: int,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Tuple[List[bytes], int, int]:
+    """
+    Read up to ``limit`` non-empty lines that end at or before byte ``offset``
+    (EOF when None), walking backwards in fixed-size blocks.
+
+    Returns the lines oldest first, the byte offset where the first returned
+    line starts and the offset just past the last one.
+    """
+
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return [], 0, 0
+
+    with handle:
+        size = handle.seek(0, os.SEEK_END)
+        end = size if offset is None else min(max(0, offset), size)
+        if limit <= 0:
+            return [], end, end
+
+        found: List[Tuple[int, bytes]] = []
+        position = end
+        carry = b""
+        while position > 0 and len(found) < limit:
+            step = min(block_size, position)
+            position -= step
+            handle.seek(position)
+            chunk = handle.read(step) + carry
+            parts = chunk.split(b"\n")
+            # The first part may be the tail of a line that starts in an
+            # earlier block; keep it for the next iteration.
+            carry = parts.pop(0) if position > 0 else b""
+            cursor = position + len(chunk)
+            for part in reversed(parts):
+                line_start = cursor - len(part)
+                cursor = line_start - 1
+                if part.strip():
+                    found.append((line_start, part))
+                    if len(found) >= limit:
+                        break
+
+    if not found:
+        return [], end, end
+    found.reverse()
+    first_start = found[0][0]
+    last_start, last_line = found[-1]
+    last_end = min(end, last_start + len(last_line) + 1)
+    return [line for _, line in found], first_start, last_end
+
+
+def read_tail_lines(
+    path: Path,
+    limit: int,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> List[bytes]:
+    """Return up to ``limit`` last non-empty lines, oldest first."""
+
+    return read_lines_before(path, None, limit, block_size=block_size)[0]
+
+
+def read_lines_from(path: Path, offset: int, limit: int) -> Tuple[List[bytes], int, int]:
+    """
+    Read up to ``limit`` complete non-empty lines starting at byte ``offset``.
+
+    Returns the lines, the byte offset where the first returned line starts
+    and the offset just past the last line consumed. A trailing line without
+    a newline (a write in progress) is not consumed.
+    """
+
+    lines: List[bytes] = []
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return lines, offset, offset
+
+    with handle:
+        handle.seek(max(0, offset))
+        position = handle.tell()
+        first_start = position
+        while len(lines) < limit:
+            line = handle.readline()
+            if not line or not line.endswith(b"\n"):
+                break
+            if line.strip():
+                if not lines:
+                    first_start = position
+                lines.append(line.rstrip(b"\r\n"))
+            position += len(line)
+    return lines, first_start, position
+
+
+class _Block:
+    __slots__ = ("start", "end", "count", "min_ts", "max_ts", "untimed")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.end = start
+        self.count = 0
+        self.min_ts: Optional[int] = None
+        self.max_ts: Optional[int] = None
+        self.untimed = False
+
+    def add(self, length: int, ts_ms: Optional[int]) -> None:
+        self.end += length
+        self.count += 1
+        if ts_ms is None:
+            self.untimed = True
+            return
+        if self.min_ts is None or ts_ms < self.min_ts:
+            self.min_ts = ts_ms
+        if self.max_ts is None or ts_ms > self.max_ts:
+            self.max_ts = ts_ms
+
+    def overlaps(self, from_ms: Optional[int], to_ms: Optional[int]) -> bool:
+        # Lines without a timestamp always pass the filter, so a block that
+        # contains one must be read.
+        if self.untimed:
+            return True
+        if self.min_ts is None:
+            return False
+        if from_ms is not None and self.max_ts < from_ms:
+            return False
+        if to_ms is not None and self.min_ts > to_ms:
+            return False
+        return True
+
+
+class JsonlOffsetIndex:
+    """
+    Sparse byte-offset index over one append-only JSONL file.
+
+    Per-block min/max timestamps make range lookups exact even when events
+    arrive slightly out of order.
+    """
+
+    def __init__(self, path: Path, *, interval: int = DEFAULT_INDEX_INTERVAL) -> None:
+        self._path = Path(path)
+        self._interval = max(1, int(interval))
+        self._lock = threading.Lock()
+        self._blocks: List[_Block] = []
+        self._indexed_size = 0
+
+    def _add_line(self, length: int, ts_ms: Optional[int]) -> None:
+        if not self._blocks or self._blocks[-1].count >= self._interval:
+            self._blocks.append(_Block(self._indexed_size))
+        self._blocks[-1].add(length, ts_ms)
+        self._indexed_size += length
+
+    def _skip(self, length: int) -> None:
+        # Blank lines carry no event; fold them into the current span.
+        if not self._blocks:
+            self._blocks.append(_Block(self._indexed_size))
+        self._blocks[-1].end += length
+        self._indexed_size += length
+
+    def record_append(self, offset: int, lines: Sequence[Tuple[int, Optional[int]]]) -> None:
+        """
+        Register lines the writer just appended at ``offset``.
+
+        ``lines`` holds ``(byte_length_including_newline, ts_ms)`` pairs. If
+        the offset does not line up with what is indexed (another writer, or
+        the index has not caught up yet) the lines are left for ``refresh``.
+        """
+
+        with self._lock:
+            if offset != self._indexed_size:
+                return
+            for length, ts_ms in lines:
+                self._add_line(length, ts_ms)
+
+    def refresh(self) -> None:
+        """Index any complete lines appended since the last look."""
+
+        with self._lock:
+            try:
+                size = self._path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size < self._indexed_size:
+                # Truncated or replaced: start over.
+                self._blocks.clear()
+                self._indexed_size = 0
+            if size == self._indexed_size:
+                return
+            with self._path.open("rb") as handle:
+                handle.seek(self._indexed_size)
+                for line in handle:
+                    if not line.endswith(b"\n"):
+                        break
+                    if not line.strip():
+                        self._skip(len(line))
+                        continue
+                    self._add_line(len(line), line_ts_ms(line))
+
+    def spans(self, from_ms: Optional[int], to_ms: Optional[int]) -> List[Tuple[int, int]]:
+        """Merged ``(start, end)`` byte spans of blocks that may hold matches."""
+
+        self.refresh()
+        spans: List[Tuple[int, int]] = []
+        with self._lock:
+            for block in self._blocks:
+                if not block.overlaps(from_ms, to_ms):
+                    continue
+                if spans and spans[-1][1] == block.start:
+                    spans[-1] = (spans[-1][0], block.end)
+                else:
+                    spans.append((block.start, block.end))
+        return spans
+
+    def read_span(self, start: int, end: int) -> List[bytes]:
+        try:
+            with self._path.open("rb") as handle:
+                handle.seek(start)
+                data = handle.read(end - start)
+        except FileNotFoundError:
+            return []
+        return [line for line in data.split(b"\n") if line.strip()]
+
+
+__all__ = [
+    "DEFAULT_INDEX_INTERVAL",
+    "JsonlOffsetIndex",
+    "line_ts_ms",
+    "read_lines_before",
+    "read_lines_from",
+    "read_tail_lines",
+]
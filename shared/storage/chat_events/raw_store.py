@@ -0,0 +1,264 @@
+"""Compressed side-table storage for raw platform chat payloads.
+
+The original platform payload (full IRC line, Rumble message dict, ...) is
+rarely read but dominates row size. In ``compressed`` mode it is kept out of
+``chat_events`` in ``chat_event_raw``, keyed by ``event_id``, zlib-compressed
+and only loaded when a caller explicitly asks for raw data.
+
+Individual payloads are small, so plain zlib gains little. Once enough
+samples of a platform have been seen, a preset dictionary is built from them
+(the tail of the concatenated samples, which is what zlib draws matches from)
+and persisted in ``chat_raw_dictionaries``; later payloads for that platform
+compress against it. Earlier rows keep ``dict_key = NULL``. A payload that
+zlib would not shrink (common before a dictionary exists) is stored as-is
+with codec ``none``, so compressed mode never grows a payload. Dictionaries are
+content-addressed and re-asserted in every batch that uses them, so a rolled
+back transaction can never leave rows pointing at a missing dictionary.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from shared.logging.logger import get_logger
+from shared.storage.sqlite_pool import SQLiteConnectionManager
+
+log = get_logger("shared.chat_events.raw_store")
+
+RAW_CODEC = "zlib"
+# Stored uncompressed because compression would not make it smaller.
+RAW_CODEC_NONE = "none"
+RAW_MODE_INLINE = "inline"
+RAW_MODE_COMPRESSED = "compressed"
+RAW_MODES = (RAW_MODE_INLINE, RAW_MODE_COMPRESSED)
+
+DEFAULT_DICTIONARY_SAMPLES = 200
+# zlib's window is 32 KiB; dictionary bytes beyond that are never used.
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+
+class RawPayloadStore:
+    def __init__(
+        self,
+        db: SQLiteConnectionManager,
+        *,
+        dictionary_samples: int = DEFAULT_DICTIONARY_SAMPLES,
+    ) -> None:
+        self._db = db
+        self._dictionary_samples = max(1, int(dictionary_samples))
+        self._lock = threading.Lock()
+        # platform -> (dict_key, dictionary bytes) used for new payloads
+        self._active: Dict[str, Tuple[str, bytes]] = {}
+        # dict_key -> dictionary bytes, for decompression
+        self._dictionaries: Dict[str, bytes] = {}
+        self._samples: Dict[str, List[bytes]] = {}
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def init_schema(self) -> None:
+        with self._db.writer() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_event_raw (
+                    event_id TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    dict_key TEXT,
+                    payload BLOB NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_raw_dictionaries (
+                    dict_key TEXT PRIMARY KEY,
+                    platform TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            # Raw payloads follow their event out of chat_events (archive
+            # compaction, manual cleanup).
+            conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS chat_event_raw_ad
+                AFTER DELETE ON chat_events BEGIN
+                    DELETE FROM chat_event_raw WHERE event_id = old.event_id;
+                END
+                """
+            )
+            rows = conn.execute(
+                "SELECT dict_key, platform, data FROM chat_raw_dictionaries ORDER BY created_at"
+            ).fetchall()
+
+        with self._lock:
+            for row in rows:
+                data = bytes(row["data"])
+                self._dictionaries[row["dict_key"]] = data
+                self._active[row["platform"]] = (row["dict_key"], data)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _train(self, platform: str, samples: List[bytes]) -> None:
+        data = b"".join(samples)[-MAX_DICTIONARY_BYTES:]
+        dict_key = hashlib.sha1(data).hexdigest()[:16]
+        self._dictionaries[dict_key] = data
+        self._active[platform] = (dict_key, data)
+        log.info(f"Built raw payload dictionary for {platform} ({len(data)} bytes)")
+
+    def encode(self, platform: str, raw_json: str) -> Tuple[str, Optional[str], bytes]:
+        """
+        Compress one payload; returns ``(codec, dict_key, payload_bytes)``.
+        Falls back to the uncompressed bytes (codec ``none``) when
+        compression does not make the payload smaller.
+        """
+
+        data = raw_json.encode("utf-8")
+        with self._lock:
+            active = self._active.get(platform)
+            if active is None:
+                samples = self._samples.setdefault(platform, [])
+                samples.append(data)
+                if len(samples) >= self._dictionary_samples:
+                    self._train(platform, samples)
+                    del self._samples[platform]
+                    active = self._active.get(platform)
+
+            if active is not None:
+                dict_key, zdict = active
+                compressor = zlib.compressobj(level=6, zdict=zdict)
+                payload = compressor.compress(data) + compressor.flush()
+            else:
+                dict_key = None
+                payload = zlib.compress(data, 6)
+
+            codec = RAW_CODEC
+            if len(payload) >= len(data):
+                codec, dict_key, payload = RAW_CODEC_NONE, None, data
+
+            self._bytes_in += len(data)
+            self._bytes_out += len(payload)
+        return codec, dict_key, payload
+
+    def insert(
+        self,
+        conn: sqlite3.Connection,
+        items: Iterable[Tuple[str, str, str]],
+    ) -> None:
+        """Store ``(event_id, platform, raw_json)`` triples."""
+
+        rows = []
+        used: Dict[str, str] = {}
+        for event_id, platform, raw_json in items:
+            codec, dict_key, payload = self.encode(platform, raw_json)
+            if dict_key is not None:
+                used[dict_key] = platform
+            rows.append((event_id, codec, dict_key, payload))
+        if not rows:
+            return
+
+        created_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO chat_raw_dictionaries (dict_key, platform, data, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (dict_key, platform, self._dictionaries[dict_key], created_at)
+                for dict_key, platform in used.items()
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO chat_event_raw (event_id, codec, dict_key, payload)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows,
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _decode(
+        self,
+        conn: sqlite3.Connection,
+        codec: str,
+        dict_key: Optional[str],
+        payload: bytes,
+    ) -> Optional[str]:
+        if codec == RAW_CODEC_NONE:
+            return payload.decode("utf-8")
+        if codec != RAW_CODEC:
+            log.warning(f"Unknown raw payload codec {codec!r}")
+            return None
+        if dict_key is None:
+            return zlib.decompress(payload).decode("utf-8")
+        zdict = self._dictionaries.get(dict_key)
+        if zdict is None:
+            # Written by another process since we loaded dictionaries.
+            row = conn.execute(
+                "SELECT data FROM chat_raw_dictionaries WHERE dict_key = ?",
+                (dict_key,),
+            ).fetchone()
+            if row is None:
+                log.warning(f"Missing raw payload dictionary {dict_key}")
+                return None
+            zdict = bytes(row["data"])
+            with self._lock:
+                self._dictionaries[dict_key] = zdict
+        decompressor = zlib.decompressobj(zdict=zdict)
+        return (decompressor.decompress(payload) + decompressor.flush()).decode("utf-8")
+
+    def load(self, conn: sqlite3.Connection, event_ids: Sequence[str]) -> Dict[str, str]:
+        """Raw JSON text for the given events that have a side-table payload."""
+
+        found: Dict[str, str] = {}
+        ids = list(dict.fromkeys(event_id for event_id in event_ids if event_id))
+        # Stay well under SQLite's bound-parameter limit.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            for row in conn.execute(
+                f"""
+                SELECT event_id, codec, dict_key, payload FROM chat_event_raw
+                WHERE event_id IN ({placeholders})
+                """,
+                chunk,
+            ):
+                try:
+                    text = self._decode(conn, row["codec"], row["dict_key"], bytes(row["payload"]))
+                except (zlib.error, UnicodeDecodeError) as exc:
+                    log.warning(f"Corrupt raw payload for {row['event_id']}: {exc}")
+                    continue
+                if text is not None:
+                    found[row["event_id"]] = text
+        return found
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "dictionaries": sorted(self._active),
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "ratio": round(self._bytes_in / self._bytes_out, 2) if self._bytes_out else None,
+            }
+
+
+__all__ = [
+    "RAW_MODES",
+    "RAW_MODE_COMPRESSED",
+    "RAW_MODE_INLINE",
+    "RawPayloadStore",
+]
@@ -10,12 +10,21 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from shared.logging.logger import get_logger
+from shared.storage.chat_events.archive import decode_segment
+from shared.storage.chat_events.replay_stream import (
+    MALFORMED,
+    NdjsonRecord,
+    iter_json_events,
+    iter_ndjson,
+)
+from shared.storage.sqlite_pool import get_connection_manager
 
 log = get_logger("shared.chat_events.reader")
 
@@ -68,16 +77,6 @@ def _platform_from_path(path: Path) -> Optional[str]:
     return None
 
 
-def _load_json_events(payload: object) -> List[dict]:
-    if isinstance(payload, list):
-        return [evt for evt in payload if isinstance(evt, dict)]
-    if isinstance(payload, dict):
-        events = payload.get("events")
-        if isinstance(events, list):
-            return [evt for evt in events if isinstance(evt, dict)]
-    return []
-
-
 def _iter_event_files(directories: Sequence[Path]) -> Iterable[Path]:
     for base in directories:
         if not base.exists():
@@ -90,167 +89,387 @@ def _iter_event_files(directories: Sequence[Path]) -> Iterable[Path]:
                 yield path
 
 
-def _load_events_from_file(path: Path) -> Tuple[List[_ReplayEvent], bool, int]:
-    overlay_safe = True
-    parsed_events: List[_ReplayEvent] = []
-    total_seen = 0
-    last_seen_ts: Optional[datetime] = None
-
-    try:
-        text = path.read_text(encoding="utf-8")
-    except Exception as exc:  # pragma: no cover - defensive
-        log.warning(f"Failed to read chat replay file {path}: {exc}")
-        return [], False, 0
-
-    candidates: List[dict] = []
-    if path.suffix == ".ndjson":
-        for line in text.splitlines():
-            if not line.strip():
-                continue
-            total_seen += 1
-            try:
-                loaded = json.loads(line)
-                if isinstance(loaded, dict):
-                    candidates.append(loaded)
-                else:
-                    overlay_safe = False
-            except json.JSONDecodeError:
-                overlay_safe = False
-                continue
-    else:
-        try:
-            loaded = json.loads(text)
-            extracted = _load_json_events(loaded)
-            total_seen = len(extracted)
-            candidates.extend(extracted)
-        except json.JSONDecodeError:
-            log.warning(f"Invalid JSON in replay file {path}")
-            return [], False, 0
-
-    platform_hint = _platform_from_path(path)
+class _FileState:
+    """Running replay aggregates for one JSON/NDJSON file."""
+
+    __slots__ = (
+        "mtime_ns",
+        "size",
+        "offset",
+        "pending",
+        "total_seen",
+        "event_count",
+        "platforms",
+        "overlay_safe",
+        "newest",
+        "last_seen_ts",
+    )
 
-    for candidate in candidates:
+    def __init__(self, mtime_ns: int = 0, size: int = 0) -> None:
+        self.mtime_ns = mtime_ns
+        self.size = size
+        # NDJSON: bytes consumed up to the last complete line, and the
+        # unterminated line after it (a write in progress).
+        self.offset = 0
+        self.pending: Optional[NdjsonRecord] = None
+        self.total_seen = 0
+        self.event_count = 0
+        self.platforms: Set[str] = set()
+        self.overlay_safe = True
+        self.newest: Optional[_ReplayEvent] = None
+        self.last_seen_ts: Optional[datetime] = None
+
+    def copy(self) -> "_FileState":
+        clone = _FileState(self.mtime_ns, self.size)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.platforms = set(self.platforms)
+        return clone
+
+    def add_candidate(self, candidate: dict, platform_hint: Optional[str]) -> None:
         ts_value = candidate.get("ts") or candidate.get("timestamp") or candidate.get("message_at") or candidate.get("received_at")
         ts = _parse_iso8601(ts_value) if ts_value else None
         if not ts:
-            overlay_safe = False
-            continue
+            self.overlay_safe = False
+            return
 
-        if last_seen_ts and ts < last_seen_ts:
-            overlay_safe = False
-        last_seen_ts = ts
+        if self.last_seen_ts and ts < self.last_seen_ts:
+            self.overlay_safe = False
+        self.last_seen_ts = ts
 
         platform = candidate.get("source_platform") or candidate.get("platform") or platform_hint
         platform_normalized = platform.lower() if isinstance(platform, str) else None
 
-        parsed_events.append(
-            _ReplayEvent(
-                platform=platform_normalized,
-                timestamp=ts,
-                iso=ts.isoformat().replace("+00:00", "Z"),
-            )
+        event = _ReplayEvent(
+            platform=platform_normalized,
+            timestamp=ts,
+            iso=ts.isoformat().replace("+00:00", "Z"),
         )
+        self.event_count += 1
+        if platform_normalized:
+            self.platforms.add(platform_normalized)
+        if self.newest is None or event.sort_key() > self.newest.sort_key():
+            self.newest = event
 
-    # Overlay is unsafe if any malformed events were dropped
-    if total_seen and len(parsed_events) != total_seen:
-        overlay_safe = False
+    def add_ndjson_record(self, record: NdjsonRecord, platform_hint: Optional[str]) -> None:
+        self.total_seen += 1
+        if record.value is MALFORMED or not isinstance(record.value, dict):
+            self.overlay_safe = False
+            return
+        self.add_candidate(record.value, platform_hint)
 
-    parsed_events.sort(key=lambda evt: evt.sort_key())
-    return parsed_events, overlay_safe, total_seen
 
+def _read_json_file(path: Path, state: _FileState) -> None:
+    """Fold a JSON document into ``state``, one event at a time."""
 
-def _load_events_from_sqlite() -> Tuple[List[_ReplayEvent], bool, int]:
-    if not CHAT_DB_PATH.exists():
-        return [], True, 0
-
-    overlay_safe = True
-    parsed_events: List[_ReplayEvent] = []
-    total_seen = 0
-    last_seen_ts: Optional[datetime] = None
+    platform_hint = _platform_from_path(path)
+    try:
+        for candidate, _ in iter_json_events(path):
+            if isinstance(candidate, dict):
+                state.total_seen += 1
+                state.add_candidate(candidate, platform_hint)
+    except (OSError, ValueError) as exc:
+        # An invalid document contributes nothing, as a whole.
+        log.warning(f"Invalid JSON in replay file {path}: {exc}")
+        state.total_seen = 0
+        state.event_count = 0
+        state.platforms.clear()
+        state.newest = None
+        state.overlay_safe = False
+
+
+def _read_ndjson_appended(path: Path, state: _FileState) -> None:
+    """Consume complete lines appended since ``state.offset``."""
 
-    conn = None
+    platform_hint = _platform_from_path(path)
+    state.pending = None
     try:
-        conn = sqlite3.connect(CHAT_DB_PATH)
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(
-            "SELECT source_platform, ts FROM chat_events ORDER BY ts, id"
+        for record in iter_ndjson(path, state.offset):
+            if not record.complete:
+                state.pending = record
+                break
+            state.add_ndjson_record(record, platform_hint)
+            state.offset = record.end
+    except OSError as exc:  # pragma: no cover - defensive
+        log.warning(f"Failed to read chat replay file {path}: {exc}")
+        state.overlay_safe = False
+
+
+@dataclass
+class _SqliteReplaySummary:
+    platforms: Set[str]
+    event_count: int
+    total_seen: int
+    last_event: Optional[_ReplayEvent]
+    overlay_safe: bool
+
+
+class ReplayMetadataTracker:
+    """
+    Incremental replay metadata.
+
+    Snapshot publishing asks for replay metadata on every tick, so instead
+    of rescanning all chat history the tracker keeps running aggregates and
+    only looks at what is new:
+
+    - SQLite: per-platform counts and the newest event, advanced past a
+      rowid watermark (``chat_events.id`` is AUTOINCREMENT, so new rows
+      always land above it). Archive segments are applied once each, by
+      segment id; rows they moved out of ``chat_events`` after being
+      counted are taken back out of the hot totals.
+    - Files: per-file ``(mtime, size, offset)``. NDJSON files are read from
+      the last consumed offset; JSON documents are re-parsed only when their
+      mtime or size changes. Truncated or rewritten files start over.
+
+    Rows deleted from ``chat_events`` other than by archive compaction are
+    not noticed until ``reset()``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._files: Dict[Path, _FileState] = {}
+        self._reset_sqlite(None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._files.clear()
+            self._reset_sqlite(None)
+
+    def _reset_sqlite(self, db_path: Optional[Path]) -> None:
+        self._db_path = db_path
+        self._row_watermark = 0
+        self._segment_watermark = 0
+        self._hot_seen: Dict[str, int] = {}
+        self._hot_valid: Dict[str, int] = {}
+        self._archive_count = 0
+        self._archive_platforms: Set[str] = set()
+        # (ts_ms, id, ts, platform) of the newest event seen so far
+        self._latest: Optional[Tuple[int, int, str, Optional[str]]] = None
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _note_latest(self, ts_ms: int, row_id: int, ts: str, platform: Optional[str]) -> None:
+        if self._latest is None or (ts_ms, row_id) > self._latest[:2]:
+            self._latest = (ts_ms, row_id, ts, platform)
+
+    def _apply_segments(self, conn: sqlite3.Connection) -> None:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_archive_segments'"
+        ).fetchone():
+            return
+        segments = conn.execute(
+            """
+            SELECT segment_id, platform_counts, event_count, last_ts, last_ts_ms,
+                   last_id, last_platform, codec, payload
+            FROM chat_archive_segments
+            WHERE segment_id > ?
+            ORDER BY segment_id
+            """,
+            (self._segment_watermark,),
         ).fetchall()
-    except Exception as exc:
-        log.warning(f"Failed to read chat events from sqlite: {exc}")
-        return [], False, 0
-    finally:
-        if conn:
+        for segment in segments:
+            self._archive_count += segment["event_count"]
             try:
-                conn.close()
-            except Exception:
+                self._archive_platforms.update(
+                    str(name).lower() for name in json.loads(segment["platform_counts"])
+                )
+            except (TypeError, ValueError):
                 pass
+            self._note_latest(
+                segment["last_ts_ms"],
+                segment["last_id"],
+                segment["last_ts"],
+                segment["last_platform"],
+            )
 
-    for row in rows:
-        total_seen += 1
-        ts_raw = row["ts"]
-        ts = _parse_iso8601(ts_raw)
-        if not ts:
-            overlay_safe = False
-            continue
+            if self._row_watermark:
+                rows = decode_segment(segment["codec"], segment["payload"]) or []
+                for row in rows:
+                    if row["id"] > self._row_watermark:
+                        continue
+                    platform = row["source_platform"]
+                    self._hot_seen[platform] = self._hot_seen.get(platform, 0) - 1
+                    if row["ts_ms"] is not None:
+                        self._hot_valid[platform] = self._hot_valid.get(platform, 0) - 1
+            self._segment_watermark = segment["segment_id"]
+
+    def _advance_rows(self, conn: sqlite3.Connection, high: int) -> None:
+        if high <= self._row_watermark:
+            return
+        for counts in conn.execute(
+            """
+            SELECT source_platform, COUNT(*) AS seen, COUNT(ts_ms) AS valid
+            FROM chat_events
+            WHERE id > ? AND id <= ?
+            GROUP BY source_platform
+            """,
+            (self._row_watermark, high),
+        ):
+            platform = counts["source_platform"]
+            self._hot_seen[platform] = self._hot_seen.get(platform, 0) + counts["seen"]
+            self._hot_valid[platform] = self._hot_valid.get(platform, 0) + counts["valid"]
+
+        latest = conn.execute(
+            """
+            SELECT source_platform, ts, ts_ms, id FROM chat_events
+            WHERE id > ? AND id <= ? AND ts_ms IS NOT NULL
+            ORDER BY ts_ms DESC, id DESC
+            LIMIT 1
+            """,
+            (self._row_watermark, high),
+        ).fetchone()
+        if latest is not None:
+            self._note_latest(latest["ts_ms"], latest["id"], latest["ts"], latest["source_platform"])
+        self._row_watermark = high
+
+    def _refresh_sqlite(self) -> Optional[_SqliteReplaySummary]:
+        db_path = CHAT_DB_PATH
+        if not db_path.exists():
+            self._reset_sqlite(None)
+            return None
+        if db_path != self._db_path:
+            self._reset_sqlite(db_path)
 
-        if last_seen_ts and ts < last_seen_ts:
-            overlay_safe = False
-        last_seen_ts = ts
+        try:
+            with get_connection_manager(db_path).reader() as conn:
+                # One snapshot, so a concurrent compaction is seen either
+                # entirely or not at all.
+                conn.execute("BEGIN")
+                row = conn.execute(
+                    "SELECT seq FROM sqlite_sequence WHERE name = 'chat_events'"
+                ).fetchone()
+                high = int(row["seq"]) if row is not None else 0
+                if high < self._row_watermark:
+                    log.info("chat_events rowids went backwards; rebuilding replay metadata")
+                    self._reset_sqlite(db_path)
+                self._apply_segments(conn)
+                self._advance_rows(conn, high)
+        except Exception as exc:
+            log.warning(f"Failed to read chat events from sqlite: {exc}")
+            # Partially applied state cannot be trusted; start over next time.
+            self._reset_sqlite(None)
+            return None
+
+        hot_seen = sum(self._hot_seen.values())
+        hot_valid = sum(self._hot_valid.values())
+        platforms = {
+            platform.lower()
+            for platform, valid in self._hot_valid.items()
+            if valid > 0 and isinstance(platform, str)
+        }
+        platforms.update(self._archive_platforms)
+
+        last_event: Optional[_ReplayEvent] = None
+        if self._latest is not None:
+            _, _, ts_value, platform = self._latest
+            ts = _parse_iso8601(ts_value)
+            if ts is not None:
+                last_event = _ReplayEvent(
+                    platform=platform.lower() if isinstance(platform, str) else None,
+                    timestamp=ts,
+                    iso=ts.isoformat().replace("+00:00", "Z"),
+                )
+
+        return _SqliteReplaySummary(
+            platforms=platforms,
+            event_count=hot_valid + self._archive_count,
+            total_seen=hot_seen + self._archive_count,
+            last_event=last_event,
+            overlay_safe=hot_valid == hot_seen,
+        )
 
-        platform = row["source_platform"]
-        platform_normalized = platform.lower() if isinstance(platform, str) else None
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
 
-        parsed_events.append(
-            _ReplayEvent(
-                platform=platform_normalized,
-                timestamp=ts,
-                iso=ts.isoformat().replace("+00:00", "Z"),
-            )
+    def _refresh_files(self) -> List[_FileState]:
+        current: Dict[Path, _FileState] = {}
+        results: List[_FileState] = []
+        for path in _iter_event_files([CHAT_LOG_ROOT, CHAT_EVENT_STORAGE_ROOT]):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            state = self._files.get(path)
+            changed = state is None or (stat.st_mtime_ns, stat.st_size) != (state.mtime_ns, state.size)
+
+            if path.suffix == ".ndjson":
+                if state is None or stat.st_size < state.offset or (
+                    changed and stat.st_size == state.size
+                ):
+                    # New, truncated, or rewritten in place.
+                    state = _FileState()
+                if changed or not state.mtime_ns:
+                    state.mtime_ns, state.size = stat.st_mtime_ns, stat.st_size
+                    _read_ndjson_appended(path, state)
+                effective = state
+                if state.pending is not None:
+                    effective = state.copy()
+                    effective.add_ndjson_record(state.pending, _platform_from_path(path))
+            else:
+                if changed:
+                    state = _FileState(stat.st_mtime_ns, stat.st_size)
+                    _read_json_file(path, state)
+                effective = state
+
+            current[path] = state
+            results.append(effective)
+
+        self._files = current
+        return results
+
+    def refresh(self) -> ReplayMetadata:
+        with self._lock:
+            sqlite_summary = self._refresh_sqlite()
+            file_states = self._refresh_files()
+
+        overlay_safe = True
+        platforms: Set[str] = set()
+        event_count = 0
+        last_event: Optional[_ReplayEvent] = None
+
+        if sqlite_summary is not None and sqlite_summary.event_count:
+            overlay_safe = overlay_safe and sqlite_summary.overlay_safe
+            platforms.update(sqlite_summary.platforms)
+            event_count += sqlite_summary.event_count
+            last_event = sqlite_summary.last_event
+
+        newest_file_event: Optional[_ReplayEvent] = None
+        for state in file_states:
+            overlay_safe = overlay_safe and state.overlay_safe
+            platforms.update(state.platforms)
+            event_count += state.event_count
+            if state.newest is not None and (
+                newest_file_event is None or state.newest.sort_key() > newest_file_event.sort_key()
+            ):
+                newest_file_event = state.newest
+
+        if newest_file_event is not None:
+            if last_event is None or newest_file_event.sort_key() >= last_event.sort_key():
+                last_event = newest_file_event
+
+        available = event_count > 0
+        return ReplayMetadata(
+            available=available,
+            platforms=sorted(platforms),
+            event_count=event_count,
+            last_event_timestamp=last_event.iso if last_event else None,
+            overlay_safe=overlay_safe and available,
         )
 
-    if total_seen and len(parsed_events) != total_seen:
-        overlay_safe = False
 
-    return parsed_events, overlay_safe, total_seen
+_TRACKER = ReplayMetadataTracker()
 
 
 def build_replay_metadata() -> ReplayMetadata:
-    overlay_safe = True
-    events: List[_ReplayEvent] = []
-    total_seen = 0
-
-    sqlite_events, sqlite_safe, sqlite_total = _load_events_from_sqlite()
-    if sqlite_events:
-        events.extend(sqlite_events)
-        overlay_safe = overlay_safe and sqlite_safe
-        total_seen += sqlite_total
-
-    for path in _iter_event_files([CHAT_LOG_ROOT, CHAT_EVENT_STORAGE_ROOT]):
-        parsed, file_safe, file_seen = _load_events_from_file(path)
-        overlay_safe = overlay_safe and file_safe
-        events.extend(parsed)
-        total_seen += file_seen
-
-    events.sort(key=lambda evt: evt.sort_key())
-
-    platforms = sorted({evt.platform for evt in events if evt.platform})
-    event_count = len(events)
-    last_timestamp = events[-1].iso if events else None
-
-    available = event_count > 0
-    overlay_safe = overlay_safe and available
-
-    return ReplayMetadata(
-        available=available,
-        platforms=platforms,
-        event_count=event_count,
-        last_event_timestamp=last_timestamp,
-        overlay_safe=overlay_safe,
-    )
+    return _TRACKER.refresh()
 
 
 __all__ = [
     "ReplayMetadata",
+    "ReplayMetadataTracker",
     "build_replay_metadata",
     "CHAT_LOG_ROOT",
     "CHAT_EVENT_STORAGE_ROOT",
@@ -0,0 +1,214 @@
+"""Streaming parsers for chat replay logs.
+
+Exported chat logs can be large, and replay metadata is built while
+snapshots are being published. These readers never hold a whole file:
+
+- ``iter_ndjson`` walks an NDJSON file line by line from a buffered binary
+  handle, starting at any byte offset
+- ``iter_json_events`` yields the elements of a top-level JSON array, or of
+  the ``"events"`` array of an ``{"events": [...]}`` document, one at a time
+  using ``json.JSONDecoder.raw_decode`` over a sliding text window
+
+Memory is bounded by the largest single record plus one read chunk. Both
+report the byte offset just past each record so callers can resume.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# A single JSON value larger than this is treated as a corrupt document
+# rather than buffered without limit.
+MAX_VALUE_BYTES = 16 * 1024 * 1024
+
+# Stands in for the value of an NDJSON line that is not valid JSON.
+MALFORMED = object()
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+@dataclass(frozen=True)
+class NdjsonRecord:
+    value: Any
+    start: int
+    end: int
+    # False for a trailing line without a newline (a write in progress).
+    complete: bool
+
+
+def iter_ndjson(path: Path, offset: int = 0) -> Iterator[NdjsonRecord]:
+    """Yield every non-blank line from ``offset`` on, parsed or ``MALFORMED``."""
+
+    with Path(path).open("rb") as handle:
+        handle.seek(offset)
+        position = offset
+        for line in handle:
+            start = position
+            position += len(line)
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError:
+                value = MALFORMED
+            yield NdjsonRecord(value, start, position, line.endswith(b"\n"))
+
+
+class _JsonWindow:
+    """Sliding decoded-text window over a binary handle, with byte offsets."""
+
+    def __init__(self, handle: BinaryIO, chunk_size: int) -> None:
+        self._handle = handle
+        self._chunk_size = max(1, int(chunk_size))
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        # Bytes consumed before ``buf[self._counted]``.
+        self._counted = 0
+        self._counted_bytes = 0
+        # Pure-ASCII windows (the json.dumps default) count bytes by length.
+        self._ascii = True
+
+    def offset(self) -> int:
+        """Byte offset of ``pos`` in the file."""
+
+        if self._ascii:
+            self._counted_bytes += self.pos - self._counted
+        else:
+            self._counted_bytes += len(self.buf[self._counted : self.pos].encode("utf-8"))
+        self._counted = self.pos
+        return self._counted_bytes
+
+    def _fill(self, size: int) -> None:
+        # Drop consumed text before growing the window.
+        if self.pos:
+            self.offset()
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+            self._counted = 0
+        data = self._handle.read(size)
+        if data:
+            self.buf += self._utf8.decode(data)
+            self._ascii = self.buf.isascii()
+        else:
+            self.buf += self._utf8.decode(b"", final=True)
+            self.eof = True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of input."""
+
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos] if self.pos < len(self.buf) else ""
+            self._fill(self._chunk_size)
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at byte {self.offset()}")
+        self.pos += 1
+
+    def _number_may_continue(self, end: int) -> bool:
+        if self.buf[self.pos] not in _NUMBER_START:
+            return False
+        for index in range(end, len(self.buf)):
+            if self.buf[index] not in _NUMBER_CHARS:
+                return False
+        return True
+
+    def value(self) -> Any:
+        """Decode the JSON value at ``pos``, reading more input as needed."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number cut by the end of the window ("3.25e" of
+                # "3.25e-07") may continue in the next chunk.
+                if self.eof or not self._number_may_continue(end):
+                    self.pos = end
+                    return value
+            pending = len(self.buf) - self.pos
+            if pending > MAX_VALUE_BYTES:
+                raise ValueError(f"JSON value at byte {self.offset()} exceeds {MAX_VALUE_BYTES} bytes")
+            # Grow geometrically so re-parsing a large value stays linear.
+            self._fill(max(self._chunk_size, pending))
+
+    def array(self) -> Iterator[Tuple[Any, int]]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            item = self.value()
+            yield item, self.offset()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at byte {self.offset()}")
+
+    def finish(self) -> None:
+        if self.peek() != "":
+            raise ValueError(f"Extra data at byte {self.offset()}")
+
+
+def iter_json_events(path: Path, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Any, int]]:
+    """
+    Yield ``(element, end_offset)`` for each element of the document's event
+    array. Raises ``ValueError`` (possibly after yielding earlier elements)
+    if the document is not valid JSON.
+    """
+
+    with Path(path).open("rb") as handle:
+        window = _JsonWindow(handle, chunk_size)
+        first = window.peek()
+        if first == "[":
+            yield from window.array()
+        elif first == "{":
+            window.pos += 1
+            if window.peek() == "}":
+                window.pos += 1
+            else:
+                while True:
+                    key = window.value()
+                    if not isinstance(key, str):
+                        raise ValueError(f"Expected an object key at byte {window.offset()}")
+                    window.expect(":")
+                    if key == "events" and window.peek() == "[":
+                        yield from window.array()
+                    else:
+                        window.value()
+                    char = window.peek()
+                    window.pos += 1
+                    if char == "}":
+                        break
+                    if char != ",":
+                        raise ValueError(f"Expected ',' or '}}' at byte {window.offset()}")
+        else:
+            # Scalars are valid JSON documents that simply carry no events.
+            window.value()
+        window.finish()
+
+
+__all__ = [
+    "MALFORMED",
+    "NdjsonRecord",
+    "iter_json_events",
+    "iter_ndjson",
+]
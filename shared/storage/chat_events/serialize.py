@@ -0,0 +1,106 @@
+"""Direct row-to-wire serialization for stored chat events.
+
+Rows in ``chat_events`` (and archived segment records, which carry the same
+columns) were validated and normalized by ``create_chat_event`` when they
+were written. Reads therefore skip rebuilding a ``ChatEvent`` and build the
+wire shape of ``ChatEvent.to_dict()`` straight from the columns.
+
+``row_to_wire_bytes`` goes one step further for API responses: the
+``*_json`` columns already hold JSON text written by this store, so they are
+spliced into the output verbatim instead of being decoded and re-encoded.
+The exception is ``flags_json``: both functions decode it and coerce each
+flag to bool, so the two paths give the same event for any stored value.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import product
+from typing import Any, Dict, Optional, Tuple
+
+_FLAG_NAMES = ("is_synthetic", "is_system", "is_highlighted")
+# Canonical JSON for every combination of flag values.
+_FLAGS_JSON = {
+    values: json.dumps(dict(zip(_FLAG_NAMES, values)), separators=(",", ":"))
+    for values in product((False, True), repeat=len(_FLAG_NAMES))
+}
+
+
+def _flags(row: Any) -> Tuple[bool, ...]:
+    flags_json = row["flags_json"]
+    flags = json.loads(flags_json) if flags_json else None
+    if not isinstance(flags, dict):
+        flags = {}
+    return tuple(bool(flags.get(name)) for name in _FLAG_NAMES)
+
+
+def row_to_wire(row: Any, raw_json: Optional[str] = None) -> Dict[str, Any]:
+    """Wire dict for one stored row; ``raw`` is included only if given."""
+
+    payload: Dict[str, Any] = {
+        "event_id": row["event_id"],
+        "ts": row["ts"],
+        "stream_id": row["stream_id"],
+        "source_platform": row["source_platform"],
+        "author": {
+            "author_id": row["author_id"] or "",
+            "display_name": row["display_name"] or "",
+            "avatar_url": row["avatar_url"],
+            "badges": json.loads(row["badges_json"]) if row["badges_json"] else [],
+            "roles": json.loads(row["roles_json"]) if row["roles_json"] else [],
+        },
+        "content": {
+            "type": row["content_type"] or "message",
+            "text": row["content_text"] or "",
+        },
+        "flags": dict(zip(_FLAG_NAMES, _flags(row))),
+    }
+    if raw_json:
+        payload["raw"] = json.loads(raw_json)
+    return payload
+
+
+def row_to_wire_bytes(row: Any, raw_json: Optional[str] = None) -> bytes:
+    """Same event as ``row_to_wire``, pre-encoded as UTF-8 JSON."""
+
+    dumps = json.dumps
+    parts = [
+        '{"event_id":',
+        dumps(row["event_id"]),
+        ',"ts":',
+        dumps(row["ts"]),
+        ',"stream_id":',
+        dumps(row["stream_id"]),
+        ',"source_platform":',
+        dumps(row["source_platform"]),
+        ',"author":{"author_id":',
+        dumps(row["author_id"] or ""),
+        ',"display_name":',
+        dumps(row["display_name"] or ""),
+        ',"avatar_url":',
+        dumps(row["avatar_url"]),
+        ',"badges":',
+        row["badges_json"] or "[]",
+        ',"roles":',
+        row["roles_json"] or "[]",
+        '},"content":{"type":',
+        dumps(row["content_type"] or "message"),
+        ',"text":',
+        dumps(row["content_text"] or ""),
+        '},"flags":',
+        _FLAGS_JSON[_flags(row)],
+    ]
+    if raw_json:
+        parts.append(',"raw":')
+        parts.append(raw_json)
+    parts.append("}")
+    return "".join(parts).encode("utf-8")
+
+
+def join_json_array(items: Any) -> bytes:
+    """Concatenate pre-encoded JSON values into one JSON array."""
+
+    return b"[" + b",".join(items) + b"]"
+
+
+__all__ = ["join_json_array", "row_to_wire", "row_to_wire_bytes"]
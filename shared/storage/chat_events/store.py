@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
 import threading
@@ -9,9 +10,36 @@ import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from shared.chat.events import ChatEvent, create_chat_event
+from shared.chat.events import ChatEvent, iso_to_epoch_ms
 from shared.logging.logger import get_logger
 from shared.runtime import chat_context
+from shared.storage.chat_events.archive import DEFAULT_SEGMENT_MAX_EVENTS, ChatArchive, row_key
+from shared.storage.chat_events.batch_writer import ChatEventBatchWriter
+from shared.storage.chat_events.cursor import (
+    DIRECTION_BACKWARD,
+    DIRECTION_FORWARD,
+    ChatCursor,
+    decode_cursor,
+    encode_jsonl_cursor,
+    encode_search_cursor,
+    encode_sqlite_cursor,
+)
+from shared.storage.chat_events.dedup import DEFAULT_DEDUP_CAPACITY, RecentEventIds
+from shared.storage.chat_events.raw_store import (
+    RAW_MODE_COMPRESSED,
+    RAW_MODE_INLINE,
+    RAW_MODES,
+    RawPayloadStore,
+)
+from shared.storage.chat_events.jsonl_index import (
+    JsonlOffsetIndex,
+    read_lines_before,
+    read_lines_from,
+    read_tail_lines,
+)
+from shared.storage.chat_events.serialize import row_to_wire, row_to_wire_bytes
+from shared.storage.chat_events.stream_index import StreamIndex
+from shared.storage.sqlite_pool import SQLiteConnectionManager, get_connection_manager
 
 log = get_logger("shared.chat_events.store")
 
@@ -19,6 +47,10 @@ DEFAULT_DB_PATH = Path("data/streamsuites.db")
 DEFAULT_JSONL_ROOT = Path("shared/storage/chat_events/streams")
 DEFAULT_INDEX_PATH = Path("shared/storage/chat_events/streams_index.json")
 
+# Rows per transaction when backfilling ts_ms on databases created before the
+# column existed. Small chunks keep the WAL short and let live writes interleave.
+TS_MS_BACKFILL_CHUNK = 5000
+
 
 class ChatEventStore:
     def __init__(
@@ -26,33 +58,79 @@ class ChatEventStore:
         db_path: Path | str = DEFAULT_DB_PATH,
         jsonl_root: Path | str = DEFAULT_JSONL_ROOT,
         index_path: Path | str = DEFAULT_INDEX_PATH,
+        *,
+        batch_writes: bool = False,
+        batch_max_events: int = 200,
+        batch_max_delay_ms: int = 250,
+        batch_queue_size: int = 10000,
+        stream_index_flush_seconds: float = 5.0,
+        dedup_capacity: int = DEFAULT_DEDUP_CAPACITY,
+        archive_enabled: bool = False,
+        archive_hot_retention_days: int = 7,
+        archive_segment_max_events: int = DEFAULT_SEGMENT_MAX_EVENTS,
+        raw_payloads: str = RAW_MODE_INLINE,
     ) -> None:
         self._db_path = Path(db_path)
         self._jsonl_root = Path(jsonl_root)
         self._index_path = Path(index_path)
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
         self._use_sqlite = self._db_path.exists()
-        self._recent_ids: List[str] = []
-        self._recent_limit = 500
+        self._db: SQLiteConnectionManager = get_connection_manager(self._db_path)
+        self._recent_ids = RecentEventIds(dedup_capacity)
+        self._jsonl_indexes: Dict[Path, JsonlOffsetIndex] = {}
+        self._fts_available = False
+        self._archive_hot_retention_days = max(0, int(archive_hot_retention_days))
+        self._archive: Optional[ChatArchive] = None
+        self._raw_mode = raw_payloads if raw_payloads in RAW_MODES else RAW_MODE_INLINE
+        self._raw_store: Optional[RawPayloadStore] = None
 
         if self._use_sqlite:
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
             self._init_schema()
+            # The side table is always readable, whichever mode writes.
+            self._raw_store = RawPayloadStore(self._db)
+            self._raw_store.init_schema()
+            if archive_enabled:
+                self._archive = ChatArchive(
+                    self._db,
+                    segment_max_events=archive_segment_max_events,
+                    raw_loader=self._raw_store.load,
+                )
+                self._archive.init_schema()
         else:
+            if archive_enabled:
+                log.warning("Chat archive compaction requires the SQLite backend; disabled")
             self._jsonl_root.mkdir(parents=True, exist_ok=True)
             self._index_path.parent.mkdir(parents=True, exist_ok=True)
 
+        self._streams = StreamIndex()
+        self._load_stream_index()
+        self._stream_flush_interval = max(0.5, float(stream_index_flush_seconds))
+        self._stream_flush_stop = threading.Event()
+        threading.Thread(
+            target=self._stream_flush_loop,
+            name="chat-stream-index",
+            daemon=True,
+        ).start()
+
+        # Opt-in group commit: events are queued and flushed by a writer
+        # thread instead of being committed one-by-one on the caller's loop.
+        self._batch_writer: Optional[ChatEventBatchWriter] = None
+        if batch_writes:
+            self._batch_writer = ChatEventBatchWriter(
+                self._flush_batch,
+                max_batch=batch_max_events,
+                max_delay_ms=batch_max_delay_ms,
+                max_queue=batch_queue_size,
+                on_drop=self._on_batch_drop,
+            )
+
     # ------------------------------------------------------------------
     # SQLite setup
     # ------------------------------------------------------------------
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _init_schema(self) -> None:
-        with self._connect() as conn:
+        with self._db.writer() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS chat_events (
@@ -69,10 +147,14 @@ class ChatEventStore:
                     content_type TEXT,
                     content_text TEXT,
                     flags_json TEXT,
-                    raw_json TEXT
+                    raw_json TEXT,
+                    ts_ms INTEGER
                 )
                 """
             )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(chat_events)")}
+            if "ts_ms" not in columns:
+                conn.execute("ALTER TABLE chat_events ADD COLUMN ts_ms INTEGER")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS chat_streams (
@@ -86,18 +168,140 @@ class ChatEventStore:
                 )
                 """
             )
+            # Time ordering uses integer epoch milliseconds. The per-stream
+            # index drives tail/range; the global one covers the replay
+            # metadata aggregates (platform, count, latest) without touching
+            # table pages. The old TEXT ts indexes are no longer used.
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_chat_events_stream_ts
-                ON chat_events(stream_id, ts, id)
+                CREATE INDEX IF NOT EXISTS idx_chat_events_stream_ts_ms
+                ON chat_events(stream_id, ts_ms, id)
                 """
             )
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_chat_events_ts
-                ON chat_events(ts, id)
+                CREATE INDEX IF NOT EXISTS idx_chat_events_ts_ms
+                ON chat_events(ts_ms, id, source_platform)
                 """
             )
+            conn.execute("DROP INDEX IF EXISTS idx_chat_events_stream_ts")
+            conn.execute("DROP INDEX IF EXISTS idx_chat_events_ts")
+
+        self._backfill_ts_ms()
+        self._fts_available = self._init_search_schema()
+
+    def _backfill_ts_ms(self) -> None:
+        """
+        Populate ts_ms for rows written before the column existed.
+
+        Runs in small transactions keyed on id so it can resume after an
+        interruption. Rows whose ts cannot be parsed keep a NULL ts_ms and are
+        reported as overlay-unsafe by the replay metadata builder.
+        """
+
+        last_id = 0
+        updated = 0
+        while True:
+            with self._db.writer() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, ts FROM chat_events
+                    WHERE ts_ms IS NULL AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                    """,
+                    (last_id, TS_MS_BACKFILL_CHUNK),
+                ).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                updates = [
+                    (ts_ms, row["id"])
+                    for row in rows
+                    if (ts_ms := iso_to_epoch_ms(row["ts"])) is not None
+                ]
+                conn.executemany("UPDATE chat_events SET ts_ms = ? WHERE id = ?", updates)
+                updated += len(updates)
+        if updated:
+            log.info(f"Backfilled ts_ms for {updated} chat event(s)")
+
+    def _init_search_schema(self) -> bool:
+        """
+        Create the FTS5 search index over chat text and display names.
+
+        ``chat_events_fts`` is an external-content table: it stores only the
+        inverted index and reads text back from ``chat_events``. Triggers keep
+        it in sync inside the writer's own transaction. Returns False (search
+        disabled) when this SQLite build lacks FTS5.
+        """
+
+        try:
+            with self._db.writer() as conn:
+                existed = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_events_fts'"
+                ).fetchone()
+                conn.execute(
+                    """
+                    CREATE VIRTUAL TABLE IF NOT EXISTS chat_events_fts USING fts5(
+                        content_text,
+                        display_name,
+                        content = 'chat_events',
+                        content_rowid = 'id',
+                        tokenize = 'unicode61 remove_diacritics 2'
+                    )
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS chat_events_fts_ai
+                    AFTER INSERT ON chat_events BEGIN
+                        INSERT INTO chat_events_fts(rowid, content_text, display_name)
+                        VALUES (new.id, new.content_text, new.display_name);
+                    END
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS chat_events_fts_ad
+                    AFTER DELETE ON chat_events BEGIN
+                        INSERT INTO chat_events_fts(chat_events_fts, rowid, content_text, display_name)
+                        VALUES ('delete', old.id, old.content_text, old.display_name);
+                    END
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS chat_events_fts_au
+                    AFTER UPDATE OF content_text, display_name ON chat_events BEGIN
+                        INSERT INTO chat_events_fts(chat_events_fts, rowid, content_text, display_name)
+                        VALUES ('delete', old.id, old.content_text, old.display_name);
+                        INSERT INTO chat_events_fts(rowid, content_text, display_name)
+                        VALUES (new.id, new.content_text, new.display_name);
+                    END
+                    """
+                )
+                has_history = conn.execute("SELECT 1 FROM chat_events LIMIT 1").fetchone()
+        except sqlite3.OperationalError as exc:
+            log.warning(f"Chat search disabled (SQLite FTS5 unavailable): {exc}")
+            return False
+
+        if not existed and has_history:
+            log.warning(
+                "Chat search index created empty for existing chat history; "
+                "run `python scripts/rebuild_chat_fts.py` to backfill it"
+            )
+        return True
+
+    def rebuild_search_index(self) -> int:
+        """Rebuild the FTS index from chat_events. Returns the indexed row count."""
+
+        if not self.search_available():
+            return 0
+        with self._db.writer() as conn:
+            conn.execute("INSERT INTO chat_events_fts(chat_events_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO chat_events_fts(chat_events_fts) VALUES ('optimize')")
+            row = conn.execute("SELECT COUNT(*) FROM chat_events").fetchone()
+        return int(row[0]) if row else 0
 
     # ------------------------------------------------------------------
     # JSONL helpers
@@ -107,6 +311,33 @@ class ChatEventStore:
         safe = stream_id.replace("/", "_").replace("\\", "_")
         return self._jsonl_root / f"{safe}.jsonl"
 
+    def _jsonl_index(self, path: Path) -> JsonlOffsetIndex:
+        with self._lock:
+            index = self._jsonl_indexes.get(path)
+            if index is None:
+                index = JsonlOffsetIndex(path)
+                self._jsonl_indexes[path] = index
+            return index
+
+    @staticmethod
+    def _decode_lines(lines: List[bytes], include_raw: bool = False) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        for line in lines:
+            try:
+                payload = json.loads(line)
+            except ValueError:
+                # Torn or hand-edited line; skip rather than fail the read.
+                continue
+            if isinstance(payload, dict):
+                if not include_raw:
+                    payload.pop("raw", None)
+                events.append(payload)
+        return events
+
+    @staticmethod
+    def _encode_events(events: List[Dict[str, Any]]) -> List[bytes]:
+        return [json.dumps(event).encode("utf-8") for event in events]
+
     def _load_index(self) -> Dict[str, Any]:
         if not self._index_path.exists():
             return {"streams": {}}
@@ -127,310 +358,729 @@ class ChatEventStore:
             log.warning(f"Failed to save stream index: {exc}")
 
     # ------------------------------------------------------------------
-    # Stream index
+    # Stream index (in-memory, write-behind)
     # ------------------------------------------------------------------
 
-    def _upsert_stream_index(
+    def _load_stream_index(self) -> None:
+        if self._use_sqlite:
+            with self._db.reader() as conn:
+                rows = conn.execute("SELECT * FROM chat_streams").fetchall()
+            entries = []
+            for row in rows:
+                entry = dict(row)
+                try:
+                    entry["platforms_active"] = json.loads(entry.get("platforms_active") or "[]")
+                except (TypeError, ValueError):
+                    entry["platforms_active"] = []
+                entries.append(entry)
+            self._streams.load(entries)
+            return
+
+        self._streams.load(self._load_index().get("streams", {}).values())
+
+    def _persist_streams_sqlite(
         self,
-        *,
-        stream_id: str,
-        platform: str,
-        ts: str,
-        title: Optional[str] = None,
+        conn: sqlite3.Connection,
+        entries: List[Dict[str, Any]],
     ) -> None:
-        if self._use_sqlite:
-            with self._connect() as conn:
-                row = conn.execute(
-                    "SELECT platforms_active, started_at FROM chat_streams WHERE stream_id = ?",
-                    (stream_id,),
-                ).fetchone()
-                if row:
-                    platforms = json.loads(row["platforms_active"]) if row["platforms_active"] else []
-                    if platform and platform not in platforms:
-                        platforms.append(platform)
-                    conn.execute(
-                        """
-                        UPDATE chat_streams
-                        SET title = COALESCE(?, title),
-                            platforms_active = ?,
-                            chat_available = 1,
-                            last_updated_at = ?
-                        WHERE stream_id = ?
-                        """,
-                        (
-                            title,
-                            json.dumps(platforms),
-                            ts,
-                            stream_id,
-                        ),
-                    )
+        if not entries:
+            return
+        conn.executemany(
+            """
+            INSERT INTO chat_streams (
+                stream_id, title, started_at, ended_at,
+                platforms_active, chat_available, last_updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(stream_id) DO UPDATE SET
+                title = excluded.title,
+                ended_at = excluded.ended_at,
+                platforms_active = excluded.platforms_active,
+                chat_available = excluded.chat_available,
+                last_updated_at = excluded.last_updated_at
+            """,
+            [
+                (
+                    entry["stream_id"],
+                    entry.get("title"),
+                    entry.get("started_at"),
+                    entry.get("ended_at"),
+                    json.dumps(entry.get("platforms_active") or []),
+                    1 if entry.get("chat_available") else 0,
+                    entry.get("last_updated_at"),
+                )
+                for entry in entries
+            ],
+        )
+
+    def _flush_streams(self, *, structural_only: bool = False) -> None:
+        """Persist index entries changed since the last flush."""
+
+        with self._lock:
+            entries = self._streams.drain(structural_only=structural_only)
+            if not entries:
+                return
+            try:
+                if self._use_sqlite:
+                    with self._db.writer() as conn:
+                        self._persist_streams_sqlite(conn, entries)
                 else:
-                    conn.execute(
-                        """
-                        INSERT INTO chat_streams (
-                            stream_id, title, started_at, ended_at,
-                            platforms_active, chat_available, last_updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            stream_id,
-                            title,
-                            ts,
-                            None,
-                            json.dumps([platform] if platform else []),
-                            1,
-                            ts,
-                        ),
+                    self._save_index(
+                        {"streams": {e["stream_id"]: e for e in self._streams.snapshot()}}
                     )
-            return
+            except Exception as exc:
+                self._streams.requeue(entries)
+                log.warning(f"Failed to persist stream index: {exc}")
 
-        payload = self._load_index()
-        streams = payload.setdefault("streams", {})
-        entry = streams.get(stream_id) or {
-            "stream_id": stream_id,
-            "title": title,
-            "started_at": ts,
-            "ended_at": None,
-            "platforms_active": [],
-            "chat_available": True,
-            "last_updated_at": ts,
-        }
-        if title and not entry.get("title"):
-            entry["title"] = title
-        platforms = entry.get("platforms_active", [])
-        if platform and platform not in platforms:
-            platforms.append(platform)
-        entry["platforms_active"] = platforms
-        entry["chat_available"] = True
-        entry["last_updated_at"] = ts
-        streams[stream_id] = entry
-        self._save_index(payload)
+    def _stream_flush_loop(self) -> None:
+        while not self._stream_flush_stop.wait(self._stream_flush_interval):
+            self._flush_streams()
 
     def mark_stream_ended(self, stream_id: str, ts: str) -> None:
         if not stream_id:
             return
-        if self._use_sqlite:
-            with self._connect() as conn:
-                conn.execute(
-                    "UPDATE chat_streams SET ended_at = ? WHERE stream_id = ?",
-                    (ts, stream_id),
-                )
-            return
-        payload = self._load_index()
-        streams = payload.setdefault("streams", {})
-        entry = streams.get(stream_id)
-        if not entry:
-            return
-        entry["ended_at"] = ts
-        streams[stream_id] = entry
-        self._save_index(payload)
+        if self._streams.mark_ended(stream_id, ts) and not self._batch_writer:
+            self._flush_streams(structural_only=True)
 
     # ------------------------------------------------------------------
     # Event persistence
     # ------------------------------------------------------------------
 
-    def append_event(self, event: ChatEvent, title: Optional[str] = None) -> bool:
-        if event.event_id in self._recent_ids:
-            return False
-        with self._lock:
-            self._recent_ids.append(event.event_id)
-            if len(self._recent_ids) > self._recent_limit:
-                self._recent_ids = self._recent_ids[-self._recent_limit :]
+    def _event_row(self, event: ChatEvent) -> Tuple[Any, ...]:
+        inline_raw = event.raw is not None and (
+            self._raw_mode == RAW_MODE_INLINE or self._raw_store is None
+        )
+        return (
+            event.event_id,
+            event.ts,
+            event.stream_id,
+            event.source_platform,
+            event.author.author_id,
+            event.author.display_name,
+            event.author.avatar_url,
+            json.dumps(event.author.badges),
+            json.dumps(event.author.roles),
+            event.content.type,
+            event.content.text,
+            json.dumps(event.flags.to_dict()),
+            json.dumps(event.raw) if inline_raw else None,
+            iso_to_epoch_ms(event.ts),
+        )
 
-            if self._use_sqlite:
-                try:
-                    with self._connect() as conn:
-                        conn.execute(
-                            """
-                            INSERT INTO chat_events (
-                                event_id, ts, stream_id, source_platform,
-                                author_id, display_name, avatar_url,
-                                badges_json, roles_json, content_type,
-                                content_text, flags_json, raw_json
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                event.event_id,
-                                event.ts,
-                                event.stream_id,
-                                event.source_platform,
-                                event.author.author_id,
-                                event.author.display_name,
-                                event.author.avatar_url,
-                                json.dumps(event.author.badges),
-                                json.dumps(event.author.roles),
-                                event.content.type,
-                                event.content.text,
-                                json.dumps(event.flags.__dict__),
-                                json.dumps(event.raw) if event.raw is not None else None,
-                            ),
+    def _write_events(self, events: List[ChatEvent]) -> int:
+        """
+        Persist events in one transaction, together with any structural
+        stream index changes (new stream, platform, title, ended marker).
+        """
+
+        if not events:
+            return 0
+
+        if self._use_sqlite:
+            structural = self._streams.drain(structural_only=True)
+            try:
+                with self._db.writer() as conn:
+                    cursor = conn.executemany(
+                        """
+                        INSERT OR IGNORE INTO chat_events (
+                            event_id, ts, stream_id, source_platform,
+                            author_id, display_name, avatar_url,
+                            badges_json, roles_json, content_type,
+                            content_text, flags_json, raw_json, ts_ms
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        [self._event_row(event) for event in events],
+                    )
+                    if self._raw_mode == RAW_MODE_COMPRESSED and self._raw_store is not None:
+                        self._raw_store.insert(
+                            conn,
+                            [
+                                (event.event_id, event.source_platform, json.dumps(event.raw))
+                                for event in events
+                                if event.raw is not None
+                            ],
                         )
-                except sqlite3.IntegrityError:
-                    return False
-            else:
-                path = self._jsonl_path(event.stream_id)
-                line = json.dumps(event.to_dict())
+                    self._persist_streams_sqlite(conn, structural)
+            except Exception:
+                self._streams.requeue(structural)
+                raise
+            return cursor.rowcount
+
+        lines: Dict[Path, List[Tuple[bytes, Optional[int]]]] = {}
+        for event in events:
+            lines.setdefault(self._jsonl_path(event.stream_id), []).append(
+                (
+                    event.to_json_bytes() + b"\n",
+                    iso_to_epoch_ms(event.ts),
+                )
+            )
+        # All or nothing across files: on failure every file is truncated
+        # back to its pre-batch size, so a retried batch cannot duplicate
+        # the lines that had already landed.
+        written: List[Tuple[Path, int]] = []
+        try:
+            for path, chunk in lines.items():
                 path.parent.mkdir(parents=True, exist_ok=True)
-                with path.open("a", encoding="utf-8") as handle:
-                    handle.write(line + "\n")
+                with path.open("ab") as handle:
+                    written.append((path, handle.tell()))
+                    handle.write(b"".join(line for line, _ in chunk))
+        except Exception:
+            for path, offset in written:
+                try:
+                    with path.open("r+b") as handle:
+                        handle.truncate(offset)
+                except OSError as exc:
+                    log.warning(f"Failed to roll back partial chat batch in {path}: {exc}")
+            raise
+        for path, offset in written:
+            index = self._jsonl_indexes.get(path)
+            if index is not None:
+                index.record_append(offset, [(len(line), ts_ms) for line, ts_ms in lines[path]])
+
+        if self._streams.has_structural_changes():
+            self._flush_streams(structural_only=True)
+        return len(events)
+
+    def _flush_batch(self, batch: List[ChatEvent]) -> None:
+        """Writer-thread callback for group commit."""
+
+        with self._lock:
+            self._write_events(batch)
+
+    def _on_batch_drop(self, event: ChatEvent, exc: Exception) -> None:
+        # Let a redelivered copy of the event be persisted later.
+        self._recent_ids.discard(event.event_id)
+        log.warning(f"Failed to persist chat event {event.event_id}: {exc}")
+
+    def append_event(self, event: ChatEvent, title: Optional[str] = None) -> bool:
+        if not self._recent_ids.check_and_add(event.event_id, event.source_platform):
+            return False
 
         previous = chat_context.update_live_stream(event.stream_id)
         if previous and previous != event.stream_id:
             self.mark_stream_ended(previous, event.ts)
 
-        self._upsert_stream_index(
-            stream_id=event.stream_id,
+        self._streams.touch(
+            event.stream_id,
             platform=event.source_platform,
             ts=event.ts,
             title=title,
         )
-        return True
+
+        if self._batch_writer:
+            if self._batch_writer.submit(event):
+                return True
+            self._recent_ids.discard(event.event_id)
+            log.warning(f"Chat event writer queue full; event {event.event_id} not persisted")
+            return False
+
+        with self._lock:
+            try:
+                return self._write_events([event]) > 0
+            except sqlite3.Error as exc:
+                self._recent_ids.discard(event.event_id)
+                log.warning(f"Failed to persist chat event {event.event_id}: {exc}")
+                return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued events and stream index updates are durable."""
+
+        flushed = self._batch_writer.flush(timeout) if self._batch_writer else True
+        self._flush_streams()
+        return flushed
+
+    def shutdown(self) -> None:
+        """Flush queued writes, stop background threads and persist the index."""
+
+        if self._archive:
+            self._archive.stop()
+        if self._batch_writer:
+            self._batch_writer.shutdown()
+        self._stream_flush_stop.set()
+        self._flush_streams()
+
+    def compact_archive(self) -> Dict[str, Any]:
+        """
+        Archive hot rows of streams that ended more than the retention window
+        ago. Safe to call from a worker thread; returns compaction progress.
+        """
+
+        if self._archive is None:
+            return {}
+        cutoff_ms = int(time.time() * 1000) - self._archive_hot_retention_days * 86_400_000
+        candidates = []
+        for entry in self._streams.snapshot():
+            ended_ms = iso_to_epoch_ms(entry.get("ended_at"))
+            if ended_ms is not None and ended_ms <= cutoff_ms:
+                candidates.append(entry["stream_id"])
+
+        with self._db.reader() as conn:
+            eligible = [
+                stream_id
+                for stream_id in candidates
+                if conn.execute(
+                    "SELECT 1 FROM chat_events WHERE stream_id = ? AND ts_ms IS NOT NULL LIMIT 1",
+                    (stream_id,),
+                ).fetchone()
+            ]
+        return self._archive.compact(eligible)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Storage counters for the runtime snapshot."""
+
+        return {
+            "backend": "sqlite" if self._use_sqlite else "jsonl",
+            "batch_writes": self._batch_writer is not None,
+            "writer": self._batch_writer.metrics() if self._batch_writer else None,
+            "dedup": self._recent_ids.metrics(),
+            "archive": self._archive.metrics() if self._archive else None,
+            "raw_payloads": (
+                {"mode": self._raw_mode, **self._raw_store.metrics()}
+                if self._raw_store
+                else None
+            ),
+        }
 
     # ------------------------------------------------------------------
     # Query helpers
     # ------------------------------------------------------------------
 
-    def list_streams(self) -> List[Dict[str, Any]]:
+    def _present_stream(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        # Preserve each backend's historical wire shape for stream rows.
         if self._use_sqlite:
-            with self._connect() as conn:
-                rows = conn.execute(
-                    "SELECT * FROM chat_streams ORDER BY last_updated_at DESC"
-                ).fetchall()
-            return [dict(row) for row in rows]
+            entry["platforms_active"] = json.dumps(entry.get("platforms_active") or [])
+            entry["chat_available"] = 1 if entry.get("chat_available") else 0
+        return entry
 
-        payload = self._load_index()
-        streams = list(payload.get("streams", {}).values())
-        streams.sort(key=lambda e: e.get("last_updated_at") or "", reverse=True)
-        return streams
+    def list_streams(self) -> List[Dict[str, Any]]:
+        return [self._present_stream(entry) for entry in self._streams.ordered()]
 
     def get_stream(self, stream_id: str) -> Optional[Dict[str, Any]]:
         if not stream_id:
             return None
-        if self._use_sqlite:
-            with self._connect() as conn:
-                row = conn.execute(
-                    "SELECT * FROM chat_streams WHERE stream_id = ?",
-                    (stream_id,),
-                ).fetchone()
-            return dict(row) if row else None
-
-        payload = self._load_index()
-        return payload.get("streams", {}).get(stream_id)
-
-    def _row_to_event(self, row: sqlite3.Row) -> Dict[str, Any]:
-        badges = json.loads(row["badges_json"]) if row["badges_json"] else []
-        roles = json.loads(row["roles_json"]) if row["roles_json"] else []
-        flags = json.loads(row["flags_json"]) if row["flags_json"] else {}
-        raw = json.loads(row["raw_json"]) if row["raw_json"] else None
-        event = create_chat_event(
-            stream_id=row["stream_id"],
-            source_platform=row["source_platform"],
-            author_id=row["author_id"] or "",
-            display_name=row["display_name"] or "",
-            text=row["content_text"] or "",
-            avatar_url=row["avatar_url"],
-            badges=badges,
-            roles=roles,
-            is_synthetic=bool(flags.get("is_synthetic")),
-            is_system=bool(flags.get("is_system")),
-            is_highlighted=bool(flags.get("is_highlighted")),
-            raw=raw,
-            event_id=row["event_id"],
-            ts=row["ts"],
-        )
-        return event.to_dict()
+        entry = self._streams.get(stream_id)
+        return self._present_stream(entry) if entry else None
+
+    def _rows_to_events(
+        self,
+        conn: sqlite3.Connection,
+        rows: List[Any],
+        include_raw: bool = False,
+        encoded: bool = False,
+    ) -> List[Any]:
+        """
+        Convert rows to wire events (dicts, or JSON bytes when ``encoded``).
+        Raw platform payloads are only decoded when asked for: inline
+        ``raw_json`` first, then the compressed side table.
+        """
+
+        convert = row_to_wire_bytes if encoded else row_to_wire
+        if not include_raw:
+            return [convert(row) for row in rows]
+        side: Dict[str, str] = {}
+        if self._raw_store is not None:
+            missing = [row["event_id"] for row in rows if not row["raw_json"]]
+            if missing:
+                side = self._raw_store.load(conn, missing)
+        return [convert(row, row["raw_json"] or side.get(row["event_id"])) for row in rows]
+
+    def _begin_archive_read(self, conn: sqlite3.Connection, stream_id: str) -> bool:
+        """
+        Open one read snapshot when a query must merge hot and archived rows,
+        so a concurrent compaction can neither hide nor duplicate events.
+        """
+
+        if self._archive is None or not self._archive.has_stream(stream_id):
+            return False
+        conn.execute("BEGIN")
+        return True
+
+    @staticmethod
+    def _merge_rows(
+        hot: List[Any],
+        archived: List[Dict[str, Any]],
+        *,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[Any]:
+        rows = list(hot) + archived
+        rows.sort(key=row_key, reverse=descending)
+        return rows[:limit] if limit else rows
+
+    def tail(
+        self,
+        stream_id: str,
+        limit: int = 50,
+        include_raw: bool = False,
+        encoded: bool = False,
+    ) -> List[Any]:
+        """
+        Most recent ``limit`` events, oldest first. With ``encoded`` each
+        event is returned as pre-encoded JSON bytes instead of a dict.
+        """
 
-    def tail(self, stream_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         if not stream_id:
             return []
         if self._use_sqlite:
-            with self._connect() as conn:
+            with self._db.reader() as conn:
+                archived = self._begin_archive_read(conn, stream_id)
                 rows = conn.execute(
                     """
                     SELECT * FROM chat_events
                     WHERE stream_id = ?
-                    ORDER BY ts DESC, id DESC
+                    ORDER BY ts_ms DESC, id DESC
                     LIMIT ?
                     """,
                     (stream_id, limit),
                 ).fetchall()
-            events = [self._row_to_event(row) for row in rows]
+                if archived:
+                    rows = self._merge_rows(
+                        rows,
+                        self._archive.rows(conn, stream_id, limit=limit, descending=True),
+                        limit=limit,
+                        descending=True,
+                    )
+                events = self._rows_to_events(conn, rows, include_raw, encoded)
             events.reverse()
             return events
 
-        path = self._jsonl_path(stream_id)
-        if not path.exists():
-            return []
-        lines = path.read_text(encoding="utf-8").splitlines()
-        selected = [json.loads(line) for line in lines[-limit:] if line.strip()]
-        return selected
+        events = self._decode_lines(
+            read_tail_lines(self._jsonl_path(stream_id), limit),
+            include_raw,
+        )
+        return self._encode_events(events) if encoded else events
 
-    def range(self, stream_id: str, from_ts: Optional[str], to_ts: Optional[str]) -> List[Dict[str, Any]]:
+    def range(
+        self,
+        stream_id: str,
+        from_ts: Optional[str],
+        to_ts: Optional[str],
+        include_raw: bool = False,
+        encoded: bool = False,
+    ) -> List[Any]:
         if not stream_id:
             return []
         if self._use_sqlite:
             clauses = ["stream_id = ?"]
             params: List[Any] = [stream_id]
-            if from_ts:
-                clauses.append("ts >= ?")
-                params.append(from_ts)
-            if to_ts:
-                clauses.append("ts <= ?")
-                params.append(to_ts)
+            from_ms = iso_to_epoch_ms(from_ts) if from_ts else None
+            to_ms = iso_to_epoch_ms(to_ts) if to_ts else None
+            for bound, bound_ms, op in ((from_ts, from_ms, ">="), (to_ts, to_ms, "<=")):
+                if not bound:
+                    continue
+                if bound_ms is not None:
+                    clauses.append(f"ts_ms {op} ?")
+                    params.append(bound_ms)
+                else:
+                    # Unparseable bound: keep the historical lexical filter.
+                    clauses.append(f"ts {op} ?")
+                    params.append(bound)
             where = " AND ".join(clauses)
-            with self._connect() as conn:
+            with self._db.reader() as conn:
+                archived = self._begin_archive_read(conn, stream_id)
                 rows = conn.execute(
-                    f"SELECT * FROM chat_events WHERE {where} ORDER BY ts, id",
+                    f"SELECT * FROM chat_events WHERE {where} ORDER BY ts_ms, id",
                     tuple(params),
                 ).fetchall()
-            return [self._row_to_event(row) for row in rows]
+                if archived:
+                    cold = [
+                        row
+                        for row in self._archive.rows(conn, stream_id, from_ms=from_ms, to_ms=to_ms)
+                        if self._ts_within(row["ts"], from_ts, from_ms, to_ts, to_ms)
+                    ]
+                    rows = self._merge_rows(rows, cold)
+                return self._rows_to_events(conn, rows, include_raw, encoded)
+
+        path = self._jsonl_path(stream_id)
+        if not path.exists():
+            return []
+        from_ms = iso_to_epoch_ms(from_ts) if from_ts else None
+        to_ms = iso_to_epoch_ms(to_ts) if to_ts else None
+        index = self._jsonl_index(path)
 
-        events = self.tail(stream_id, limit=10000)
         filtered: List[Dict[str, Any]] = []
-        for evt in events:
-            ts = evt.get("ts")
-            if from_ts and ts and ts < from_ts:
-                continue
-            if to_ts and ts and ts > to_ts:
-                continue
-            filtered.append(evt)
-        return filtered
+        for start, end in index.spans(from_ms, to_ms):
+            for evt in self._decode_lines(index.read_span(start, end), include_raw):
+                ts = evt.get("ts")
+                if ts and not self._ts_within(ts, from_ts, from_ms, to_ts, to_ms):
+                    continue
+                filtered.append(evt)
+        return self._encode_events(filtered) if encoded else filtered
+
+    @staticmethod
+    def _ts_within(
+        ts: str,
+        from_ts: Optional[str],
+        from_ms: Optional[int],
+        to_ts: Optional[str],
+        to_ms: Optional[int],
+    ) -> bool:
+        ts_ms = iso_to_epoch_ms(ts)
+        if from_ts:
+            if from_ms is not None and ts_ms is not None:
+                if ts_ms < from_ms:
+                    return False
+            elif ts < from_ts:
+                return False
+        if to_ts:
+            if to_ms is not None and ts_ms is not None:
+                if ts_ms > to_ms:
+                    return False
+            elif ts > to_ts:
+                return False
+        return True
 
     def paginate(
         self,
         stream_id: str,
         limit: int = 50,
         cursor: Optional[str] = None,
-    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        direction: str = DIRECTION_FORWARD,
+        include_raw: bool = False,
+        encoded: bool = False,
+    ) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        """
+        Keyset pagination over one stream.
+
+        Returns ``(events, next_cursor, prev_cursor)`` with events always in
+        chronological order. ``next_cursor`` continues forward after the last
+        event and ``prev_cursor`` continues backward before the first one.
+        Forward without a cursor starts at the beginning of the stream;
+        backward without a cursor starts at the most recent events. An empty
+        page echoes the cursor back in the direction of travel so live
+        clients can keep polling from the same position.
+        """
+
         if not stream_id:
-            return [], None
+            return [], None, None
+        limit = max(1, int(limit))
+        backward = direction == DIRECTION_BACKWARD
+        position = decode_cursor(cursor)
+
         if self._use_sqlite:
-            params: List[Any] = [stream_id]
-            clause = "stream_id = ?"
-            if cursor:
-                clause += " AND id > ?"
-                try:
-                    params.append(int(cursor))
-                except ValueError:
-                    params.append(0)
-            query = (
-                "SELECT * FROM chat_events WHERE "
-                + clause
-                + " ORDER BY id ASC LIMIT ?"
+            return self._paginate_sqlite(
+                stream_id, limit, position, backward, cursor, include_raw, encoded
             )
-            params.append(limit + 1)
-            with self._connect() as conn:
-                rows = conn.execute(query, tuple(params)).fetchall()
-            events = [self._row_to_event(row) for row in rows[:limit]]
-            next_cursor = None
-            if len(rows) > limit:
-                next_cursor = str(rows[limit - 1]["id"])
-            elif rows:
-                next_cursor = str(rows[-1]["id"])
-            return events, next_cursor
+        return self._paginate_jsonl(
+            stream_id, limit, position, backward, cursor, include_raw, encoded
+        )
 
-        events = self.tail(stream_id, limit=limit)
-        return events, None
+    @staticmethod
+    def _empty_page(
+        cursor: Optional[str],
+        backward: bool,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+        if backward:
+            return [], None, cursor
+        return [], cursor, None
+
+    def _paginate_sqlite(
+        self,
+        stream_id: str,
+        limit: int,
+        position: Optional[ChatCursor],
+        backward: bool,
+        cursor: Optional[str],
+        include_raw: bool = False,
+        encoded: bool = False,
+    ) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        """
+        Keyset pages on ``(ts_ms, id)``. Rows whose ``ts`` could not be
+        parsed (NULL ``ts_ms``) are not dropped: like ``ORDER BY ts_ms``,
+        they sort before every timestamped row, in id order, and their
+        cursors carry a null ``ts_ms``. Such rows never reach the archive.
+        """
+        with self._db.reader() as conn:
+            archived = self._begin_archive_read(conn, stream_id)
+            keyset: Optional[Tuple[Optional[int], int]] = None
+            if position is not None and position.kind == "sqlite":
+                keyset = (position.ts_ms, position.row_id)
+            elif position is not None and position.legacy:
+                # Older clients send the raw rowid; resume from that row's key.
+                row = conn.execute(
+                    "SELECT ts_ms FROM chat_events WHERE id = ?",
+                    (position.row_id,),
+                ).fetchone()
+                if row is not None:
+                    keyset = (row["ts_ms"], position.row_id)
+
+            clauses = ["stream_id = ?"]
+            params: List[Any] = [stream_id]
+            if keyset is not None and keyset[0] is None:
+                # Inside the leading run of untimestamped rows.
+                if backward:
+                    clauses.append("ts_ms IS NULL AND id < ?")
+                else:
+                    clauses.append("(ts_ms IS NOT NULL OR id > ?)")
+                params.append(keyset[1])
+            elif keyset is not None:
+                if backward:
+                    clauses.append("(ts_ms IS NULL OR (ts_ms, id) < (?, ?))")
+                else:
+                    clauses.append("(ts_ms, id) > (?, ?)")
+                params.extend(keyset)
+            order = "ts_ms DESC, id DESC" if backward else "ts_ms ASC, id ASC"
+            params.append(limit)
+            rows = conn.execute(
+                f"SELECT * FROM chat_events WHERE {' AND '.join(clauses)} "
+                f"ORDER BY {order} LIMIT ?",
+                tuple(params),
+            ).fetchall()
+            if archived and not (backward and keyset is not None and keyset[0] is None):
+                # Archived rows all have a ts_ms, so they all follow a
+                # keyset inside the untimestamped run.
+                if keyset is not None and keyset[0] is None:
+                    keyset = None
+                bounds = {"before": keyset} if backward else {"after": keyset}
+                rows = self._merge_rows(
+                    rows,
+                    self._archive.rows(
+                        conn, stream_id, limit=limit, descending=backward, **bounds
+                    ),
+                    limit=limit,
+                    descending=backward,
+                )
+            if backward:
+                rows.reverse()
+            events = self._rows_to_events(conn, rows, include_raw, encoded)
+
+        if not rows:
+            return self._empty_page(cursor, backward)
+        first, last = rows[0], rows[-1]
+        return (
+            events,
+            encode_sqlite_cursor(last["ts_ms"], last["id"]),
+            encode_sqlite_cursor(first["ts_ms"], first["id"]),
+        )
+
+    def _paginate_jsonl(
+        self,
+        stream_id: str,
+        limit: int,
+        position: Optional[ChatCursor],
+        backward: bool,
+        cursor: Optional[str],
+        include_raw: bool = False,
+        encoded: bool = False,
+    ) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        path = self._jsonl_path(stream_id)
+        offset: Optional[int] = None
+        if position is not None and position.kind == "jsonl" and position.file_name == path.name:
+            offset = position.offset
+        elif position is not None and position.legacy:
+            offset = position.offset
+
+        if backward:
+            lines, start, end = read_lines_before(path, offset, limit)
+        else:
+            lines, start, end = read_lines_from(path, offset or 0, limit)
+
+        if not lines:
+            return self._empty_page(cursor, backward)
+        events = self._decode_lines(lines, include_raw)
+        return (
+            self._encode_events(events) if encoded else events,
+            encode_jsonl_cursor(path.name, end),
+            encode_jsonl_cursor(path.name, start),
+        )
+
+    # ------------------------------------------------------------------
+    # Full-text search
+    # ------------------------------------------------------------------
+
+    def search_available(self) -> bool:
+        return self._use_sqlite and self._fts_available
+
+    @staticmethod
+    def _fts_match_expression(text: str) -> Optional[str]:
+        # Quote every term so user input is never parsed as FTS5 syntax;
+        # terms are implicitly ANDed.
+        terms = [term.replace('"', '""') for term in text.split()]
+        if not terms:
+            return None
+        return " ".join(f'"{term}"' for term in terms)
+
+    def search(
+        self,
+        text: str,
+        *,
+        stream_id: Optional[str] = None,
+        author: Optional[str] = None,
+        platform: Optional[str] = None,
+        from_ts: Optional[str] = None,
+        to_ts: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_raw: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Ranked full-text search over stored chat.
+
+        ``author`` matches an author id exactly or a display name
+        case-insensitively. Hits are ``{"event": ..., "score": ...}`` ordered
+        by BM25 relevance (higher score is better). The returned cursor pages
+        through the same query; a cursor from a different query restarts at
+        the first page.
+        """
+
+        if not self.search_available():
+            return [], None
+        match = self._fts_match_expression(text or "")
+        if match is None:
+            return [], None
+        limit = max(1, int(limit))
+
+        clauses = ["chat_events_fts MATCH ?"]
+        params: List[Any] = [match]
+        if stream_id:
+            clauses.append("e.stream_id = ?")
+            params.append(stream_id)
+        if author:
+            clauses.append("(e.author_id = ? OR e.display_name = ? COLLATE NOCASE)")
+            params.extend([author, author])
+        if platform:
+            clauses.append("e.source_platform = ?")
+            params.append(platform.lower())
+        for bound, op in ((from_ts, ">="), (to_ts, "<=")):
+            bound_ms = iso_to_epoch_ms(bound) if bound else None
+            if bound_ms is not None:
+                clauses.append(f"e.ts_ms {op} ?")
+                params.append(bound_ms)
+
+        query_hash = hashlib.sha1(
+            json.dumps([match, stream_id, author, platform, from_ts, to_ts]).encode("utf-8")
+        ).hexdigest()[:16]
+        position = decode_cursor(cursor)
+        offset = 0
+        if position is not None and position.kind == "search" and position.query_hash == query_hash:
+            offset = position.offset or 0
+
+        params.extend([limit + 1, offset])
+        try:
+            with self._db.reader() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT e.*, bm25(chat_events_fts) AS score
+                    FROM chat_events_fts
+                    JOIN chat_events AS e ON e.id = chat_events_fts.rowid
+                    WHERE {' AND '.join(clauses)}
+                    ORDER BY score, e.id DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                    tuple(params),
+                ).fetchall()
+                events = self._rows_to_events(conn, rows[:limit], include_raw)
+        except sqlite3.OperationalError as exc:
+            log.warning(f"Chat search failed: {exc}")
+            return [], None
+
+        hits = [
+            {"event": event, "score": round(-row["score"], 4)}
+            for event, row in zip(events, rows)
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_search_cursor(query_hash, offset + limit)
+        return hits, next_cursor
 
 
 _STORE: Optional[ChatEventStore] = None
@@ -443,6 +1093,36 @@ def get_store() -> ChatEventStore:
     return _STORE
 
 
+def configure_store(**options: Any) -> ChatEventStore:
+    """
+    Replace the shared store with one built from runtime config.
+
+    Must be called before platform workers start writing; any previously
+    created store is flushed and stopped first.
+    """
+    global _STORE
+    if _STORE is not None:
+        _STORE.shutdown()
+    _STORE = ChatEventStore(**options)
+    return _STORE
+
+
+def compact_archive() -> Dict[str, Any]:
+    return get_store().compact_archive()
+
+
+def shutdown_store() -> None:
+    if _STORE is not None:
+        _STORE.shutdown()
+
+
+def store_metrics() -> Dict[str, Any]:
+    """Metrics for the shared store, or an empty dict if it was never used."""
+    if _STORE is None:
+        return {}
+    return _STORE.metrics()
+
+
 def append_chat_event(event: ChatEvent, title: Optional[str] = None) -> bool:
     return get_store().append_event(event, title=title)
 
@@ -455,22 +1135,52 @@ def get_stream(stream_id: str) -> Optional[Dict[str, Any]]:
     return get_store().get_stream(stream_id)
 
 
-def tail_events(stream_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-    return get_store().tail(stream_id, limit=limit)
+def tail_events(
+    stream_id: str,
+    limit: int = 50,
+    include_raw: bool = False,
+    encoded: bool = False,
+) -> List[Any]:
+    return get_store().tail(stream_id, limit=limit, include_raw=include_raw, encoded=encoded)
+
+
+def search_events(
+    text: str,
+    **filters: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    return get_store().search(text, **filters)
+
+
+def search_available() -> bool:
+    return get_store().search_available()
 
 
 def range_events(
     stream_id: str,
     from_ts: Optional[str],
     to_ts: Optional[str],
-) -> List[Dict[str, Any]]:
-    return get_store().range(stream_id, from_ts, to_ts)
+    include_raw: bool = False,
+    encoded: bool = False,
+) -> List[Any]:
+    return get_store().range(
+        stream_id, from_ts, to_ts, include_raw=include_raw, encoded=encoded
+    )
 
 
 def paginate_events(
     stream_id: str,
     limit: int = 50,
     cursor: Optional[str] = None,
-) -> Tuple[List[Dict[str, Any]], Optional[str]]:
-    return get_store().paginate(stream_id, limit=limit, cursor=cursor)
+    direction: str = DIRECTION_FORWARD,
+    include_raw: bool = False,
+    encoded: bool = False,
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    return get_store().paginate(
+        stream_id,
+        limit=limit,
+        cursor=cursor,
+        direction=direction,
+        include_raw=include_raw,
+        encoded=encoded,
+    )
 
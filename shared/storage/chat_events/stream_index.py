@@ -0,0 +1,159 @@
+"""In-memory chat stream index with write-behind persistence.
+
+``ChatEventStore`` loads the persisted stream index once at startup and then
+keeps it here. Per-event updates are O(1) dict operations; entries are only
+marked for prompt persistence when something a reader would notice changes
+(new stream, new platform, title, ended marker). Plain ``last_updated_at``
+bumps are persisted later by the store's periodic flush.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class StreamIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        self._structural: Set[str] = set()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, entries: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty.clear()
+            self._structural.clear()
+            for entry in entries:
+                stream_id = entry.get("stream_id")
+                if not stream_id:
+                    continue
+                platforms = entry.get("platforms_active") or []
+                self._entries[stream_id] = {
+                    "stream_id": stream_id,
+                    "title": entry.get("title"),
+                    "started_at": entry.get("started_at"),
+                    "ended_at": entry.get("ended_at"),
+                    "platforms_active": list(platforms),
+                    "chat_available": bool(entry.get("chat_available", True)),
+                    "last_updated_at": entry.get("last_updated_at"),
+                }
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def touch(
+        self,
+        stream_id: str,
+        *,
+        platform: Optional[str],
+        ts: str,
+        title: Optional[str] = None,
+    ) -> bool:
+        """Record activity on a stream. Returns True on a structural change."""
+
+        with self._lock:
+            entry = self._entries.get(stream_id)
+            structural = False
+            if entry is None:
+                entry = {
+                    "stream_id": stream_id,
+                    "title": title,
+                    "started_at": ts,
+                    "ended_at": None,
+                    "platforms_active": [],
+                    "chat_available": True,
+                    "last_updated_at": ts,
+                }
+                self._entries[stream_id] = entry
+                structural = True
+            elif title and entry.get("title") != title:
+                entry["title"] = title
+                structural = True
+
+            if platform and platform not in entry["platforms_active"]:
+                entry["platforms_active"].append(platform)
+                structural = True
+
+            if not entry["chat_available"]:
+                entry["chat_available"] = True
+                structural = True
+
+            entry["last_updated_at"] = ts
+            self._dirty.add(stream_id)
+            if structural:
+                self._structural.add(stream_id)
+            return structural
+
+    def mark_ended(self, stream_id: str, ts: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(stream_id)
+            if not entry:
+                return False
+            entry["ended_at"] = ts
+            self._dirty.add(stream_id)
+            self._structural.add(stream_id)
+            return True
+
+    # ------------------------------------------------------------------
+    # Persistence hand-off
+    # ------------------------------------------------------------------
+
+    def has_structural_changes(self) -> bool:
+        return bool(self._structural)
+
+    def drain(self, *, structural_only: bool = False) -> List[Dict[str, Any]]:
+        """Return copies of entries needing persistence and clear their flags."""
+
+        with self._lock:
+            ids = set(self._structural) if structural_only else set(self._dirty)
+            if not ids:
+                return []
+            self._dirty.difference_update(ids)
+            self._structural.difference_update(ids)
+            return [self._copy(self._entries[stream_id]) for stream_id in ids]
+
+    def requeue(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Re-flag entries whose persistence failed so the next flush retries."""
+
+        with self._lock:
+            for entry in entries:
+                stream_id = entry.get("stream_id")
+                if stream_id in self._entries:
+                    self._dirty.add(stream_id)
+                    self._structural.add(stream_id)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _copy(entry: Dict[str, Any]) -> Dict[str, Any]:
+        copied = dict(entry)
+        copied["platforms_active"] = list(entry.get("platforms_active") or [])
+        return copied
+
+    def get(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(stream_id)
+            return self._copy(entry) if entry else None
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._copy(entry) for entry in self._entries.values()]
+
+    def ordered(self) -> List[Dict[str, Any]]:
+        """Entries ordered by most recent activity first."""
+
+        entries = self.snapshot()
+        entries.sort(key=lambda e: e.get("last_updated_at") or "", reverse=True)
+        return entries
+
+
+__all__ = ["StreamIndex"]
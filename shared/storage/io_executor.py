@@ -0,0 +1,158 @@
+"""
+Write-behind executor for state and export files.
+
+Snapshot writers serialize JSON, write a temp file, fsync and rename. Doing
+that on the asyncio loop stalls chat ingest on slow disks, so publishers
+hand the whole write to this executor instead:
+
+- one background thread performs every write
+- writes are keyed by target path; a newer write for a path that has not
+  started yet replaces the older one (last writer wins)
+- at most ``max_pending`` distinct paths may be queued; ``submit`` blocks
+  when the queue is full rather than growing without bound
+- ``flush()`` is a barrier: it returns once everything submitted before
+  the call is on disk
+- after ``shutdown()`` (or at interpreter exit) writes run inline
+
+Usage:
+    io_executor.submit(str(path), lambda: write_file(path, payload))
+    io_executor.flush(timeout=10)
+
+Callers hand over ownership of anything the write closes over: payloads
+must not be mutated after they are submitted.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from shared.logging.logger import get_logger
+
+log = get_logger("shared.io_executor")
+
+DEFAULT_MAX_PENDING = 256
+
+
+class WriteBehindExecutor:
+    """Single-thread, per-key coalescing write queue."""
+
+    def __init__(self, *, max_pending: int = DEFAULT_MAX_PENDING, name: str = "state-io") -> None:
+        self._max_pending = max(1, int(max_pending))
+        self._name = name
+        self._cond = threading.Condition()
+        # key -> (oldest sequence folded into this entry, write)
+        self._pending: "OrderedDict[str, Tuple[int, Callable[[], None]]]" = OrderedDict()
+        self._in_flight: Optional[int] = None
+        self._seq = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {"submitted": 0, "coalesced": 0, "written": 0, "failed": 0, "blocked": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, key: str, write: Callable[[], None]) -> None:
+        """Queue ``write`` for ``key``, replacing any queued write for it."""
+
+        with self._cond:
+            if not self._closed:
+                self._seq += 1
+                self._stats["submitted"] += 1
+                entry = self._pending.get(key)
+                if entry is not None:
+                    self._stats["coalesced"] += 1
+                    self._pending[key] = (entry[0], write)
+                    return
+                if len(self._pending) >= self._max_pending:
+                    self._stats["blocked"] += 1
+                    while len(self._pending) >= self._max_pending and not self._closed:
+                        self._cond.wait()
+                if not self._closed:
+                    self._pending[key] = (self._seq, write)
+                    self._ensure_thread()
+                    self._cond.notify_all()
+                    return
+        # Closed: nobody will drain the queue, so write on the caller.
+        self._run(write)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every write submitted so far has finished."""
+
+        with self._cond:
+            target = self._seq
+            return self._cond.wait_for(
+                lambda: self._oldest_outstanding() > target, timeout=timeout
+            )
+
+    def shutdown(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush pending writes and stop the worker thread."""
+
+        if not self.flush(timeout=timeout):
+            with self._cond:
+                remaining = len(self._pending)
+            log.warning(f"I/O executor shutdown timed out with {remaining} write(s) pending")
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+            return stats
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _oldest_outstanding(self) -> float:
+        oldest = min((entry[0] for entry in self._pending.values()), default=float("inf"))
+        if self._in_flight is not None:
+            oldest = min(oldest, self._in_flight)
+        return oldest
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _run(self, write: Callable[[], None]) -> bool:
+        try:
+            write()
+            return True
+        except Exception as e:
+            log.warning(f"Background write failed: {e}")
+            return False
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                _, (seq, write) = self._pending.popitem(last=False)
+                self._in_flight = seq
+                self._cond.notify_all()
+
+            ok = self._run(write)
+
+            with self._cond:
+                self._in_flight = None
+                self._stats["written" if ok else "failed"] += 1
+                self._cond.notify_all()
+
+
+# Shared executor for every snapshot/state writer in the process.
+io_executor = WriteBehindExecutor()
+atexit.register(io_executor.shutdown)
+
+
+__all__ = ["DEFAULT_MAX_PENDING", "WriteBehindExecutor", "io_executor"]
@@ -0,0 +1,286 @@
+"""
+SQLite-backed job state.
+
+Jobs used to live only in shared/state/jobs.json, rewritten in full on
+every append and status change. They now live in the ``jobs`` table,
+keyed by job id, so an update touches one row. jobs.json is materialized
+from here as a bounded view (see shared.storage.state_store).
+
+The table lives in its own database file, not data/streamsuites.db:
+ChatEventStore picks its backend by whether that file exists, so creating
+it for job state would silently switch JSONL deployments to SQLite.
+
+Known job fields map to columns; any other keys round-trip through
+``extra_json``.
+
+Several processes (the streaming runtime and the Discord control plane)
+write this table. Every write transaction bumps a shared version row, so
+readers detect changes from any process with ``version()``; aggregates
+are computed by SQL rather than tracked in one process's memory.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from shared.logging.logger import get_logger
+from shared.storage.sqlite_pool import get_connection_manager
+
+log = get_logger("shared.job_store")
+
+DEFAULT_DB_PATH = Path("data/runtime_state.db")
+
+_COLUMNS = (
+    "id",
+    "type",
+    "creator_id",
+    "status",
+    "created_at",
+    "started_at",
+    "completed_at",
+    "finished_at",
+    "updated_at",
+    "error",
+)
+_COLUMN_SET = frozenset(_COLUMNS)
+_SELECT = f"SELECT {', '.join(_COLUMNS)}, payload_json, extra_json FROM jobs"
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value)
+
+
+def _split(job: Mapping[str, Any]) -> tuple:
+    extra = {
+        key: value
+        for key, value in job.items()
+        if key not in _COLUMN_SET and key != "payload"
+    }
+    return (
+        tuple(job.get(column) for column in _COLUMNS)
+        + (_dumps(job.get("payload")), _dumps(extra) if extra else None)
+    )
+
+
+def _row_to_job(row: Mapping[str, Any]) -> Dict[str, Any]:
+    job: Dict[str, Any] = {column: row[column] for column in _COLUMNS}
+    if job["error"] is None:
+        del job["error"]
+    if row["extra_json"]:
+        job.update(json.loads(row["extra_json"]))
+    job["payload"] = json.loads(row["payload_json"]) if row["payload_json"] else None
+    return job
+
+
+class JobStore:
+    """Job rows indexed by id, with creator/status/recency indexes."""
+
+    def __init__(self, db_path: Path | str = DEFAULT_DB_PATH) -> None:
+        self._path = Path(db_path)
+        self._db = get_connection_manager(self._path)
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._db.writer() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL UNIQUE,
+                    type TEXT,
+                    creator_id TEXT,
+                    status TEXT,
+                    created_at INTEGER,
+                    started_at INTEGER,
+                    completed_at INTEGER,
+                    finished_at INTEGER,
+                    updated_at INTEGER,
+                    error TEXT,
+                    payload_json TEXT,
+                    extra_json TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_creator ON jobs(creator_id, seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_state_version ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO job_state_version (id, version) VALUES (1, 0)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_owners ("
+                "owner TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def _bump_version(conn) -> None:
+        conn.execute("UPDATE job_state_version SET version = version + 1 WHERE id = 1")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, job: Mapping[str, Any]) -> None:
+        if not job.get("id"):
+            raise ValueError("job id is required")
+        placeholders = ", ".join("?" for _ in range(len(_COLUMNS) + 2))
+        with self._db.writer() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(_COLUMNS)}, payload_json, extra_json) "
+                f"VALUES ({placeholders})",
+                _split(job),
+            )
+            self._bump_version(conn)
+
+    def update(self, job_id: str, updates: Mapping[str, Any]) -> bool:
+        """Merge ``updates`` into one job; returns False if the id is unknown."""
+
+        columns = [key for key in updates if key in _COLUMN_SET and key != "id"]
+        extra = {
+            key: value
+            for key, value in updates.items()
+            if key not in _COLUMN_SET and key != "payload"
+        }
+        with self._db.writer() as conn:
+            row = conn.execute("SELECT extra_json FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return False
+            assignments = [f"{column} = ?" for column in columns]
+            params: List[Any] = [updates[column] for column in columns]
+            if "payload" in updates:
+                assignments.append("payload_json = ?")
+                params.append(_dumps(updates["payload"]))
+            if extra:
+                merged = json.loads(row["extra_json"]) if row["extra_json"] else {}
+                merged.update(extra)
+                assignments.append("extra_json = ?")
+                params.append(json.dumps(merged))
+            if assignments:
+                params.append(job_id)
+                conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE id = ?", params)
+                self._bump_version(conn)
+        return True
+
+    def import_jobs(self, jobs: Iterable[Mapping[str, Any]]) -> int:
+        """Insert jobs whose ids are not stored yet (legacy migration)."""
+
+        rows = [_split(job) for job in jobs if isinstance(job, Mapping) and job.get("id")]
+        if not rows:
+            return 0
+        placeholders = ", ".join("?" for _ in range(len(_COLUMNS) + 2))
+        with self._db.writer() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO jobs ({', '.join(_COLUMNS)}, payload_json, extra_json) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+            imported = conn.total_changes - before
+            if imported:
+                self._bump_version(conn)
+        return imported
+
+    def heartbeat(self, owner: str, now: float) -> None:
+        """Renew ``owner``'s lease on the jobs it persisted."""
+
+        with self._db.writer() as conn:
+            conn.execute(
+                "INSERT INTO job_owners (owner, heartbeat_at) VALUES (?, ?) "
+                "ON CONFLICT (owner) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (owner, float(now)),
+            )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def owner_heartbeats(self) -> Dict[str, float]:
+        with self._db.reader() as conn:
+            rows = conn.execute("SELECT owner, heartbeat_at FROM job_owners").fetchall()
+        return {row["owner"]: float(row["heartbeat_at"]) for row in rows}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._db.reader() as conn:
+            row = conn.execute(f"{_SELECT} WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def version(self) -> int:
+        """Advances on every committed job write, from any process."""
+
+        with self._db.reader() as conn:
+            row = conn.execute("SELECT version FROM job_state_version WHERE id = 1").fetchone()
+        return int(row["version"]) if row else 0
+
+    def count(self) -> int:
+        with self._db.reader() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+
+    def all(self, *, creator_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every job in insertion order, optionally for one creator."""
+
+        with self._db.reader() as conn:
+            if creator_id is None:
+                rows = conn.execute(f"{_SELECT} ORDER BY seq").fetchall()
+            else:
+                rows = conn.execute(
+                    f"{_SELECT} WHERE creator_id = ? ORDER BY seq", (creator_id,)
+                ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def with_status(self, statuses: Iterable[str]) -> List[Dict[str, Any]]:
+        """Jobs in any of ``statuses``, in insertion order."""
+
+        statuses = list(statuses)
+        if not statuses:
+            return []
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._db.reader() as conn:
+            rows = conn.execute(
+                f"{_SELECT} WHERE status IN ({placeholders}) ORDER BY seq", statuses
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """The ``limit`` most recently added jobs, oldest first."""
+
+        with self._db.reader() as conn:
+            rows = conn.execute(f"{_SELECT} ORDER BY seq DESC LIMIT ?", (max(0, int(limit)),)).fetchall()
+        rows.reverse()
+        return [_row_to_job(row) for row in rows]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Totals by status, type and creator."""
+
+        with self._db.reader() as conn:
+            rows = conn.execute(
+                """
+                SELECT COALESCE(creator_id, 'unknown') AS creator,
+                       COALESCE(status, 'unknown') AS status,
+                       COALESCE(type, 'unknown') AS type,
+                       COUNT(*) AS n
+                FROM jobs
+                GROUP BY 1, 2, 3
+                """
+            ).fetchall()
+
+        metrics: Dict[str, Any] = {
+            "total": 0,
+            "by_status": {},
+            "by_creator": {},
+            "by_type": {},
+        }
+        for row in rows:
+            creator_id, status, job_type, count = row["creator"], row["status"], row["type"], int(row["n"])
+            metrics["total"] += count
+            metrics["by_status"][status] = metrics["by_status"].get(status, 0) + count
+            metrics["by_type"][job_type] = metrics["by_type"].get(job_type, 0) + count
+            creator = metrics["by_creator"].setdefault(creator_id, {"total": 0, "by_status": {}})
+            creator["total"] += count
+            creator["by_status"][status] = creator["by_status"].get(status, 0) + count
+        return metrics
+
+
+__all__ = ["DEFAULT_DB_PATH", "JobStore"]
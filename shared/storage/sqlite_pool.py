@@ -0,0 +1,201 @@
+"""
+Shared SQLite connection management.
+
+Every SQLite user of a database file (chat events, clips, replay metadata)
+goes through one manager per path instead of opening a fresh connection per
+call. The manager:
+
+- switches the database to WAL so readers never block the writer
+- applies tuned per-connection pragmas (synchronous, cache, mmap, busy timeout)
+- owns one long-lived writer connection, serialized by a lock
+- hands out a small pool of long-lived reader connections
+
+Usage:
+    db = get_connection_manager("data/streamsuites.db")
+    with db.writer() as conn:   # commits on success, rolls back on error
+        conn.execute("INSERT ...")
+    with db.reader() as conn:
+        rows = conn.execute("SELECT ...").fetchall()
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from shared.logging.logger import get_logger
+
+log = get_logger("shared.sqlite_pool")
+
+DEFAULT_READER_POOL_SIZE = 4
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHE_SIZE_KIB = 16384
+DEFAULT_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+
+class SQLiteConnectionManager:
+    """
+    One writer + N readers against a single WAL-mode database file.
+
+    Connections are created lazily and shared across threads
+    (``check_same_thread=False``); the writer is guarded by a re-entrant
+    lock and readers are checked out of a bounded pool.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        *,
+        reader_pool_size: int = DEFAULT_READER_POOL_SIZE,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        mmap_size_bytes: int = DEFAULT_MMAP_SIZE_BYTES,
+        synchronous: str = "NORMAL",
+    ) -> None:
+        self._path = Path(db_path)
+        self._busy_timeout_ms = max(0, int(busy_timeout_ms))
+        self._cache_size_kib = max(0, int(cache_size_kib))
+        self._mmap_size_bytes = max(0, int(mmap_size_bytes))
+        self._synchronous = synchronous
+        self._reader_pool_size = max(1, int(reader_pool_size))
+
+        self._writer_lock = threading.RLock()
+        self._writer_conn: Optional[sqlite3.Connection] = None
+
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers_created = 0
+        self._readers_lock = threading.Lock()
+        self._all_readers: List[sqlite3.Connection] = []
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    # ------------------------------------------------------------------
+    # Connection setup
+    # ------------------------------------------------------------------
+
+    def _open(self) -> sqlite3.Connection:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {self._busy_timeout_ms}")
+        conn.execute(f"PRAGMA synchronous = {self._synchronous}")
+        conn.execute(f"PRAGMA cache_size = -{self._cache_size_kib}")
+        conn.execute(f"PRAGMA mmap_size = {self._mmap_size_bytes}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        if self._writer_conn is None:
+            conn = self._open()
+            mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()
+            if mode and str(mode[0]).lower() != "wal":
+                log.warning(f"SQLite WAL mode unavailable for {self._path} (journal_mode={mode[0]})")
+            self._writer_conn = conn
+        return self._writer_conn
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readers_lock:
+            if self._readers_created < self._reader_pool_size:
+                # Make sure WAL is enabled before the first reader attaches.
+                with self._writer_lock:
+                    self._get_writer()
+                conn = self._open()
+                self._readers_created += 1
+                self._all_readers.append(conn)
+                return conn
+
+        return self._readers.get()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Exclusive access to the writer connection inside one transaction."""
+
+        with self._writer_lock:
+            conn = self._get_writer()
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled read connection."""
+
+        conn = self._checkout_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    def close(self) -> None:
+        with self._writer_lock:
+            if self._writer_conn is not None:
+                try:
+                    self._writer_conn.close()
+                except Exception:
+                    pass
+                self._writer_conn = None
+        with self._readers_lock:
+            for conn in self._all_readers:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._all_readers.clear()
+            self._readers_created = 0
+            self._readers = queue.LifoQueue()
+
+
+_MANAGERS: Dict[str, SQLiteConnectionManager] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def get_connection_manager(db_path: Path | str) -> SQLiteConnectionManager:
+    """Return the process-wide manager for ``db_path`` (one per file)."""
+
+    key = str(Path(db_path).resolve())
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = SQLiteConnectionManager(db_path)
+            _MANAGERS[key] = manager
+        return manager
+
+
+def close_all() -> None:
+    with _MANAGERS_LOCK:
+        managers = list(_MANAGERS.values())
+        _MANAGERS.clear()
+    for manager in managers:
+        manager.close()
+
+
+__all__ = [
+    "SQLiteConnectionManager",
+    "close_all",
+    "get_connection_manager",
+]
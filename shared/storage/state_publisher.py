@@ -2,7 +2,8 @@
 Dashboard state publisher helpers.
 
 This module centralizes atomic writes of runtime/job snapshots
-and optional mirroring into the dashboard hosting directory.
+and optional mirroring into the dashboard hosting directory. Writes run
+on the shared write-behind I/O executor, never on the caller's thread.
 """
 
 from __future__ import annotations
@@ -14,6 +15,8 @@ from pathlib import Path
 from typing import Any, Optional
 
 from shared.logging.logger import get_logger
+from shared.storage.io_executor import WriteBehindExecutor, io_executor
+from shared.utils.hashing import ContentHashCache, publish_cache
 
 log = get_logger("shared.state_publisher")
 
@@ -22,6 +25,9 @@ class DashboardStatePublisher:
     """
     Atomic snapshot writer with optional mirroring into the dashboard
     hosting root (e.g., GitHub Pages checkout or bucket mount).
+
+    Writes whose content (ignoring volatile fields such as generated_at)
+    matches what is already on disk are skipped; see ContentHashCache.
     """
 
     DEFAULT_BASE_DIR = Path("shared/state")
@@ -34,7 +40,11 @@ class DashboardStatePublisher:
         self,
         base_dir: Path | str | None = None,
         publish_root: Path | str | None = None,
+        cache: ContentHashCache | None = None,
+        executor: WriteBehindExecutor | None = None,
     ):
+        self._cache = cache or publish_cache
+        self._executor = executor or io_executor
         self._base_dir = Path(base_dir) if base_dir else self.DEFAULT_BASE_DIR
         self._base_dir.mkdir(parents=True, exist_ok=True)
 
@@ -106,6 +116,16 @@ class DashboardStatePublisher:
 
         temp_path.replace(path)
 
+    def _write_if_changed(self, path: Path, payload: Any, digest: Optional[str]) -> None:
+        if self._cache.is_current(path, digest):
+            return
+        try:
+            self._write_atomic(path, payload)
+        except Exception:
+            self._cache.invalidate(path)
+            raise
+        self._cache.record_write(path, digest)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -118,12 +138,23 @@ class DashboardStatePublisher:
         """
         Write snapshot to shared/state/<relative_path> and optionally
         mirror to <publish_root>/shared/state/<relative_path>.
+
+        The write is queued on the I/O executor; a newer publish of the same
+        path replaces it if it has not started. ``payload`` must not be
+        mutated afterwards.
         """
         rel = Path(relative_path)
         target = self._base_dir / rel
+        self._executor.submit(
+            os.path.abspath(target),
+            lambda: self._write_snapshot(rel, target, payload),
+        )
+
+    def _write_snapshot(self, rel: Path, target: Path, payload: Any) -> None:
+        digest = self._cache.fingerprint(payload)
 
         try:
-            self._write_atomic(target, payload)
+            self._write_if_changed(target, payload, digest)
         except Exception as e:
             log.error(f"Failed to write state snapshot {rel}: {e}")
             return
@@ -133,7 +164,7 @@ class DashboardStatePublisher:
 
         mirror = self._publish_root / "shared" / "state" / rel
         try:
-            self._write_atomic(mirror, payload)
+            self._write_if_changed(mirror, payload, digest)
         except Exception as e:
             log.warning(f"Failed to mirror snapshot to dashboard root: {e}")
 
@@ -5,16 +5,35 @@ from threading import Lock
 from typing import Any, Dict, List, Optional
 
 from shared.logging.logger import get_logger
+from shared.storage.job_store import JobStore
 from shared.storage.state_publisher import DashboardStatePublisher
+from shared.storage.trigger_store import TriggerCooldownStore
 
 _STATE_DIR = Path("shared/state")
 _STATE_PATH = _STATE_DIR / "jobs.json"
 _QUOTA_PATH = _STATE_DIR / "quotas.json"
+# Job and cooldown state; deliberately separate from the chat database.
+_DB_PATH = Path("data/runtime_state.db")
+
+# jobs.json is a bounded view: the most recent jobs plus aggregates.
+JOBS_VIEW_LIMIT = 200
 
 _LOCK = Lock()
+_TRIGGER_LOCK = Lock()
 _PUBLISHER = DashboardStatePublisher(base_dir=_STATE_DIR)
 _log = get_logger("shared.state_store")
 
+# Jobs and trigger cooldowns live in SQLite (JobStore, TriggerCooldownStore).
+# Quota state is kept here, loaded from disk once, since writes go through
+# the write-behind I/O executor and the file can lag behind.
+_JOB_STORE: Optional[JobStore] = None
+_TRIGGER_STORE: Optional[TriggerCooldownStore] = None
+# The view is rebuilt when the job store's version moves (a job write from
+# any process) or a local cooldown changes.
+_VIEW_DIRTY = True
+_VIEW_VERSION: Optional[int] = None
+_QUOTA_STATE: Optional[Dict[str, Any]] = None
+
 
 # ======================================================================
 # INTERNAL LOAD / SAVE — JOB STATE
@@ -38,11 +57,106 @@ def _load_state() -> Dict[str, Any]:
         return {"jobs": [], "triggers": {}}
 
 
-def _save_state(state: Dict[str, Any]) -> None:
+def _close_interrupted(jobs: List[Any]) -> List[Any]:
+    """
+    Mark legacy jobs left pending/running as failed. They carry no owner,
+    so no process can tell whether they are still running; rerunning them
+    after the upgrade would repeat their side effects.
+    """
+    now = int(time.time())
+    closed = []
+    for job in jobs:
+        if isinstance(job, dict) and job.get("status") in ("pending", "running"):
+            job = {
+                **job,
+                "status": "failed",
+                "completed_at": now,
+                "finished_at": now,
+                "updated_at": now,
+                "error": "interrupted before migration to the job store",
+            }
+        closed.append(job)
+    return closed
+
+
+def _job_store() -> JobStore:
+    """Open the job store on first use, migrating jobs.json; caller holds ``_LOCK``."""
+    global _JOB_STORE
+    if _JOB_STORE is None:
+        store = JobStore(_DB_PATH)
+        if store.count() == 0:
+            legacy = _load_state()
+            if legacy.get("jobs"):
+                imported = store.import_jobs(_close_interrupted(legacy["jobs"]))
+                _log.info(f"Migrated {imported} job(s) from {_STATE_PATH} into the job store")
+        _JOB_STORE = store
+    return _JOB_STORE
+
+
+def _trigger_store() -> TriggerCooldownStore:
+    """Open the cooldown store on first use, migrating jobs.json "triggers"."""
+    global _TRIGGER_STORE
+    store = _TRIGGER_STORE
+    if store is not None:
+        return store
+    with _TRIGGER_LOCK:
+        if _TRIGGER_STORE is None:
+            store = TriggerCooldownStore(_DB_PATH)
+            if store.is_empty():
+                triggers = _load_state().get("triggers")
+                if isinstance(triggers, dict) and triggers:
+                    imported = store.import_cooldowns(triggers)
+                    _log.info(f"Migrated {imported} trigger cooldown(s) from {_STATE_PATH}")
+            _TRIGGER_STORE = store
+        return _TRIGGER_STORE
+
+
+def _mark_view_dirty() -> None:
+    global _VIEW_DIRTY
+    _VIEW_DIRTY = True
+
+
+def materialize_jobs_view(force: bool = False) -> bool:
+    """
+    Publish jobs.json (recent jobs, aggregates, trigger cooldowns) if
+    anything changed since the last call. Also merges cooldowns other
+    processes recorded. Returns True when published.
+    """
+    global _VIEW_DIRTY, _VIEW_VERSION
+
     try:
-        _PUBLISHER.publish("jobs.json", state)
+        if _trigger_store().refresh():
+            _mark_view_dirty()
+    except Exception as e:
+        _log.warning(f"Failed to refresh trigger cooldowns: {e}")
+
+    with _LOCK:
+        try:
+            store = _job_store()
+            version = store.version()
+            if not (_VIEW_DIRTY or force or version != _VIEW_VERSION):
+                return False
+            _VIEW_DIRTY = False
+            _VIEW_VERSION = version
+            view = {
+                "schema_version": "v1",
+                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "jobs": store.recent(JOBS_VIEW_LIMIT),
+                "aggregates": store.metrics(),
+                "triggers": _trigger_store().snapshot(),
+            }
+        except Exception as e:
+            _VIEW_DIRTY = True
+            _VIEW_VERSION = None
+            _log.error(f"Failed to build job state view: {e}")
+            return False
+
+    try:
+        _PUBLISHER.publish("jobs.json", view)
     except Exception as e:
         _log.error(f"Failed to persist job state: {e}")
+        return False
+    return True
 
 
 # ======================================================================
@@ -56,9 +170,10 @@ def append_job(job: Dict[str, Any]) -> None:
     job.setdefault("finished_at", None)
 
     with _LOCK:
-        state = _load_state()
-        state.setdefault("jobs", []).append(job)
-        _save_state(state)
+        try:
+            _job_store().append(job)
+        except Exception as e:
+            _log.error(f"Failed to persist job {job.get('id')}: {e}")
 
 
 def update_job(job_id: str, updates: Dict[str, Any]) -> None:
@@ -66,74 +181,66 @@ def update_job(job_id: str, updates: Dict[str, Any]) -> None:
     updates.setdefault("updated_at", int(time.time()))
 
     with _LOCK:
-        state = _load_state()
-        for job in state.get("jobs", []):
-            if job.get("id") == job_id:
-                job.update(updates)
-                break
-        _save_state(state)
+        try:
+            _job_store().update(job_id, updates)
+        except Exception as e:
+            _log.error(f"Failed to update job {job_id}: {e}")
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    with _LOCK:
+        store = _job_store()
+    return store.get(job_id)
 
 
 def get_all_jobs() -> List[Dict[str, Any]]:
     with _LOCK:
-        return list(_load_state().get("jobs", []))
+        store = _job_store()
+    return store.all()
 
 
 def get_jobs_for_creator(creator_id: str) -> List[Dict[str, Any]]:
-    return [
-        job for job in get_all_jobs()
-        if job.get("creator_id") == creator_id
-    ]
+    with _LOCK:
+        store = _job_store()
+    return store.all(creator_id=creator_id)
 
 
-def get_job_metrics() -> Dict[str, Any]:
-    jobs = get_all_jobs()
+def get_jobs_with_status(statuses: List[str]) -> List[Dict[str, Any]]:
+    with _LOCK:
+        store = _job_store()
+    return store.with_status(statuses)
 
-    metrics = {
-        "total": len(jobs),
-        "by_status": {},
-        "by_creator": {},
-        "by_type": {},
-    }
 
-    for job in jobs:
-        status = job.get("status", "unknown")
-        creator = job.get("creator_id", "unknown")
-        jtype = job.get("type", "unknown")
+def record_job_owner_heartbeat(owner: str) -> None:
+    with _LOCK:
+        store = _job_store()
+    try:
+        store.heartbeat(owner, time.time())
+    except Exception as e:
+        _log.warning(f"Failed to renew job lease for {owner}: {e}")
 
-        metrics["by_status"][status] = metrics["by_status"].get(status, 0) + 1
-        metrics["by_type"][jtype] = metrics["by_type"].get(jtype, 0) + 1
 
-        if creator not in metrics["by_creator"]:
-            metrics["by_creator"][creator] = {
-                "total": 0,
-                "by_status": {}
-            }
+def get_job_owner_heartbeats() -> Dict[str, float]:
+    with _LOCK:
+        store = _job_store()
+    return store.owner_heartbeats()
 
-        metrics["by_creator"][creator]["total"] += 1
-        metrics["by_creator"][creator]["by_status"][status] = (
-            metrics["by_creator"][creator]["by_status"].get(status, 0) + 1
-        )
 
-    return metrics
+def get_job_metrics() -> Dict[str, Any]:
+    with _LOCK:
+        store = _job_store()
+    return store.metrics()
 
 
 # ======================================================================
-# TRIGGER COOLDOWN STATE (AUTHORITATIVE)
+# TRIGGER COOLDOWN STATE (AUTHORITATIVE, IN MEMORY)
 # ======================================================================
 
 def get_last_trigger_time(
     creator_id: str,
     trigger_key: str,
 ) -> float | None:
-    with _LOCK:
-        state = _load_state()
-        return (
-            state
-            .get("triggers", {})
-            .get(creator_id, {})
-            .get(trigger_key)
-        )
+    return _trigger_store().get(creator_id, trigger_key)
 
 
 def record_trigger_fire(
@@ -143,12 +250,14 @@ def record_trigger_fire(
 ) -> None:
     ts = now if now is not None else time.time()
 
-    with _LOCK:
-        state = _load_state()
-        state.setdefault("triggers", {})
-        state["triggers"].setdefault(creator_id, {})
-        state["triggers"][creator_id][trigger_key] = ts
-        _save_state(state)
+    _trigger_store().record(creator_id, trigger_key, ts)
+    _mark_view_dirty()
+
+
+def flush_trigger_cooldowns() -> None:
+    """Write pending cooldown changes now (shutdown path)."""
+    if _TRIGGER_STORE is not None:
+        _TRIGGER_STORE.flush()
 
 
 # ======================================================================
@@ -182,9 +291,12 @@ def publish_quota_snapshot(record: Dict[str, Any]) -> None:
     """
     now_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
+    global _QUOTA_STATE
+
     with _LOCK:
-        state = _load_quota_state()
-        platforms = state.setdefault("platforms", [])
+        current = _QUOTA_STATE if _QUOTA_STATE is not None else _load_quota_state()
+        state = dict(current)
+        platforms = state["platforms"] = list(current.get("platforms", []))
 
         def _same(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
             return (
@@ -205,6 +317,7 @@ def publish_quota_snapshot(record: Dict[str, Any]) -> None:
 
         state["schema_version"] = "v1"
         state["generated_at"] = now_iso
+        _QUOTA_STATE = state
 
         try:
             _PUBLISHER.publish("quotas.json", state)
@@ -218,7 +331,10 @@ def publish_quota_snapshot_payload(payload: Dict[str, Any]) -> None:
 
     Expects payload matching quotas.schema.json exactly.
     """
+    global _QUOTA_STATE
+
     with _LOCK:
+        _QUOTA_STATE = payload
         try:
             _PUBLISHER.publish("quotas.json", payload)
         except Exception as e:
@@ -0,0 +1,213 @@
+"""
+Trigger cooldown state.
+
+Chat workers check a cooldown for every message that matches a trigger,
+so lookups must not touch disk. The in-memory table here is authoritative;
+the ``trigger_cooldowns`` table in the job state database (see
+shared.storage.job_store) is its durable copy, written behind through the
+shared I/O executor:
+
+- ``get`` is a dict lookup
+- ``record`` updates memory, marks the entry dirty and schedules a flush
+- ``flush`` upserts only dirty entries; queued flushes coalesce, and a
+  failed flush keeps its entries dirty for the next one
+- ``refresh`` merges rows other processes (e.g. the Discord control
+  plane) wrote since the last refresh, keeping the later fire time
+
+Each flush stamps its rows with a shared change version, so ``refresh``
+costs one single-row read when nothing changed. Cooldowns are reloaded
+from SQLite at startup, so they survive restarts.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Set, Tuple
+
+from shared.logging.logger import get_logger
+from shared.storage.io_executor import WriteBehindExecutor, io_executor
+from shared.storage.sqlite_pool import get_connection_manager
+
+log = get_logger("shared.trigger_store")
+
+DEFAULT_DB_PATH = Path("data/runtime_state.db")
+
+
+class TriggerCooldownStore:
+    """Last fire time per (creator, trigger), cached in memory."""
+
+    def __init__(
+        self,
+        db_path: Path | str = DEFAULT_DB_PATH,
+        *,
+        executor: WriteBehindExecutor = io_executor,
+    ) -> None:
+        self._path = Path(db_path)
+        self._db = get_connection_manager(self._path)
+        self._executor = executor
+        self._flush_key = f"sqlite:{self._path.resolve()}#trigger_cooldowns"
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._cooldowns: Dict[str, Dict[str, float]] = {}
+        self._dirty: Set[Tuple[str, str]] = set()
+        # Highest change version merged into memory.
+        self._watermark = 0
+        self._init_schema()
+        self._load()
+
+    def _init_schema(self) -> None:
+        with self._db.writer() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trigger_cooldowns (
+                    creator_id TEXT NOT NULL,
+                    trigger_key TEXT NOT NULL,
+                    fired_at REAL NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (creator_id, trigger_key)
+                ) WITHOUT ROWID
+                """
+            )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(trigger_cooldowns)")}
+            if "version" not in columns:
+                conn.execute(
+                    "ALTER TABLE trigger_cooldowns ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS trigger_cooldowns_version ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO trigger_cooldowns_version (id, version) VALUES (1, 0)"
+            )
+
+    @staticmethod
+    def _current_version(conn) -> int:
+        row = conn.execute("SELECT version FROM trigger_cooldowns_version WHERE id = 1").fetchone()
+        return int(row["version"]) if row else 0
+
+    def _load(self) -> None:
+        with self._db.reader() as conn:
+            version = self._current_version(conn)
+            rows = conn.execute(
+                "SELECT creator_id, trigger_key, fired_at FROM trigger_cooldowns"
+            ).fetchall()
+        cooldowns: Dict[str, Dict[str, float]] = {}
+        for row in rows:
+            cooldowns.setdefault(row["creator_id"], {})[row["trigger_key"]] = float(row["fired_at"])
+        with self._lock:
+            self._cooldowns = cooldowns
+            self._watermark = version
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, creator_id: str, trigger_key: str) -> Optional[float]:
+        with self._lock:
+            entries = self._cooldowns.get(creator_id)
+            return entries.get(trigger_key) if entries else None
+
+    def record(self, creator_id: str, trigger_key: str, fired_at: float) -> None:
+        with self._lock:
+            self._cooldowns.setdefault(creator_id, {})[trigger_key] = float(fired_at)
+            self._dirty.add((creator_id, trigger_key))
+        self._executor.submit(self._flush_key, self.flush)
+
+    def import_cooldowns(self, cooldowns: Mapping[str, Mapping[str, float]]) -> int:
+        """Merge legacy cooldowns, keeping the later fire time per entry."""
+
+        imported = 0
+        with self._lock:
+            for creator_id, entries in cooldowns.items():
+                if not isinstance(entries, Mapping):
+                    continue
+                current = self._cooldowns.setdefault(str(creator_id), {})
+                for trigger_key, fired_at in entries.items():
+                    try:
+                        fired_at = float(fired_at)
+                    except (TypeError, ValueError):
+                        continue
+                    if fired_at > current.get(str(trigger_key), float("-inf")):
+                        current[str(trigger_key)] = fired_at
+                        self._dirty.add((str(creator_id), str(trigger_key)))
+                        imported += 1
+        if imported:
+            self.flush()
+        return imported
+
+    def refresh(self) -> int:
+        """
+        Merge cooldowns written by other processes since the last refresh.
+        Returns how many entries moved forward in memory.
+        """
+
+        with self._db.reader() as conn:
+            version = self._current_version(conn)
+            with self._lock:
+                watermark = self._watermark
+            if version <= watermark:
+                return 0
+            rows = conn.execute(
+                "SELECT creator_id, trigger_key, fired_at FROM trigger_cooldowns WHERE version > ?",
+                (watermark,),
+            ).fetchall()
+
+        merged = 0
+        with self._lock:
+            for row in rows:
+                entries = self._cooldowns.setdefault(row["creator_id"], {})
+                fired_at = float(row["fired_at"])
+                if fired_at > entries.get(row["trigger_key"], float("-inf")):
+                    entries[row["trigger_key"]] = fired_at
+                    merged += 1
+            self._watermark = max(self._watermark, version)
+        return merged
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not any(self._cooldowns.values())
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {creator_id: dict(entries) for creator_id, entries in self._cooldowns.items()}
+
+    def flush(self) -> int:
+        """Write dirty entries to SQLite; returns how many were written."""
+
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                dirty, self._dirty = self._dirty, set()
+                rows = [
+                    (creator_id, trigger_key, self._cooldowns[creator_id][trigger_key])
+                    for creator_id, trigger_key in dirty
+                ]
+            try:
+                with self._db.writer() as conn:
+                    conn.execute(
+                        "UPDATE trigger_cooldowns_version SET version = version + 1 WHERE id = 1"
+                    )
+                    version = self._current_version(conn)
+                    # Keep the later fire time if another process wrote one.
+                    conn.executemany(
+                        """
+                        INSERT INTO trigger_cooldowns (creator_id, trigger_key, fired_at, version)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT (creator_id, trigger_key) DO UPDATE SET
+                            fired_at = MAX(fired_at, excluded.fired_at),
+                            version = excluded.version
+                        """,
+                        [row + (version,) for row in rows],
+                    )
+            except Exception as e:
+                with self._lock:
+                    self._dirty |= dirty
+                log.warning(f"Failed to persist {len(rows)} trigger cooldown(s): {e}")
+                return 0
+            return len(rows)
+
+
+__all__ = ["DEFAULT_DB_PATH", "TriggerCooldownStore"]
@@ -1,9 +1,13 @@
-"""Hashing helpers for restart-intent detection."""
+"""Hashing helpers for restart-intent detection and snapshot change detection."""
 from __future__ import annotations
 
 import hashlib
+import json
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from shared.logging.logger import get_logger
 
@@ -36,3 +40,133 @@ def stable_hash_for_paths(paths: Iterable[Path]) -> Optional[str]:
         return None
 
     return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Content-hash cache for snapshot writers
+# ----------------------------------------------------------------------
+
+# Top-level keys that change on every build without changing the content.
+DEFAULT_VOLATILE_KEYS = ("generated_at", "heartbeat", "publish_io")
+DEFAULT_MAX_SKIP_SECONDS = 60.0
+
+
+def content_hash(payload: Any, volatile_keys: Iterable[str] = DEFAULT_VOLATILE_KEYS) -> Optional[str]:
+    """Hash a JSON payload, ignoring ``volatile_keys`` at the top level.
+
+    Returns ``None`` when the payload cannot be serialized.
+    """
+
+    if isinstance(payload, dict):
+        volatile = set(volatile_keys)
+        if volatile.intersection(payload):
+            payload = {key: value for key, value in payload.items() if key not in volatile}
+    try:
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("digest", "written_at", "mtime_ns", "size")
+
+    def __init__(self, digest: str, written_at: float, mtime_ns: int, size: int) -> None:
+        self.digest = digest
+        self.written_at = written_at
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+
+class ContentHashCache:
+    """Remembers what was last written to each path so identical writes can be skipped.
+
+    A write is skipped only when the payload hash matches, the file on disk
+    still has the size and mtime recorded after that write, and the write is
+    younger than ``max_skip_seconds`` (so consumers watching ``generated_at``
+    still see the file refreshed periodically).
+    """
+
+    def __init__(
+        self,
+        *,
+        volatile_keys: Iterable[str] = DEFAULT_VOLATILE_KEYS,
+        max_skip_seconds: float = DEFAULT_MAX_SKIP_SECONDS,
+    ) -> None:
+        self._volatile_keys = tuple(volatile_keys)
+        self._max_skip_seconds = float(max_skip_seconds)
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._written = 0
+        self._skipped = 0
+
+    def fingerprint(self, payload: Any) -> Optional[str]:
+        return content_hash(payload, self._volatile_keys)
+
+    def is_current(self, path: Path, digest: Optional[str]) -> bool:
+        """True if ``path`` already holds content with ``digest``; counts a skip."""
+
+        if digest is None:
+            return False
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.digest != digest:
+            return False
+        if time.monotonic() - entry.written_at >= self._max_skip_seconds:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size:
+            return False
+        with self._lock:
+            self._skipped += 1
+        return True
+
+    def record_write(self, path: Path, digest: Optional[str]) -> None:
+        key = os.path.abspath(path)
+        with self._lock:
+            self._written += 1
+            if digest is None:
+                self._entries.pop(key, None)
+                return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._entries.pop(key, None)
+            return
+        with self._lock:
+            self._entries[key] = _Entry(digest, time.monotonic(), stat.st_mtime_ns, stat.st_size)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "written": self._written,
+                "skipped": self._skipped,
+                "tracked_paths": len(self._entries),
+            }
+
+
+# Shared by the state and export publishers so every writer of a path
+# sees the same history.
+publish_cache = ContentHashCache()
+
+
+__all__ = [
+    "ContentHashCache",
+    "DEFAULT_MAX_SKIP_SECONDS",
+    "DEFAULT_VOLATILE_KEYS",
+    "content_hash",
+    "publish_cache",
+    "stable_hash_for_paths",
+]
@@ -0,0 +1,176 @@
+"""Minimal RFC 6902 JSON Patch support for snapshot deltas.
+
+``diff`` produces ``add`` / ``remove`` / ``replace`` operations that turn one
+JSON document into another; ``apply_patch`` applies them. Only plain JSON
+values (dict, list, str, int, float, bool, None) are supported.
+
+Lists are diffed by position, with one special case: a rolling window
+(items dropped from the front, appended at the back) is recognised so that
+event logs produce a few removes and adds instead of replacing every
+element.
+"""
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, List
+
+Operation = Dict[str, Any]
+
+# How far into the old list to look for the new list's first element when
+# detecting a rolling window.
+_MAX_WINDOW_SHIFT = 64
+
+
+def escape_pointer_token(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def unescape_pointer_token(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(old: Any, new: Any) -> bool:
+    # 1 == True and 1 == 1.0 in Python, but they are different JSON values.
+    return type(old) is type(new) and old == new
+
+
+def _window_shift(old: List[Any], new: List[Any]) -> int:
+    """Items dropped from the front of ``old`` if ``new`` continues it; else 0."""
+
+    if not old or not new:
+        return 0
+    first = new[0]
+    for shift in range(1, min(len(old), _MAX_WINDOW_SHIFT + 1)):
+        if _same(old[shift], first):
+            kept = len(old) - shift
+            if kept <= len(new) and all(
+                _same(old[shift + index], new[index]) for index in range(kept)
+            ):
+                return shift
+    return 0
+
+
+def _diff_list(old: List[Any], new: List[Any], path: str, ops: List[Operation]) -> None:
+    shift = _window_shift(old, new)
+    if shift:
+        for _ in range(shift):
+            ops.append({"op": "remove", "path": f"{path}/0"})
+        for value in new[len(old) - shift :]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": value})
+        return
+
+    start = len(ops)
+    common = min(len(old), len(new))
+    for index in range(common):
+        _diff(old[index], new[index], f"{path}/{index}", ops)
+    for value in new[common:]:
+        ops.append({"op": "add", "path": f"{path}/-", "value": value})
+    for index in range(len(old) - 1, common - 1, -1):
+        ops.append({"op": "remove", "path": f"{path}/{index}"})
+
+    # Wholesale changes are smaller as one replace.
+    if len(ops) - start > len(new):
+        del ops[start:]
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff(old: Any, new: Any, path: str, ops: List[Operation]) -> None:
+    if old is new:
+        return
+    if type(old) is dict and type(new) is dict:
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{escape_pointer_token(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{escape_pointer_token(key)}"
+            if key in old:
+                _diff(old[key], value, child, ops)
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return
+    if type(old) is list and type(new) is list:
+        _diff_list(old, new, path, ops)
+        return
+    if not _same(old, new):
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def diff(old: Any, new: Any) -> List[Operation]:
+    """Operations that transform ``old`` into ``new``. Values are shared, not copied."""
+
+    ops: List[Operation] = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def _parse_pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    return [unescape_pointer_token(token) for token in path[1:].split("/")]
+
+
+def _list_index(container: List[Any], token: str, *, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise ValueError(f"Invalid list index: {token!r}")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise ValueError(f"List index out of range: {token!r}")
+    return index
+
+
+def apply_patch(document: Any, ops: List[Operation]) -> Any:
+    """Return a patched deep copy of ``document``. Raises ``ValueError`` on bad ops."""
+
+    result = copy.deepcopy(document)
+    for op in ops:
+        kind = op.get("op")
+        tokens = _parse_pointer(op.get("path", ""))
+        if kind not in ("add", "remove", "replace"):
+            raise ValueError(f"Unsupported patch op: {kind!r}")
+        if not tokens:
+            if kind == "remove":
+                raise ValueError("Cannot remove the document root")
+            result = copy.deepcopy(op["value"])
+            continue
+
+        parent = result
+        for token in tokens[:-1]:
+            if isinstance(parent, list):
+                parent = parent[_list_index(parent, token, allow_end=False)]
+            elif isinstance(parent, dict) and token in parent:
+                parent = parent[token]
+            else:
+                raise ValueError(f"Path not found: {op.get('path')!r}")
+
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = _list_index(parent, last, allow_end=kind == "add")
+            if kind == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif kind == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op["value"])
+        elif isinstance(parent, dict):
+            if kind != "add" and last not in parent:
+                raise ValueError(f"Path not found: {op.get('path')!r}")
+            if kind == "remove":
+                del parent[last]
+            else:
+                parent[last] = copy.deepcopy(op["value"])
+        else:
+            raise ValueError(f"Path not found: {op.get('path')!r}")
+    return result
+
+
+__all__ = [
+    "apply_patch",
+    "diff",
+    "escape_pointer_token",
+    "unescape_pointer_token",
+]
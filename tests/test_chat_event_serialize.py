@@ -0,0 +1,70 @@
+import json
+import unittest
+
+from shared.storage.chat_events.serialize import row_to_wire, row_to_wire_bytes
+
+
+def _row(**overrides):
+    row = {
+        "event_id": "evt-1",
+        "ts": "2026-01-01T00:00:00Z",
+        "stream_id": "stream-1",
+        "source_platform": "twitch",
+        "author_id": "u1",
+        "display_name": "Viewer é",
+        "avatar_url": None,
+        "badges_json": json.dumps(["sub", "vip"]),
+        "roles_json": json.dumps(["moderator"]),
+        "content_type": "message",
+        "content_text": 'hi "there"',
+        "flags_json": json.dumps({"is_synthetic": False, "is_system": True, "is_highlighted": False}),
+    }
+    row.update(overrides)
+    return row
+
+
+class RowToWireParityTest(unittest.TestCase):
+    """``row_to_wire_bytes`` must encode exactly the event ``row_to_wire`` builds."""
+
+    def assert_parity(self, row, raw_json=None):
+        encoded = row_to_wire_bytes(row, raw_json)
+        self.assertEqual(json.loads(encoded), row_to_wire(row, raw_json))
+        return encoded
+
+    def test_stored_row(self):
+        self.assert_parity(_row())
+
+    def test_raw_payload(self):
+        self.assert_parity(_row(), json.dumps({"tags": {"color": "#fff"}}))
+
+    def test_missing_columns_use_defaults(self):
+        self.assert_parity(_row(
+            author_id=None,
+            display_name=None,
+            badges_json=None,
+            roles_json=None,
+            content_type=None,
+            content_text=None,
+            flags_json=None,
+        ))
+
+    def test_flags_are_normalized(self):
+        for flags_json in (
+            '{"is_synthetic": 1, "is_system": 0}',
+            '{"is_highlighted": "yes", "extra": true}',
+            "null",
+            "[]",
+        ):
+            with self.subTest(flags_json=flags_json):
+                encoded = self.assert_parity(_row(flags_json=flags_json))
+                flags = json.loads(encoded)["flags"]
+                self.assertEqual(set(flags), {"is_synthetic", "is_system", "is_highlighted"})
+                self.assertTrue(all(isinstance(value, bool) for value in flags.values()))
+                self.assertIn(
+                    json.dumps(flags, separators=(",", ":")).encode("utf-8"),
+                    encoded,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()